@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+# Adding ./src to python path for running from console purpose:
+sys.path.append(os.getcwd())
+
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.dependencies import find_variables
+from src.exceptions import UnknownExpressionTypeError
+from src.expressions import TreeNode, UnaryOperation, BinaryOperation, FunctionCall, Number, Variable
+from src.instrumentation import count_nodes
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.tokens_parser import TokensParser
+
+
+def calculate_with_command_instances(node: TreeNode, variables: Dict[str, float]) -> float:
+    """
+    Calculates the tree the way interpreter did before commands were dispatched as functions:
+    each node is checked with isinstance and each operation creates and executes a command.
+    """
+
+    if isinstance(node, UnaryOperation):
+        return BASE_COMMANDS[node.operation](
+            a=0,
+            b=calculate_with_command_instances(node=node.expression, variables=variables)
+        ).execute()
+    elif isinstance(node, BinaryOperation):
+        return BASE_COMMANDS[node.operation](
+            a=calculate_with_command_instances(node=node.left, variables=variables),
+            b=calculate_with_command_instances(node=node.right, variables=variables)
+        ).execute()
+    elif isinstance(node, FunctionCall):
+        return MATH_COMMANDS[node.name](
+            value=calculate_with_command_instances(node=node.argument, variables=variables)
+        ).execute()
+    elif isinstance(node, Number):
+        return node.value
+    elif isinstance(node, Variable):
+        return variables[node.name]
+    else:
+        raise UnknownExpressionTypeError()
+
+
+def measure_nodes_per_second(calculate: Callable[[], float], nodes: int, repeats: int) -> float:
+    """
+    Returns the best amount of calculated nodes per second for given amount of repeats.
+    """
+
+    timings: List[float] = []
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        calculate()
+        timings.append(time.perf_counter() - start)
+
+    return nodes / min(timings)
+
+
+if __name__ == '__main__':
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=TokensParser(),
+        lexical_processor=LexicalProcessor()
+    )
+
+    chunk: str = 'sqrt(x ^ 2 + 3 * (y - 1) / 2) + sin(x) * -y - '
+    print(f'{"nodes":>8} {"instances, nodes/s":>20} {"functions, nodes/s":>20} {"speedup":>8}')
+    for chunks in (1, 10, 100):
+        tree: TreeNode = interpreter._parse(expression=chunk * chunks + '1')
+        for variable in find_variables(node=tree):
+            interpreter.interpret(user_input=f'{variable} = 1.5')
+
+        nodes: int = count_nodes(node=tree)
+        repeats: int = 20_000 // chunks
+        instances_speed: float = measure_nodes_per_second(
+            calculate=lambda: calculate_with_command_instances(node=tree, variables=interpreter._user_variables),
+            nodes=nodes,
+            repeats=repeats
+        )
+        functions_speed: float = measure_nodes_per_second(
+            calculate=lambda: interpreter._calculate_node_value(node=tree),
+            nodes=nodes,
+            repeats=repeats
+        )
+
+        speedup: float = functions_speed / instances_speed
+        print(f'{nodes:>8} {instances_speed:>20,.0f} {functions_speed:>20,.0f} {speedup:>7.2f}x')
@@ -0,0 +1,116 @@
+import random
+import string
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+NUMBERS: List[str] = ['0.5', '0.75', '1.25', '1.5', '2', '2.5', '3']
+EXPONENTS: List[str] = ['2', '3']
+FUNCTIONS: List[str] = ['sin', 'cos', 'sqrt', 'log']
+
+
+@dataclass(frozen=True)
+class ExpressionShape:
+    """
+    Parameters of a generated expression:
+    - operands: amount of numbers, variables and function calls in the expression;
+    - depth: amount of nested parentheses, operands are split evenly between nesting levels;
+    - operators: binary operators, which are chosen between operands;
+    - function_density: share of operands, which are calls of math functions;
+    - variables: amount of distinct variables, which are used as operands together with numbers.
+    """
+
+    operands: int = 100
+    depth: int = 0
+    operators: str = '+-*/^'
+    function_density: float = 0.0
+    variables: int = 0
+
+
+def get_variable_name(index: int) -> str:
+    """
+    Returns alphabetic name of the variable by its index, so names are valid identifiers and don't clash with functions.
+
+    Example:
+    :param index: 27
+    :return: "vbb"
+    """
+
+    letters: List[str] = []
+    while True:
+        index, remainder = divmod(index, len(string.ascii_lowercase))
+        letters.append(string.ascii_lowercase[remainder])
+        if not index:
+            break
+
+    return 'v' + ''.join(reversed(letters))
+
+
+def generate_variables(count: int) -> Dict[str, float]:
+    return {get_variable_name(index=index): 1.5 + index % 5 / 4 for index in range(count)}
+
+
+class ExpressionGenerator:
+    """
+    Generates expressions of a given shape, which are the same for the same seed.
+    Generated expressions can be evaluated without errors, when variables from generate_variables are assigned:
+    divisors and arguments of functions are always positive operands, exponents are small integers
+    and exponentiations are never chained, so results stay finite and real.
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        self._seed: int = seed
+
+    def generate(self, shape: ExpressionShape) -> str:
+        random_generator: random.Random = random.Random(f'{self._seed}:{shape}')
+        levels: int = shape.depth + 1
+        operands_per_level: int = max(shape.operands // levels, 1)
+
+        # Parenthesized level can be negative or zero, so it is never a base of exponentiation or a divisor:
+        joining_operators: List[str] = [operator for operator in shape.operators if operator in '+-*'] or ['+']
+
+        # Innermost level is generated first, then each outer level ends with the previous level in parentheses:
+        expression: str = self._generate_level(
+            random_generator=random_generator,
+            shape=shape,
+            operands=max(shape.operands - operands_per_level * shape.depth, 1)
+        )
+        for _ in range(shape.depth):
+            level: str = self._generate_level(
+                random_generator=random_generator,
+                shape=shape,
+                operands=operands_per_level - 1
+            )
+            operator: str = random_generator.choice(joining_operators)
+            expression = f'{level} {operator} ({expression})' if level else f'({expression})'
+
+        return expression
+
+    def _generate_level(self, random_generator: random.Random, shape: ExpressionShape, operands: int) -> str:
+        parts: List[str] = []
+        previous_operator: str = ''
+        for index in range(operands):
+            if index:
+                operators: str = shape.operators.replace('^', '') if previous_operator == '^' else shape.operators
+                previous_operator = random_generator.choice(operators or ['*'])
+                parts.append(previous_operator)
+
+            if previous_operator == '^':
+                parts.append(random_generator.choice(EXPONENTS))
+            else:
+                parts.append(self._generate_operand(random_generator=random_generator, shape=shape))
+
+        return ' '.join(parts)
+
+    @staticmethod
+    def _generate_operand(random_generator: random.Random, shape: ExpressionShape) -> str:
+        operand: str
+        if shape.variables and random_generator.random() < 0.5:
+            operand = get_variable_name(index=random_generator.randrange(shape.variables))
+        else:
+            operand = random_generator.choice(NUMBERS)
+
+        if random_generator.random() < shape.function_density:
+            return f'{random_generator.choice(FUNCTIONS)}({operand})'
+
+        return operand
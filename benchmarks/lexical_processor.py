@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+from typing import List
+
+# Adding ./src to python path for running from console purpose:
+sys.path.append(os.getcwd())
+
+from src.lexical_processor import LexicalProcessor
+
+
+def generate_expression(length: int) -> str:
+    """
+    Generates an expression of at least given length by repeating a chunk, which contains every kind of token.
+    """
+
+    chunk: str = '(12.5 + 3) * 4 / 2 ^ -1 - '
+    return chunk * (length // len(chunk) + 1) + '1'
+
+
+def measure(lexical_processor: LexicalProcessor, expression: str, repeats: int) -> float:
+    """
+    Returns the best time in seconds of processing the expression for given amount of repeats.
+    """
+
+    timings: List[float] = []
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        lexical_processor.process_expression(expression=expression)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+if __name__ == '__main__':
+    lexical_processor: LexicalProcessor = LexicalProcessor()
+
+    print(f'{"length":>10} {"seconds":>10} {"ns/char":>10}')
+    length: int = 1024
+    while length <= 4 * 1024 * 1024:
+        expression: str = generate_expression(length=length)
+        seconds: float = measure(lexical_processor=lexical_processor, expression=expression, repeats=3)
+        print(f'{len(expression):>10} {seconds:>10.4f} {seconds / len(expression) * 1e9:>10.1f}')
+        length *= 4
@@ -0,0 +1,92 @@
+import math
+import os
+import sys
+import timeit
+from typing import Any, Callable, Dict, List
+
+# Adding ./src to python path for running from console purpose:
+sys.path.append(os.getcwd())
+
+from src.cache import memoize
+from src.commands import MathCommand
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.expressions import TreeNode
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.tokens_parser import TokensParser
+
+
+class GammaCommand(MathCommand):
+    """
+    Gamma function by Lanczos approximation, as a command, which is implemented in Python, would calculate it.
+    """
+
+    COEFFICIENTS: List[float] = [
+        0.99999999999980993, 676.5203681218851, -1259.1392167224028, 771.32342877765313,
+        -176.61503916999185, 12.507343278686905, -0.13857109526572012, 9.9843695780195716e-6,
+        1.5056327351493116e-7
+    ]
+
+    def execute(self) -> float:
+        if self._value < 0.5:
+            return math.pi / (math.sin(math.pi * self._value) * GammaCommand(value=1 - self._value).execute())
+
+        value: float = self._value - 1
+        series: float = self.COEFFICIENTS[0]
+        for index, coefficient in enumerate(self.COEFFICIENTS[1:], start=1):
+            series += coefficient / (value + index)
+
+        base: float = value + len(self.COEFFICIENTS) - 1.5
+        return math.sqrt(2 * math.pi) * base ** (value + 0.5) * math.exp(-base) * series
+
+
+def create_interpreter(memoized_functions: Dict[str, int]) -> MathOperationsInterpreter:
+    return MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands={**MATH_COMMANDS, 'gamma': GammaCommand},
+        parser=TokensParser(),
+        lexical_processor=LexicalProcessor(),
+        memoized_functions=memoized_functions
+    )
+
+
+def measure_calls_per_second(function: Callable[[], Any], calls: int) -> float:
+    """
+    Returns the best amount of calls per second of five repeats.
+    """
+
+    timer: timeit.Timer = timeit.Timer(stmt=function)
+    loops: int
+    loops, _ = timer.autorange()
+    return calls * loops / min(timer.repeat(repeat=5, number=loops))
+
+
+if __name__ == '__main__':
+    # Each function is called with a few distinct arguments, so memoized results are found in most calls:
+    print(f'{"function":>10} {"plain, calls/s":>16} {"memoized, calls/s":>18} {"speedup":>8}')
+    for name in ('sqrt', 'gamma'):
+        arguments: List[float] = [float(argument % 10 + 1) for argument in range(1000)]
+        plain_function: Callable[[float], float] = create_interpreter(memoized_functions={})._functions[name]
+        memoized_function: Callable[[float], float]
+        memoized_function, _ = memoize(function=plain_function, maxsize=16)
+
+        plain_speed: float = measure_calls_per_second(
+            function=lambda: [plain_function(argument) for argument in arguments],
+            calls=len(arguments)
+        )
+        memoized_speed: float = measure_calls_per_second(
+            function=lambda: [memoized_function(argument) for argument in arguments],
+            calls=len(arguments)
+        )
+        print(f'{name:>10} {plain_speed:>16,.0f} {memoized_speed:>18,.0f} {memoized_speed / plain_speed:>7.2f}x')
+
+    # The whole interpretation of an expression, where the slow function is called with repeated arguments:
+    expression: str = ' + '.join(f'gamma({argument % 5 + 1})' for argument in range(50))
+    print(f'{"expression":>10} {"plain, calls/s":>16} {"memoized, calls/s":>18} {"speedup":>8}')
+    speeds: List[float] = []
+    for memoized_functions in ({}, {'gamma': 16}):
+        interpreter: MathOperationsInterpreter = create_interpreter(memoized_functions=memoized_functions)
+        tree: TreeNode = interpreter._parse(expression=expression)
+        speeds.append(measure_calls_per_second(function=lambda: interpreter._calculate_node_value(node=tree), calls=1))
+
+    print(f'{"gamma":>10} {speeds[0]:>16,.0f} {speeds[1]:>18,.0f} {speeds[1] / speeds[0]:>7.2f}x')
@@ -0,0 +1,98 @@
+import os
+import sys
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Any, Callable, Dict, List
+
+# Adding ./src to python path for running from console purpose:
+sys.path.append(os.getcwd())
+
+from src.expressions import TreeNode, UnaryOperation, BinaryOperation, FunctionCall, Number, Variable
+from src.instrumentation import count_nodes
+from src.lexical_processor import LexicalProcessor
+from src.tokens import Token
+from src.tokens_parser import TokensParser
+
+
+def make_unslotted_class(cls: type) -> type:
+    """
+    Creates a copy of the dataclass with a per-instance dictionary, the way tokens and nodes were stored before.
+    """
+
+    return make_dataclass(cls.__name__, [(field.name, field.type) for field in fields(cls) if field.init])
+
+
+def copy_tree(node: TreeNode, classes: Dict[type, Callable[..., Any]]) -> Any:
+    """
+    Recursively copies the tree into instances of given classes. Values of nodes are shared with the source tree.
+    """
+
+    if isinstance(node, UnaryOperation):
+        return classes[UnaryOperation](operation=node.operation, expression=copy_tree(node.expression, classes))
+    elif isinstance(node, BinaryOperation):
+        return classes[BinaryOperation](
+            operation=node.operation,
+            left=copy_tree(node.left, classes),
+            right=copy_tree(node.right, classes)
+        )
+    elif isinstance(node, FunctionCall):
+        return classes[FunctionCall](name=node.name, argument=copy_tree(node.argument, classes))
+    elif isinstance(node, Number):
+        return classes[Number](value=node.value)
+    elif isinstance(node, Variable):
+        return classes[Variable](name=node.name)
+
+    raise TypeError(f'Unknown node {node!r}')
+
+
+def measure_bytes(create: Callable[[], List[Any]]) -> int:
+    """
+    Returns the amount of bytes, which are still allocated by created objects.
+    """
+
+    tracemalloc.start()
+    created: List[Any] = create()
+    allocated_bytes: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del created
+    return allocated_bytes
+
+
+if __name__ == '__main__':
+    expressions: List[str] = [f'sqrt(x ^ 2 + {i} * (y - 1) / 2) + sin(x) * -y' for i in range(10_000)]
+    lexical_processor: LexicalProcessor = LexicalProcessor()
+    tokens_parser: TokensParser = TokensParser()
+
+    tokens: List[Token] = [
+        token for expression in expressions for token in lexical_processor.process_expression(expression=expression)
+    ]
+    trees: List[TreeNode] = [
+        tokens_parser.parse(tokens=lexical_processor.process_expression(expression=expression))
+        for expression in expressions
+    ]
+
+    unslotted_token: Callable[..., Any] = make_unslotted_class(Token)
+    node_classes: List[type] = [UnaryOperation, BinaryOperation, FunctionCall, Number, Variable]
+    slotted_nodes: Dict[type, Callable[..., Any]] = {cls: cls for cls in node_classes}
+    unslotted_nodes: Dict[type, Callable[..., Any]] = {cls: make_unslotted_class(cls) for cls in node_classes}
+
+    nodes: int = sum(count_nodes(node=tree) for tree in trees)
+
+    # Lists, which hold created objects, are allocated in both measurements and are counted as well:
+    bytes_per_token_before: float = measure_bytes(
+        create=lambda: [unslotted_token(type=token.type, literal=token.literal) for token in tokens]
+    ) / len(tokens)
+    bytes_per_token_after: float = measure_bytes(
+        create=lambda: [Token(type=token.type, literal=token.literal) for token in tokens]
+    ) / len(tokens)
+    bytes_per_node_before: float = measure_bytes(
+        create=lambda: [copy_tree(node=tree, classes=unslotted_nodes) for tree in trees]
+    ) / nodes
+    bytes_per_node_after: float = measure_bytes(
+        create=lambda: [copy_tree(node=tree, classes=slotted_nodes) for tree in trees]
+    ) / nodes
+
+    print(f'{"object":>8} {"count":>10} {"before, bytes":>14} {"after, bytes":>14}')
+    print(f'{"token":>8} {len(tokens):>10} {bytes_per_token_before:>14.1f} {bytes_per_token_after:>14.1f}')
+    print(f'{"node":>8} {nodes:>10} {bytes_per_node_before:>14.1f} {bytes_per_node_after:>14.1f}')
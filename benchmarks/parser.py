@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+from typing import List
+
+# Adding ./src to python path for running from console purpose:
+sys.path.append(os.getcwd())
+
+from src.interfaces import Parser
+from src.lexical_processor import LexicalProcessor
+from src.precedence_parser import PrecedenceParser
+from src.tokens import Token
+from src.tokens_parser import TokensParser
+
+
+def measure_tokens_per_second(parser: Parser, tokens: List[Token], repeats: int) -> float:
+    """
+    Returns the best amount of parsed tokens per second for given amount of repeats.
+    """
+
+    timings: List[float] = []
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        parser.parse(tokens=tokens)
+        timings.append(time.perf_counter() - start)
+
+    return len(tokens) / min(timings)
+
+
+if __name__ == '__main__':
+    lexical_processor: LexicalProcessor = LexicalProcessor()
+    tokens_parser: TokensParser = TokensParser()
+    precedence_parser: PrecedenceParser = PrecedenceParser()
+
+    expressions: List[str] = [
+        'sqrt(x ^ 2 + 3 * (y - 1) / 2) + sin(x) * -y - ' * 1000 + '1',
+        '2 ^ -x ^ 2 * --y / (1 + 2) - ' * 1000 + '1',
+        '(' * 150 + '-x + 1' + ')' * 150,
+    ]
+
+    print(f'{"tokens":>8} {"recursive, tokens/s":>20} {"precedence, tokens/s":>21} {"speedup":>8}')
+    for expression in expressions:
+        tokens: List[Token] = lexical_processor.process_expression(expression=expression)
+        recursive_speed: float = measure_tokens_per_second(parser=tokens_parser, tokens=tokens, repeats=20)
+        precedence_speed: float = measure_tokens_per_second(parser=precedence_parser, tokens=tokens, repeats=20)
+
+        speedup: float = precedence_speed / recursive_speed
+        print(f'{len(tokens):>8} {recursive_speed:>20,.0f} {precedence_speed:>21,.0f} {speedup:>7.2f}x')
+
+    # Recursive parser fails with RecursionError on such depth:
+    deep_tokens: List[Token] = lexical_processor.process_expression(expression='(' * 100_000 + '1' + ')' * 100_000)
+    deep_speed: float = measure_tokens_per_second(parser=precedence_parser, tokens=deep_tokens, repeats=5)
+    print(f'{len(deep_tokens):>8} {"RecursionError":>20} {deep_speed:>21,.0f}')
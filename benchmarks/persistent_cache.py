@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Adding ./src to python path for running from console purpose:
+sys.path.append(os.getcwd())
+
+from benchmarks.generator import ExpressionGenerator, ExpressionShape
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.persistent_cache import PersistentExpressionCache
+from src.tokens_parser import TokensParser
+
+
+def create_interpreter(cache: Optional[PersistentExpressionCache]) -> MathOperationsInterpreter:
+    return MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=TokensParser(),
+        lexical_processor=LexicalProcessor(),
+        persistent_cache=cache
+    )
+
+
+def measure_parsing(expressions: List[str], cache: Optional[PersistentExpressionCache]) -> float:
+    """
+    Returns time in seconds of parsing all expressions by a new interpreter, as it is done on process start.
+    """
+
+    interpreter: MathOperationsInterpreter = create_interpreter(cache=cache)
+    start: float = time.perf_counter()
+    for expression in expressions:
+        interpreter._parse(expression=expression)
+
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    shape: ExpressionShape = ExpressionShape(operands=30, function_density=0.2, variables=5)
+    expressions: List[str] = [ExpressionGenerator(seed=seed).generate(shape=shape) for seed in range(100_000)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: Path = Path(directory) / 'expressions.cache'
+        print(f'{"start":>24} {"seconds":>10}')
+        print(f'{"without cache":>24} {measure_parsing(expressions=expressions, cache=None):>10.3f}')
+
+        with PersistentExpressionCache(path=path) as cache:
+            print(f'{"cold, filling cache":>24} {measure_parsing(expressions=expressions, cache=cache):>10.3f}')
+
+        start: float = time.perf_counter()
+        warm_cache: PersistentExpressionCache = PersistentExpressionCache(path=path)
+        print(f'{"opening cache":>24} {time.perf_counter() - start:>10.6f}')
+        print(f'{"warm, all expressions":>24} {measure_parsing(expressions=expressions, cache=warm_cache):>10.3f}')
+        part_seconds: float = measure_parsing(expressions=expressions[:1000], cache=warm_cache)
+        print(f'{"warm, 1% of expressions":>24} {part_seconds:>10.3f}')
+        print(f'{"file size, MB":>24} {path.stat().st_size / 1024 / 1024:>10.1f}')
@@ -0,0 +1,182 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import timeit
+from dataclasses import asdict, replace
+from typing import Any, Callable, Dict, List, Tuple
+
+# Adding ./src to python path for running from console purpose:
+sys.path.append(os.getcwd())
+
+from benchmarks.generator import ExpressionGenerator, ExpressionShape, generate_variables
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.expressions import TreeNode
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.tokens import Token
+from src.tokens_parser import TokensParser
+
+
+# Shape of expressions, which is changed by one parameter at a time to get scaling curves:
+BASELINE_SHAPE: ExpressionShape = ExpressionShape(
+    operands=100,
+    depth=0,
+    operators='+-*/^',
+    function_density=0.2,
+    variables=5
+)
+
+CURVES: Dict[str, List[ExpressionShape]] = {
+    'operands': [replace(BASELINE_SHAPE, operands=operands) for operands in (10, 100, 1000, 10_000)],
+    'depth': [replace(BASELINE_SHAPE, depth=depth) for depth in (0, 10, 40, 80)],
+    'operators': [replace(BASELINE_SHAPE, operators=operators) for operators in ('+-', '*/', '*^', '+-*/^')],
+    'function_density': [
+        replace(BASELINE_SHAPE, function_density=function_density) for function_density in (0.0, 0.25, 0.5, 1.0)
+    ],
+    'variables': [replace(BASELINE_SHAPE, variables=variables) for variables in (0, 5, 50, 500)],
+}
+
+STAGES: Tuple[str, ...] = ('lexer', 'parser', 'evaluator', 'interpret', 'interpret_cached')
+
+# Variable, which is assigned by interpreted expressions:
+TARGET_VARIABLE: str = 'target'
+
+
+def measure_seconds(function: Callable[[], Any], repeats: int) -> float:
+    """
+    Returns the best time in seconds of a single call. Each repeat calls the function enough times
+    to take at least 0.2 seconds, so fast calls are not dominated by the timer resolution.
+    """
+
+    timer: timeit.Timer = timeit.Timer(stmt=function)
+    loops: int
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeats, number=loops)) / loops
+
+
+def create_interpreter(variables: Dict[str, float], parse_cache_size: int) -> MathOperationsInterpreter:
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=TokensParser(),
+        lexical_processor=LexicalProcessor(),
+        parse_cache_size=parse_cache_size
+    )
+    for name, value in variables.items():
+        interpreter.assign(user_input=f'{name} = {value}')
+
+    return interpreter
+
+
+def benchmark_shape(expression: str, shape: ExpressionShape, repeats: int) -> Dict[str, Any]:
+    """
+    Measures each stage separately on the same expression:
+    - lexer: LexicalProcessor.process_expression;
+    - parser: TokensParser.parse of already generated tokens;
+    - evaluator: MathOperationsInterpreter._calculate_node_value of already parsed tree;
+    - interpret: MathOperationsInterpreter.interpret of the assignment without parse cache;
+    - interpret_cached: the same, when the parsed tree is taken from parse cache.
+    """
+
+    variables: Dict[str, float] = generate_variables(count=shape.variables)
+    interpreter: MathOperationsInterpreter = create_interpreter(variables=variables, parse_cache_size=0)
+    cached_interpreter: MathOperationsInterpreter = create_interpreter(variables=variables, parse_cache_size=1)
+
+    lexical_processor: LexicalProcessor = LexicalProcessor()
+    tokens_parser: TokensParser = TokensParser()
+    tokens: List[Token] = lexical_processor.process_expression(expression=expression)
+    tree: TreeNode = tokens_parser.parse(tokens=tokens)
+    user_input: str = f'{TARGET_VARIABLE} = {expression}'
+
+    stages: Dict[str, Callable[[], Any]] = {
+        'lexer': lambda: lexical_processor.process_expression(expression=expression),
+        'parser': lambda: tokens_parser.parse(tokens=tokens),
+        'evaluator': lambda: interpreter._calculate_node_value(node=tree),
+        'interpret': lambda: interpreter.interpret(user_input=user_input),
+        'interpret_cached': lambda: cached_interpreter.interpret(user_input=user_input),
+    }
+
+    results: Dict[str, Any] = {}
+    for stage, function in stages.items():
+        seconds: float = measure_seconds(function=function, repeats=repeats)
+        results[stage] = {
+            'seconds': seconds,
+            'ops_per_second': 1 / seconds,
+            'tokens_per_second': len(tokens) / seconds,
+        }
+
+    return {'shape': asdict(shape), 'characters': len(expression), 'tokens': len(tokens), 'stages': results}
+
+
+def estimate_scaling_exponent(points: List[Dict[str, Any]], stage: str) -> float:
+    """
+    Returns the slope of log(seconds) by log(tokens), calculated by least squares:
+    it is close to 1 for linear stages and close to 2 for quadratic ones.
+    """
+
+    xs: List[float] = [math.log(point['tokens']) for point in points]
+    ys: List[float] = [math.log(point['stages'][stage]['seconds']) for point in points]
+    mean_x: float = sum(xs) / len(xs)
+    mean_y: float = sum(ys) / len(ys)
+    variance: float = sum((x - mean_x) ** 2 for x in xs)
+    covariance: float = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return covariance / variance
+
+
+def run_suite(seed: int, repeats: int, curves: List[str]) -> Dict[str, Any]:
+    generator: ExpressionGenerator = ExpressionGenerator(seed=seed)
+    results: Dict[str, Any] = {}
+    for curve in curves:
+        points: List[Dict[str, Any]] = [
+            benchmark_shape(expression=generator.generate(shape=shape), shape=shape, repeats=repeats)
+            for shape in CURVES[curve]
+        ]
+        results[curve] = {'points': points}
+        print(f'{curve}: {len(points)} points', file=sys.stderr)
+
+    # Only the length of expressions is changed by the operands curve, so its slopes show complexity of stages:
+    if 'operands' in results:
+        results['operands']['scaling_exponents'] = {
+            stage: estimate_scaling_exponent(points=results['operands']['points'], stage=stage) for stage in STAGES
+        }
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'repeats': repeats,
+        'curves': results,
+    }
+
+
+def parse_arguments() -> argparse.Namespace:
+    arguments_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Measures lexer, parser, evaluator and interpreter on generated expressions and prints JSON.'
+    )
+    arguments_parser.add_argument('--seed', type=int, default=0, help='Seed of generated expressions.')
+    arguments_parser.add_argument('--repeats', type=int, default=3, help='Amount of repeats, the best one is taken.')
+    arguments_parser.add_argument(
+        '--curves',
+        nargs='+',
+        choices=list(CURVES),
+        default=list(CURVES),
+        help='Parameters of expressions, which are changed to get scaling curves.'
+    )
+    arguments_parser.add_argument('--output', default='-', help='Path to a JSON file or "-" to print it.')
+
+    return arguments_parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments: argparse.Namespace = parse_arguments()
+    report: Dict[str, Any] = run_suite(seed=arguments.seed, repeats=arguments.repeats, curves=arguments.curves)
+
+    if arguments.output == '-':
+        print(json.dumps(report, indent=2))
+    else:
+        with open(arguments.output, mode='w') as output:
+            json.dump(report, output, indent=2)
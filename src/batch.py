@@ -0,0 +1,182 @@
+import csv
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple, Type
+
+from src.config import EXIT_VARIABLE, RESULT_VARIABLE
+from src.enums import OutputFormatsEnum
+from src.exceptions import CustomException
+from src.interpreter import MathOperationsInterpreter
+
+
+# Errors, which are reported for a line of a script instead of stopping the whole batch.
+# Type errors are included, because user-defined commands can return values of unexpected types:
+BATCH_ERRORS: Tuple[Type[Exception], ...] = (
+    CustomException,
+    ArithmeticError,
+    ValueError,
+    TypeError,
+    RecursionError
+)
+
+BATCH_RECORD_FIELDS: Tuple[str, ...] = ('line', 'variable', 'value', 'error', 'message', 'source')
+
+
+@dataclass(slots=True)
+class BatchRecord:
+    """
+    Outcome of a single line of a script: either the assigned variable with its value,
+    or the name of the raised error with its message. Source is the name of the script or the session,
+    when several scripts are processed at once.
+    """
+
+    line: int
+    variable: Optional[str] = None
+    value: Optional[float] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+    source: Optional[str] = None
+
+    def values(self) -> Tuple[Any, ...]:
+        """
+        Returns values of fields in the order of BATCH_RECORD_FIELDS.
+        """
+
+        return self.line, self.variable, self.value, self.error, self.message, self.source
+
+    def to_json(self) -> str:
+        """
+        Returns the record as a JSON object, where empty fields are omitted.
+        """
+
+        fields: Dict[str, Any] = {
+            field: value for field, value in zip(BATCH_RECORD_FIELDS, self.values()) if value is not None
+        }
+        return json.dumps(fields)
+
+
+class BatchProcessor:
+    """
+    Interprets lines of a script one by one in a single interpreter, so variables, assigned in previous lines,
+    can be used in the next ones. Empty lines are skipped, processing stops at the "exit" line.
+    After the "result" variable is assigned, stored variables are cleared, the same way as in interactive mode,
+    so a script can contain several independent calculations.
+    """
+
+    def __init__(self, interpreter: MathOperationsInterpreter) -> None:
+        self._interpreter: MathOperationsInterpreter = interpreter
+
+    def process(self, lines: Iterable[str], source: Optional[str] = None) -> Iterator[BatchRecord]:
+        return self.process_numbered_lines(lines=enumerate(lines, start=1), source=source)
+
+    def process_numbered_lines(
+            self,
+            lines: Iterable[Tuple[int, str]],
+            source: Optional[str] = None
+    ) -> Iterator[BatchRecord]:
+        """
+        Processes lines, which numbers are given with them, for example, when lines of a script are not adjacent.
+        """
+
+        for line_number, line in lines:
+            user_input: str = line.strip().lower()
+            if not user_input:
+                continue
+            elif user_input == EXIT_VARIABLE:
+                break
+
+            yield self._process_line(line_number=line_number, user_input=user_input, source=source)
+
+    def reset(self) -> None:
+        """
+        Clears variables of the interpreter before processing the next independent script.
+        """
+
+        self._interpreter.reset()
+
+    def _process_line(self, line_number: int, user_input: str, source: Optional[str]) -> BatchRecord:
+        try:
+            variable: str
+            value: float
+            variable, value = self._interpreter.assign(user_input=user_input)
+        except BATCH_ERRORS as e:
+            return BatchRecord(line=line_number, error=e.__class__.__name__, message=str(e).strip(), source=source)
+
+        if variable == RESULT_VARIABLE:
+            self._interpreter.get_result()
+
+        return BatchRecord(line=line_number, variable=variable, value=value, source=source)
+
+
+class ThreadPoolEvaluator:
+    """
+    Evaluates expressions on a pool of threads, which share a single interpreter with its parse cache.
+    Expressions don't assign variables: all of them are evaluated with the same read-only snapshot of variables,
+    so the order of evaluation doesn't change results.
+    """
+
+    def __init__(self, interpreter: MathOperationsInterpreter, max_workers: Optional[int] = None) -> None:
+        self._interpreter: MathOperationsInterpreter = interpreter
+        self._max_workers: Optional[int] = max_workers
+
+    def evaluate(
+            self,
+            expressions: Iterable[str],
+            variables: Optional[Mapping[str, float]] = None
+    ) -> List[BatchRecord]:
+        """
+        Evaluates expressions with provided variables or, if they are not provided, with variables stored
+        in the interpreter at the moment of the call. Records are returned in the order of expressions,
+        numbered from one.
+        """
+
+        snapshot: Mapping[str, float] = MappingProxyType(
+            dict(variables) if variables is not None else self._interpreter.get_variables()
+        )
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            return list(
+                executor.map(
+                    partial(self._evaluate_expression, variables=snapshot),
+                    itertools.count(start=1),
+                    expressions
+                )
+            )
+
+    def _evaluate_expression(self, line_number: int, expression: str, variables: Mapping[str, float]) -> BatchRecord:
+        try:
+            value: float = self._interpreter.compile(expression=expression).evaluate(variables=variables)
+        except BATCH_ERRORS as e:
+            return BatchRecord(line=line_number, error=e.__class__.__name__, message=str(e).strip())
+
+        return BatchRecord(line=line_number, value=value)
+
+
+def write_records(records: Iterable[BatchRecord], output: TextIO, output_format: OutputFormatsEnum) -> int:
+    """
+    Writes records into the output in CSV format with a header or in JSONL format, where empty fields are omitted.
+    Returns the amount of written records. Output is not flushed after each record.
+
+    Example:
+    CSV: "line,variable,value,error,message,source", "1,x,2.0,,,", "2,,,CustomZeroDivisionError,Number can not ...,"
+    JSONL: '{"line": 1, "variable": "x", "value": 2.0}', '{"line": 2, "error": "CustomZeroDivisionError", ...}'
+    """
+
+    count: int = 0
+    if output_format == OutputFormatsEnum.CSV:
+        writer: Any = csv.writer(output)  # Type of CSV writer is not public
+        writer.writerow(BATCH_RECORD_FIELDS)
+        for record in records:
+            writer.writerow(record.values())
+            count += 1
+    else:
+        for record in records:
+            output.write(record.to_json())
+            output.write('\n')
+            count += 1
+
+    return count
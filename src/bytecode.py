@@ -0,0 +1,297 @@
+import math
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Type, Union
+
+from src.commands import BaseCommand, MathCommand
+from src.exceptions import UnknownExpressionTypeError, UndefinedVariableError, UnknownFunctionError
+from src.expressions import (
+    Expression,
+    TreeNode,
+    UnaryOperation,
+    BinaryOperation,
+    FunctionCall,
+    Number,
+    Variable,
+    get_node_children
+)
+
+
+# Operation codes of bytecode instructions. Argument of each instruction is an index in the corresponding pool:
+PUSH_CONSTANT: int = 0  # Pushes a constant from constants pool
+LOAD_VARIABLE: int = 1  # Pushes a value of a variable with the name from variables pool
+UNARY_OPERATION: int = 2  # Replaces the top of the stack with the result of the operation from operations pool
+BINARY_OPERATION: int = 3  # Replaces two values on the top of the stack with the result of the operation
+CALL_FUNCTION: int = 4  # Replaces the top of the stack with the result of the function from functions pool
+
+# Serialized bytecode starts with amounts of instructions, constants, variables, operations and functions,
+# which are followed by operation codes, arguments, constants and names, separated by zero bytes.
+# All numbers are little-endian, so serialized bytecode doesn't depend on the platform:
+BYTECODE_HEADER: struct.Struct = struct.Struct('<5I')
+NAMES_SEPARATOR: str = '\0'
+
+
+def _to_little_endian(values: array) -> array:
+    """
+    Returns values in little-endian byte order. The same conversion restores values in native byte order.
+    """
+
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values
+
+
+@dataclass(frozen=True)
+class Bytecode:
+    """
+    Expression, compiled into a flat stream of postfix instructions with pools of constants and names.
+
+    Instructions are stored in two arrays of the same length: operation codes and their arguments.
+    Bytecode contains only arrays and tuples of strings, so it is compact and can be pickled.
+
+    Example:
+    "x * 2 + 1" is compiled into LOAD_VARIABLE 0, PUSH_CONSTANT 0, BINARY_OPERATION 0, PUSH_CONSTANT 1,
+    BINARY_OPERATION 1 with constants (2.0, 1.0), variables ("x",) and operations ("*", "+").
+    """
+
+    operation_codes: array  # array('B')
+    arguments: array  # array('I')
+    constants: array  # array('d')
+    variables: Tuple[str, ...]
+    operations: Tuple[str, ...]
+    functions: Tuple[str, ...]
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes bytecode into a compact platform independent form, which is restored by from_bytes.
+        """
+
+        return b''.join((
+            BYTECODE_HEADER.pack(
+                len(self.operation_codes),
+                len(self.constants),
+                len(self.variables),
+                len(self.operations),
+                len(self.functions)
+            ),
+            self.operation_codes.tobytes(),
+            _to_little_endian(values=self.arguments).tobytes(),
+            _to_little_endian(values=self.constants).tobytes(),
+            NAMES_SEPARATOR.join(self.variables + self.operations + self.functions).encode()
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, memoryview]) -> 'Bytecode':
+        """
+        Restores serialized bytecode. If data is truncated or names are not valid, raises ValueError.
+        """
+
+        instructions_count: int
+        constants_count: int
+        variables_count: int
+        operations_count: int
+        functions_count: int
+        instructions_count, constants_count, variables_count, operations_count, functions_count = (
+            BYTECODE_HEADER.unpack_from(data)
+        )
+
+        operation_codes: array = array('B')
+        arguments: array = array('I')
+        constants: array = array('d')
+        offset: int = BYTECODE_HEADER.size
+        values_counts: List[Tuple[array, int]] = [
+            (operation_codes, instructions_count),
+            (arguments, instructions_count),
+            (constants, constants_count),
+        ]
+        for values, count in values_counts:
+            if offset + count * values.itemsize > len(data):
+                raise ValueError('Serialized bytecode is truncated.')
+
+            values.frombytes(data[offset: offset + count * values.itemsize])
+            offset += count * values.itemsize
+
+        names: List[str] = bytes(data[offset:]).decode().split(NAMES_SEPARATOR) if len(data) > offset else []
+        if len(names) != variables_count + operations_count + functions_count:
+            raise ValueError('Serialized bytecode is truncated.')
+
+        return cls(
+            operation_codes=operation_codes,
+            arguments=_to_little_endian(values=arguments),
+            constants=_to_little_endian(values=constants),
+            variables=tuple(names[:variables_count]),
+            operations=tuple(names[variables_count: variables_count + operations_count]),
+            functions=tuple(names[variables_count + operations_count:])
+        )
+
+
+class BytecodeCompiler:
+    """
+    Compiles AST into bytecode. Tree is traversed in post-order with an explicit stack,
+    so compilation is not limited by the depth of the tree.
+    """
+
+    def compile(self, node: TreeNode) -> Bytecode:
+        operation_codes: array = array('B')
+        arguments: array = array('I')
+        constants: array = array('d')
+
+        # Indexes of values in pools, so each constant and name is stored once.
+        # Constants are found together with their signs, because zero and negative zero are equal floats:
+        constants_indexes: Dict[Tuple[float, float], int] = {}
+        variables: Dict[str, int] = {}
+        operations: Dict[str, int] = {}
+        functions: Dict[str, int] = {}
+
+        # Operation node is pushed back followed by a marker, when it is visited for the first time,
+        # so its instruction is emitted, when the marker is reached, after instructions of all its children:
+        nodes: List[Optional[TreeNode]] = [node]
+        while nodes:
+            current_node: Optional[TreeNode] = nodes.pop()
+            operation_code: int
+            argument: int
+            if current_node is None:  # Children compiled marker
+                operation_code, argument = self._get_operation_instruction(
+                    node=nodes.pop(),
+                    operations=operations,
+                    functions=functions
+                )
+            elif isinstance(current_node, Number):
+                constant_key: Tuple[float, float] = (current_node.value, math.copysign(1.0, current_node.value))
+                if constant_key not in constants_indexes:
+                    constants_indexes[constant_key] = len(constants)
+                    constants.append(current_node.value)
+
+                operation_code, argument = PUSH_CONSTANT, constants_indexes[constant_key]
+            elif isinstance(current_node, Variable):
+                operation_code, argument = LOAD_VARIABLE, variables.setdefault(current_node.name, len(variables))
+            else:
+                nodes.append(current_node)
+                nodes.append(None)
+                nodes.extend(reversed(get_node_children(node=current_node)))
+                continue
+
+            operation_codes.append(operation_code)
+            arguments.append(argument)
+
+        return Bytecode(
+            operation_codes=operation_codes,
+            arguments=arguments,
+            constants=constants,
+            variables=tuple(variables),
+            operations=tuple(operations),
+            functions=tuple(functions)
+        )
+
+    @staticmethod
+    def decompile(bytecode: Bytecode) -> TreeNode:
+        """
+        Restores AST, which is equal to the compiled one. Instructions are replayed on a stack of nodes,
+        so restoring is not limited by the depth of the tree.
+        If instructions don't form a single expression or refer to missing pools entries, raises ValueError.
+        """
+
+        # Leaves are created once for each constant and variable and shared by the tree, because trees are not modified:
+        constants: List[Expression] = [Number(value=value) for value in bytecode.constants]
+        variables: List[Expression] = [Variable(name=name) for name in bytecode.variables]
+        operations: Tuple[str, ...] = bytecode.operations
+        functions: Tuple[str, ...] = bytecode.functions
+
+        nodes: List[Expression] = []
+        try:
+            for operation_code, argument in zip(bytecode.operation_codes, bytecode.arguments):
+                if operation_code == PUSH_CONSTANT:
+                    nodes.append(constants[argument])
+                elif operation_code == LOAD_VARIABLE:
+                    nodes.append(variables[argument])
+                elif operation_code == BINARY_OPERATION:
+                    right: Expression = nodes.pop()
+                    nodes[-1] = BinaryOperation(operation=operations[argument], left=nodes[-1], right=right)
+                elif operation_code == UNARY_OPERATION:
+                    nodes[-1] = UnaryOperation(operation=operations[argument], expression=nodes[-1])
+                elif operation_code == CALL_FUNCTION:
+                    nodes[-1] = FunctionCall(name=functions[argument], argument=nodes[-1])
+                else:
+                    raise UnknownExpressionTypeError()
+        except IndexError:  # Missing operands or entries of pools
+            raise ValueError('Bytecode is damaged.')
+
+        if len(nodes) != 1 or len(bytecode.operation_codes) != len(bytecode.arguments):
+            raise ValueError('Bytecode is damaged.')
+
+        return nodes[0]
+
+    @staticmethod
+    def _get_operation_instruction(
+            node: Optional[TreeNode],
+            operations: Dict[str, int],
+            functions: Dict[str, int]
+    ) -> Tuple[int, int]:
+
+        if isinstance(node, BinaryOperation):
+            return BINARY_OPERATION, operations.setdefault(node.operation, len(operations))
+        elif isinstance(node, UnaryOperation):
+            return UNARY_OPERATION, operations.setdefault(node.operation, len(operations))
+        elif isinstance(node, FunctionCall):
+            return CALL_FUNCTION, functions.setdefault(node.name, len(functions))
+        else:
+            raise UnknownExpressionTypeError()
+
+
+class StackVirtualMachine:
+    """
+    Executes bytecode on a stack of values. Operations and functions are resolved by their names
+    in commands registries once per execution, so unknown functions are reported before calculation.
+    """
+
+    def __init__(
+            self,
+            base_commands: Dict[str, Type[BaseCommand]],
+            math_commands: Dict[str, Type[MathCommand]]
+    ) -> None:
+
+        self._operations: Dict[str, Callable[[float, float], float]] = {
+            operation: command.as_function() for operation, command in base_commands.items()
+        }
+        self._functions: Dict[str, Callable[[float], float]] = {
+            name: command.as_function() for name, command in math_commands.items()
+        }
+
+    def execute(self, bytecode: Bytecode, variables: Mapping[str, float]) -> float:
+        """
+        Executes bytecode with provided variables.
+        If one of used variables is not provided, raises UndefinedVariableError.
+        """
+
+        operations: List[Callable[[float, float], float]] = [self._operations[name] for name in bytecode.operations]
+        functions: List[Callable[[float], float]] = []
+        for name in bytecode.functions:
+            if name not in self._functions:
+                raise UnknownFunctionError(name=name)
+
+            functions.append(self._functions[name])
+
+        constants: array = bytecode.constants
+        names: Tuple[str, ...] = bytecode.variables
+        stack: List[float] = []
+        for operation_code, argument in zip(bytecode.operation_codes, bytecode.arguments):
+            if operation_code == PUSH_CONSTANT:
+                stack.append(constants[argument])
+            elif operation_code == LOAD_VARIABLE:
+                try:
+                    stack.append(variables[names[argument]])
+                except KeyError:
+                    raise UndefinedVariableError(name=names[argument])
+            elif operation_code == BINARY_OPERATION:
+                right: float = stack.pop()
+                stack[-1] = operations[argument](stack[-1], right)
+            elif operation_code == UNARY_OPERATION:
+                stack[-1] = operations[argument](0, stack[-1])  # Unary operation has only one part of expression
+            else:
+                stack[-1] = functions[argument](stack[-1])
+
+        return stack.pop()
@@ -0,0 +1,121 @@
+import functools
+import math
+import threading
+import types
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+@dataclass
+class CacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        requests: int = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Storage of a bounded size, which evicts the least recently used entry, when there is no space for a new one.
+    Counts hits and misses of lookups. Cache with zero size stores nothing.
+    Cache can be shared by several threads: each operation holds a lock.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError('Cache size can not be negative.')
+
+        self._maxsize: int = maxsize
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Returns the value stored by key and marks it as the most recently used. Returns None, if there is no value.
+        """
+
+        with self._lock:
+            value: Optional[V] = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        if self._maxsize == 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)  # Least recently used entry is the first one
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(hits=self._hits, misses=self._misses, maxsize=self._maxsize, currsize=len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+
+def memoize(
+        function: Callable[[float], float],
+        maxsize: int
+) -> Tuple[Callable[[float], float], Callable[[], CacheInfo]]:
+    """
+    Returns the function, which results are stored in a bounded cache, that evicts the least recently used entry,
+    and the function, which returns statistics of the cache. Cache is implemented in C by functools,
+    so it can be shared by several threads. Lookup costs more, than a call of a C function, like the ones
+    from math module, so such functions are not memoized: cache pays off only for slow functions,
+    which are implemented in Python.
+
+    Arguments are stored with their signs, so negative zero doesn't get the result of zero.
+
+    Example:
+    memoized_function, get_info = memoize(function=slow_function, maxsize=1024)
+    memoized_function(2.0), memoized_function(2.0)
+    get_info()  # CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+    """
+
+    if maxsize <= 0:
+        raise ValueError('Cache size of a function must be positive.')
+    elif isinstance(function, types.BuiltinFunctionType):
+        raise ValueError('Function implemented in C is faster than its cache, so it is not memoized.')
+
+    # Zeros are equal, so their signs are a part of the key:
+    @functools.lru_cache(maxsize=maxsize)
+    def cached_function(value: float, sign: float) -> float:
+        return function(value)
+
+    def memoized_function(value: float) -> float:
+        return cached_function(value, math.copysign(1.0, value))
+
+    def get_info() -> CacheInfo:
+        info: functools._CacheInfo = cached_function.cache_info()
+        return CacheInfo(hits=info.hits, misses=info.misses, maxsize=maxsize, currsize=info.currsize)
+
+    return memoized_function, get_info
@@ -1,5 +1,33 @@
+import math
+import operator
+from typing import Callable
+
 from src.commands.interfaces import BaseCommand
-from src.exceptions import CustomZeroDivisionError
+from src.exceptions import CustomZeroDivisionError, MathDomainError, NumericOverflowError
+
+
+def divide(a: float, b: float) -> float:
+    try:
+        return a / b
+    except ZeroDivisionError:
+        raise CustomZeroDivisionError()
+
+
+def power(a: float, b: float) -> float:
+    """
+    Raises a to the power of b. Unlike "**" operator, math.pow doesn't return complex numbers
+    for negative bases and fractional powers, but raises ValueError, so results are always real.
+    """
+
+    try:
+        return math.pow(a, b)
+    except OverflowError:
+        raise NumericOverflowError()
+    except ValueError:
+        if a == 0:  # Zero is raised to a negative power
+            raise CustomZeroDivisionError()
+
+        raise MathDomainError()
 
 
 class MultiplyCommand(BaseCommand):
@@ -7,14 +35,19 @@ class MultiplyCommand(BaseCommand):
     def execute(self) -> float:
         return self._a * self._b
 
+    @classmethod
+    def as_function(cls) -> Callable[[float, float], float]:
+        return operator.mul
+
 
 class DivideCommand(BaseCommand):
 
     def execute(self) -> float:
-        try:
-            return self._a / self._b
-        except ZeroDivisionError:
-            raise CustomZeroDivisionError()
+        return divide(self._a, self._b)
+
+    @classmethod
+    def as_function(cls) -> Callable[[float, float], float]:
+        return divide
 
 
 class SubtractCommand(BaseCommand):
@@ -22,14 +55,26 @@ class SubtractCommand(BaseCommand):
     def execute(self) -> float:
         return self._a - self._b
 
+    @classmethod
+    def as_function(cls) -> Callable[[float, float], float]:
+        return operator.sub
+
 
 class AddCommand(BaseCommand):
 
     def execute(self) -> float:
         return self._a + self._b
 
+    @classmethod
+    def as_function(cls) -> Callable[[float, float], float]:
+        return operator.add
+
 
 class ExponentialCommand(BaseCommand):
 
     def execute(self) -> float:
-        return self._a ** self._b
+        return power(self._a, self._b)
+
+    @classmethod
+    def as_function(cls) -> Callable[[float, float], float]:
+        return power
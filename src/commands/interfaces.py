@@ -1,4 +1,5 @@
 from abc import abstractmethod, ABC
+from typing import Callable
 
 
 class BaseCommand(ABC):
@@ -11,12 +12,42 @@ class BaseCommand(ABC):
     def execute(self) -> float:
         raise NotImplementedError
 
+    @classmethod
+    def as_function(cls) -> Callable[[float, float], float]:
+        """
+        Returns a function, which calculates the same value, as executed command, without creating its instance.
+        By default, the function creates and executes a command, so commands with an equivalent stateless function
+        should override this method for faster calculations.
+        """
+
+        def execute_command(a: float, b: float) -> float:
+            return cls(a=a, b=b).execute()
+
+        return execute_command
+
 
 class MathCommand(ABC):
 
+    # Command, which calculates its value by a single call of a C function, is faster, than the lookup
+    # of its stored value, so it is not memoized:
+    is_cheap: bool = False
+
     def __init__(self, value: float) -> None:
         self._value: float = value
 
     @abstractmethod
     def execute(self) -> float:
         raise NotImplementedError
+
+    @classmethod
+    def as_function(cls) -> Callable[[float], float]:
+        """
+        Returns a function, which calculates the same value, as executed command, without creating its instance.
+        By default, the function creates and executes a command, so commands with an equivalent stateless function
+        should override this method for faster calculations.
+        """
+
+        def execute_command(value: float) -> float:
+            return cls(value=value).execute()
+
+        return execute_command
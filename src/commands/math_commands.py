@@ -1,39 +1,106 @@
 import math
+from typing import Callable
 
 from src.commands.interfaces import MathCommand
+from src.exceptions import MathDomainError, NumericOverflowError
+
+
+def real_function(function: Callable[[float], float]) -> Callable[[float], float]:
+    """
+    Returns the function, which raises MathDomainError instead of ValueError, that is raised by math functions,
+    when their argument is out of their domain, like sqrt(-1), log(0) or sin of infinity.
+    """
+
+    def calculate(value: float) -> float:
+        try:
+            return function(value)
+        except ValueError:
+            raise MathDomainError()
+
+    return calculate
+
+
+square_root: Callable[[float], float] = real_function(math.sqrt)
+sine: Callable[[float], float] = real_function(math.sin)
+cosine: Callable[[float], float] = real_function(math.cos)
+tangent: Callable[[float], float] = real_function(math.tan)
+logarithm: Callable[[float], float] = real_function(math.log)
+
+
+def exponent(value: float) -> float:
+    try:
+        return math.exp(value)
+    except OverflowError:
+        raise NumericOverflowError()
 
 
 class SqrtCommand(MathCommand):
 
+    is_cheap: bool = True
+
     def execute(self) -> float:
-        return math.sqrt(self._value)
+        return square_root(self._value)
+
+    @classmethod
+    def as_function(cls) -> Callable[[float], float]:
+        return square_root
 
 
 class SinCommand(MathCommand):
 
+    is_cheap: bool = True
+
     def execute(self) -> float:
-        return math.sin(self._value)
+        return sine(self._value)
+
+    @classmethod
+    def as_function(cls) -> Callable[[float], float]:
+        return sine
 
 
 class CosCommand(MathCommand):
 
+    is_cheap: bool = True
+
     def execute(self) -> float:
-        return math.cos(self._value)
+        return cosine(self._value)
+
+    @classmethod
+    def as_function(cls) -> Callable[[float], float]:
+        return cosine
 
 
 class LogCommand(MathCommand):
 
+    is_cheap: bool = True
+
     def execute(self) -> float:
-        return math.log(self._value)
+        return logarithm(self._value)
+
+    @classmethod
+    def as_function(cls) -> Callable[[float], float]:
+        return logarithm
 
 
 class TanCommand(MathCommand):
 
+    is_cheap: bool = True
+
     def execute(self) -> float:
-        return math.tan(self._value)
+        return tangent(self._value)
+
+    @classmethod
+    def as_function(cls) -> Callable[[float], float]:
+        return tangent
 
 
 class ExpCommand(MathCommand):
 
+    is_cheap: bool = True
+
     def execute(self) -> float:
-        return math.exp(self._value)
+        return exponent(self._value)
+
+    @classmethod
+    def as_function(cls) -> Callable[[float], float]:
+        return exponent
@@ -0,0 +1,174 @@
+import sys
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Type
+
+from src.commands import BaseCommand, MathCommand
+from src.exceptions import (
+    ExpressionTooDeepError,
+    UnknownExpressionTypeError,
+    UndefinedVariableError,
+    UnknownFunctionError
+)
+from src.expressions import (
+    TreeNode,
+    UnaryOperation,
+    BinaryOperation,
+    Number,
+    Variable,
+    FunctionCall,
+    get_node_children
+)
+
+
+# Compiled node of AST, which calculates node's value for provided variables:
+Evaluator = Callable[[Mapping[str, float]], float]
+
+
+class CompiledExpression:
+    """
+    Expression, which AST was compiled into a tree of Python closures.
+
+    Can be evaluated many times with different variable bindings without lexing, parsing and walking the AST again.
+    """
+
+    def __init__(self, evaluator: Evaluator, variables: FrozenSet[str]) -> None:
+        self._evaluator: Evaluator = evaluator
+
+        # Names of all variables, which are used in the expression:
+        self.variables: FrozenSet[str] = variables
+
+    def evaluate(self, variables: Optional[Mapping[str, float]] = None) -> float:
+        """
+        Calculates the value of the expression for provided variables.
+        If one of used variables is not provided, raises UndefinedVariableError.
+        Each node is calculated by a nested call of its closure, so if the expression is nested deeper than
+        the recursion limit allows, raises ExpressionTooDeepError.
+        """
+
+        try:
+            return self._evaluator(variables if variables is not None else {})
+        except RecursionError:
+            raise ExpressionTooDeepError(max_depth=sys.getrecursionlimit())
+
+    def __call__(self, **variables: float) -> float:
+        return self.evaluate(variables=variables)
+
+
+class ExpressionCompiler:
+    """
+    Compiles AST into a tree of closures, where each closure calculates the value of a single node.
+    Commands, which are used for calculations, are chosen once during compilation, so unknown functions
+    are reported by raising UnknownFunctionError before evaluation.
+    """
+
+    def __init__(
+            self,
+            base_commands: Dict[str, Type[BaseCommand]],
+            math_commands: Dict[str, Type[MathCommand]]
+    ) -> None:
+
+        self._base_commands: Dict[str, Type[BaseCommand]] = base_commands
+        self._math_commands: Dict[str, Type[MathCommand]] = math_commands
+
+    def compile(self, node: TreeNode) -> CompiledExpression:
+        """
+        Compiles nodes of AST in post-order using an explicit stack, so compilation is not limited by the depth
+        of the tree. Function names are checked, when a function call is reached for the first time,
+        so unknown functions are reported in the order, in which they are written in the expression.
+        """
+
+        variables: Set[str] = set()
+
+        # Operation node is pushed back followed by a marker, when it is visited for the first time,
+        # so it is compiled, when the marker is reached, with compiled children from the top of evaluators stack:
+        evaluators: List[Evaluator] = []
+        nodes: List[Optional[TreeNode]] = [node]
+        while nodes:
+            current_node: Optional[TreeNode] = nodes.pop()
+            if current_node is None:  # Children compiled marker
+                evaluators.append(self._compile_operation(node=nodes.pop(), evaluators=evaluators))
+            elif isinstance(current_node, (UnaryOperation, BinaryOperation, FunctionCall)):
+                if isinstance(current_node, FunctionCall) and current_node.name not in self._math_commands:
+                    raise UnknownFunctionError(name=current_node.name)
+
+                nodes.append(current_node)
+                nodes.append(None)
+                nodes.extend(reversed(get_node_children(node=current_node)))
+            elif isinstance(current_node, Number):
+                evaluators.append(self._compile_number(value=current_node.value))
+            elif isinstance(current_node, Variable):
+                variables.add(current_node.name)
+                evaluators.append(self._compile_variable(name=current_node.name))
+            else:
+                raise UnknownExpressionTypeError()
+
+        return CompiledExpression(evaluator=evaluators.pop(), variables=frozenset(variables))
+
+    def _compile_operation(self, node: Optional[TreeNode], evaluators: List[Evaluator]) -> Evaluator:
+        """
+        Compiles the operation node with compiled children, which are taken from the top of evaluators stack.
+        """
+
+        if isinstance(node, UnaryOperation):
+            return self._compile_unary_operation(
+                command=self._base_commands[node.operation],
+                operand=evaluators.pop()
+            )
+        elif isinstance(node, BinaryOperation):
+            right: Evaluator = evaluators.pop()
+            left: Evaluator = evaluators.pop()
+            return self._compile_binary_operation(
+                command=self._base_commands[node.operation],
+                left=left,
+                right=right
+            )
+        elif isinstance(node, FunctionCall):
+            return self._compile_function_call(
+                command=self._math_commands[node.name],
+                argument=evaluators.pop()
+            )
+        else:
+            raise UnknownExpressionTypeError()
+
+    @staticmethod
+    def _compile_unary_operation(command: Type[BaseCommand], operand: Evaluator) -> Evaluator:
+        operation: Callable[[float, float], float] = command.as_function()
+
+        def unary_operation(variables: Mapping[str, float]) -> float:
+            return operation(0, operand(variables))  # Unary operation has only one part of expression
+
+        return unary_operation
+
+    @staticmethod
+    def _compile_binary_operation(command: Type[BaseCommand], left: Evaluator, right: Evaluator) -> Evaluator:
+        operation: Callable[[float, float], float] = command.as_function()
+
+        def binary_operation(variables: Mapping[str, float]) -> float:
+            return operation(left(variables), right(variables))
+
+        return binary_operation
+
+    @staticmethod
+    def _compile_function_call(command: Type[MathCommand], argument: Evaluator) -> Evaluator:
+        function: Callable[[float], float] = command.as_function()
+
+        def function_call(variables: Mapping[str, float]) -> float:
+            return function(argument(variables))
+
+        return function_call
+
+    @staticmethod
+    def _compile_number(value: float) -> Evaluator:
+        def number(variables: Mapping[str, float]) -> float:
+            return value
+
+        return number
+
+    @staticmethod
+    def _compile_variable(name: str) -> Evaluator:
+        def variable(variables: Mapping[str, float]) -> float:
+            try:
+                return variables[name]
+            except KeyError:
+                raise UndefinedVariableError(name=name)
+
+        return variable
@@ -20,6 +20,7 @@ from src.enums import TokenTypesEnum
 
 LEXICAL_RULES: Dict[TokenTypesEnum, str] = {
     TokenTypesEnum.NUMBER: r'(\d+(\.\d+)?)',
+    TokenTypesEnum.IDENTIFIER: r'([^\W\d_]+)',  # Only alphabetic characters
     TokenTypesEnum.PLUS: r'(\+)',
     TokenTypesEnum.MINUS: r'(\-)',
     TokenTypesEnum.STAR: r'(\*)',
@@ -56,3 +57,10 @@ MATH_COMMANDS: Dict[str, Type[MathCommand]] = {
 
 EXIT_VARIABLE: str = 'exit'
 RESULT_VARIABLE: str = 'result'
+
+# Size of buffers for reading scripts and writing results in batch mode:
+BATCH_BUFFER_SIZE: int = 1024 * 1024
+
+# Version of lexical rules, parser and bytecode. It should be changed, when they are changed,
+# so expressions, which are stored in persistent caches by previous versions, are not used:
+GRAMMAR_VERSION: str = '1'
@@ -0,0 +1,131 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from src.exceptions import UnknownExpressionTypeError
+from src.expressions import (
+    TreeNode,
+    Expression,
+    UnaryOperation,
+    BinaryOperation,
+    Number,
+    Variable,
+    FunctionCall,
+    get_node_children
+)
+
+
+@dataclass(slots=True)
+class DeduplicationStatistics:
+    """
+    Amounts of nodes in deduplicated trees before and after structurally identical subtrees were merged.
+    """
+
+    nodes: int = 0
+    unique_nodes: int = 0
+
+    @property
+    def deduplicated_nodes(self) -> int:
+        return self.nodes - self.unique_nodes
+
+
+class ExpressionDeduplicator:
+    """
+    Merges structurally identical subtrees of AST into a single shared node, so the tree becomes
+    a directed acyclic graph. Nodes are interned bottom-up by their type, operation, value or name
+    and by identities of their already interned children, so identical subtrees of any size are found
+    by a single lookup per node.
+
+    Example:
+    "sqrt(a ^ 2 + b ^ 2) / sqrt(a ^ 2 + b ^ 2)" has 17 nodes, but only 8 of them are unique:
+    both arguments of division become the same FunctionCall node.
+
+    Source tree is not modified, because parsed trees are shared through the parse cache.
+    Nodes, which children are not changed, are reused instead of being copied.
+    """
+
+    def __init__(self) -> None:
+        self._statistics: DeduplicationStatistics = DeduplicationStatistics()
+        self._lock: threading.Lock = threading.Lock()
+
+    def deduplicate(self, node: TreeNode) -> TreeNode:
+        """
+        Returns an equal tree, where identical subtrees are the same objects. Tree is traversed in post-order
+        with an explicit stack, so deduplication is not limited by the depth of the tree.
+        """
+
+        unique_nodes: Dict[Hashable, Expression] = {}
+        nodes_count: int = 0
+
+        # Deduplicated children of nodes, which are waiting for their deduplication:
+        children: List[Expression] = []
+
+        # Operation node is pushed back followed by a marker, when it is visited for the first time,
+        # so it is deduplicated, when the marker is reached, after all its children:
+        nodes: List[Optional[TreeNode]] = [node]
+        while nodes:
+            current_node: Optional[TreeNode] = nodes.pop()
+            key: Hashable
+            unique_node: Expression
+            if current_node is None:  # Children deduplicated marker
+                key, unique_node = self._rebuild_operation(node=nodes.pop(), children=children)
+            elif isinstance(current_node, Number):
+                # Hexadecimal representation distinguishes zero from negative zero, which are equal floats:
+                key, unique_node = (Number, float(current_node.value).hex()), current_node
+            elif isinstance(current_node, Variable):
+                key, unique_node = (Variable, current_node.name), current_node
+            else:
+                nodes.append(current_node)
+                nodes.append(None)
+                nodes.extend(reversed(get_node_children(node=current_node)))
+                continue
+
+            nodes_count += 1
+            children.append(unique_nodes.setdefault(key, unique_node))
+
+        with self._lock:
+            self._statistics.nodes += nodes_count
+            self._statistics.unique_nodes += len(unique_nodes)
+
+        return children.pop()
+
+    def get_statistics(self) -> DeduplicationStatistics:
+        """
+        Returns amounts of nodes in all trees, which were deduplicated since creation or the last reset.
+        """
+
+        with self._lock:
+            return DeduplicationStatistics(nodes=self._statistics.nodes, unique_nodes=self._statistics.unique_nodes)
+
+    def reset_statistics(self) -> None:
+        with self._lock:
+            self._statistics = DeduplicationStatistics()
+
+    @staticmethod
+    def _rebuild_operation(node: Optional[TreeNode], children: List[Expression]) -> Tuple[Hashable, Expression]:
+        """
+        Returns the key of the operation node and the node with deduplicated children,
+        which are taken from the top of children stack.
+        """
+
+        if isinstance(node, BinaryOperation):
+            right: Expression = children.pop()
+            left: Expression = children.pop()
+            if left is not node.left or right is not node.right:
+                node = BinaryOperation(operation=node.operation, left=left, right=right)
+
+            return (BinaryOperation, node.operation, id(left), id(right)), node
+        elif isinstance(node, UnaryOperation):
+            expression: Expression = children.pop()
+            if expression is not node.expression:
+                node = UnaryOperation(operation=node.operation, expression=expression)
+
+            return (UnaryOperation, node.operation, id(expression)), node
+        elif isinstance(node, FunctionCall):
+            argument: Expression = children.pop()
+            if argument is not node.argument:
+                node = FunctionCall(name=node.name, argument=argument)
+
+            return (FunctionCall, node.name, id(argument)), node
+        else:
+            raise UnknownExpressionTypeError()
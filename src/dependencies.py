@@ -0,0 +1,112 @@
+from collections import deque
+from typing import Deque, Dict, List, Set
+
+from src.exceptions import CircularDependencyError
+from src.expressions import TreeNode, Variable, get_node_children
+
+
+def find_variables(node: TreeNode) -> Set[str]:
+    """
+    Returns names of all variables, which are used in the AST.
+    """
+
+    variables: Set[str] = set()
+    nodes: List[TreeNode] = [node]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, Variable):
+            variables.add(node.name)
+        else:
+            nodes.extend(get_node_children(node=node))
+
+    return variables
+
+
+class DependencyGraph:
+    """
+    Directed acyclic graph of variables, where each variable is connected with variables,
+    which were used in the expression assigned to it.
+
+    Example:
+    "x = 2", "y = x * 2", "z = x + y" give edges x -> y, x -> z, y -> z,
+    so after "x" is changed, "y" and then "z" should be recalculated.
+    """
+
+    def __init__(self) -> None:
+        self._dependencies: Dict[str, Set[str]] = {}  # Variables, which are used to calculate a variable
+        self._dependents: Dict[str, Set[str]] = {}  # Variables, which are calculated using a variable
+
+    def set_dependencies(self, variable: str, dependencies: Set[str]) -> None:
+        """
+        Replaces dependencies of the variable with new ones.
+        If variable would depend on itself through new dependencies, raises CircularDependencyError.
+        """
+
+        if self._depends_on(variables=dependencies, dependency=variable):
+            raise CircularDependencyError(name=variable)
+
+        for dependency in self._dependencies.pop(variable, set()):
+            self._dependents[dependency].discard(variable)
+
+        if dependencies:
+            self._dependencies[variable] = set(dependencies)
+
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(variable)
+
+    def get_dependencies(self, variable: str) -> Set[str]:
+        return set(self._dependencies.get(variable, ()))
+
+    def get_dependents(self, variable: str) -> List[str]:
+        """
+        Returns all variables, which directly or transitively depend on the variable, in topological order,
+        so each variable goes after all variables, which it depends on.
+        """
+
+        # Finding all affected variables:
+        affected: Set[str] = set()
+        queue: Deque[str] = deque([variable])
+        while queue:
+            for dependent in self._dependents.get(queue.popleft(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    queue.append(dependent)
+
+        # Sorting affected variables by amount of their affected dependencies (Kahn's algorithm):
+        unresolved_dependencies: Dict[str, int] = {
+            dependent: len(self._dependencies[dependent] & affected) for dependent in affected
+        }
+
+        queue.extend(dependent for dependent, count in unresolved_dependencies.items() if count == 0)
+        ordered_dependents: List[str] = []
+        while queue:
+            resolved_dependent: str = queue.popleft()
+            ordered_dependents.append(resolved_dependent)
+            for next_dependent in self._dependents.get(resolved_dependent, ()):
+                unresolved_dependencies[next_dependent] -= 1
+                if unresolved_dependencies[next_dependent] == 0:
+                    queue.append(next_dependent)
+
+        return ordered_dependents
+
+    def clear(self) -> None:
+        self._dependencies.clear()
+        self._dependents.clear()
+
+    def _depends_on(self, variables: Set[str], dependency: str) -> bool:
+        """
+        Checks, if one of variables is the dependency or directly or transitively depends on it.
+        """
+
+        visited: Set[str] = set()
+        stack: List[str] = list(variables)
+        while stack:
+            current: str = stack.pop()
+            if current == dependency:
+                return True
+
+            if current not in visited:
+                visited.add(current)
+                stack.extend(self._dependencies.get(current, ()))
+
+        return False
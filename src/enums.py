@@ -3,6 +3,7 @@ from enum import Enum
 
 class TokenTypesEnum(str, Enum):
     NUMBER = 'number'
+    IDENTIFIER = 'identifier'
     PLUS = 'plus'
     MINUS = 'minus'
     STAR = 'star'
@@ -11,3 +12,8 @@ class TokenTypesEnum(str, Enum):
     LEFT_PARENTHESIS = 'left_parenthesis'
     RIGHT_PARENTHESIS = 'right_parenthesis'
     EOF = 'EOF'
+
+
+class OutputFormatsEnum(str, Enum):
+    CSV = 'csv'
+    JSONL = 'jsonl'
@@ -32,7 +32,114 @@ class UnknownExpressionTypeError(CustomException):
         self.msg: str = 'Unknown expression type received.\n'
 
 
+class UndefinedVariableError(CustomException):
+
+    def __init__(self, name: str) -> None:
+        self.msg: str = f'Variable "{name}" is not defined. Please check your input and try again.\n'
+
+
+class UnknownFunctionError(CustomException):
+
+    def __init__(self, name: str) -> None:
+        self.msg: str = f'Function "{name}" is not supported. Please check your input and try again.\n'
+
+
+class CircularDependencyError(CustomException):
+
+    def __init__(self, name: str) -> None:
+        self.msg: str = (
+            f'Variable "{name}" can not depend on itself through other variables. '
+            f'Please check your input and try again.\n'
+        )
+
+
 class CustomZeroDivisionError(CustomException):
 
     def __init__(self) -> None:
         self.msg: str = 'Number can not be divided by zero. Please check your input and try again.\n'
+
+
+class MathDomainError(CustomException):
+
+    def __init__(self) -> None:
+        self.msg: str = 'Result of the operation is not a real number. Please check your input and try again.\n'
+
+
+class InputLineTooLongError(CustomException):
+
+    def __init__(self, max_length: int) -> None:
+        self.msg: str = (
+            f'Input line is longer than {max_length} bytes. Please shorten the expression and try again.\n'
+        )
+
+
+class NumericOverflowError(CustomException):
+
+    def __init__(self) -> None:
+        self.msg: str = 'Result of the expression is too large. Please check your input and try again.\n'
+
+
+class ParserStackExhaustedError(CustomException):
+
+    def __init__(self, recursion_limit: int) -> None:
+        self.msg: str = (
+            f'Expression is nested too deep to be parsed within the recursion limit of {recursion_limit} calls. '
+            f'Please simplify the expression and try again.\n'
+        )
+
+
+class ResourceLimitError(CustomException):
+    """
+    Base class of errors, which are raised, when an expression exceeds one of configured resource limits.
+    """
+
+
+class ExpressionTooLongError(ResourceLimitError):
+
+    def __init__(self, max_length: int) -> None:
+        self.msg: str = (
+            f'Expression is longer than {max_length} characters. Please shorten the expression and try again.\n'
+        )
+
+
+class TooManyTokensError(ResourceLimitError):
+
+    def __init__(self, max_tokens: int) -> None:
+        self.msg: str = (
+            f'Expression contains more than {max_tokens} tokens. Please shorten the expression and try again.\n'
+        )
+
+
+class ExpressionTooDeepError(ResourceLimitError):
+
+    def __init__(self, max_depth: int) -> None:
+        self.msg: str = (
+            f'Expression is nested deeper than {max_depth} levels. Please simplify the expression and try again.\n'
+        )
+
+
+class TooManyNodesError(ResourceLimitError):
+
+    def __init__(self, max_nodes: int) -> None:
+        self.msg: str = (
+            f'Expression contains more than {max_nodes} operations and operands. '
+            f'Please simplify the expression and try again.\n'
+        )
+
+
+class EvaluationStepsExceededError(ResourceLimitError):
+
+    def __init__(self, max_steps: int) -> None:
+        self.msg: str = (
+            f'Calculation of the expression takes more than {max_steps} steps. '
+            f'Please simplify the expression and try again.\n'
+        )
+
+
+class EvaluationTimeoutError(ResourceLimitError):
+
+    def __init__(self, timeout: float) -> None:
+        self.msg: str = (
+            f'Calculation of the expression takes more than {timeout} seconds. '
+            f'Please simplify the expression and try again.\n'
+        )
@@ -1,21 +1,25 @@
 from dataclasses import dataclass
+from typing import Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class TreeNode:
     """
     Abstract Syntax Tree.
+
+    Nodes are slotted, so they don't have a per-instance dictionary and take less memory,
+    when many parsed expressions are stored.
     """
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Expression(TreeNode):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOperation(Expression):
     """
     -(2 + 3), where minus is operation and (2 + 3) is an expression.
@@ -25,7 +29,7 @@ class UnaryOperation(Expression):
     expression: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOperation(Expression):
     """
     1 * 2 + 3 * 3, where "1 * 2" is left expression, "+" is operation and "3 * 3" is right expression.
@@ -36,6 +40,45 @@ class BinaryOperation(Expression):
     right: Expression
 
 
-@dataclass
+@dataclass(slots=True)
 class Number(Expression):
     value: float
+
+
+@dataclass(slots=True)
+class FunctionCall(Expression):
+    """
+    sqrt(2 + 2), where "sqrt" is a name of math function and (2 + 2) is its argument.
+    """
+
+    name: str
+    argument: Expression
+
+
+@dataclass(slots=True)
+class Variable(Expression):
+    """
+    x * 2, where "x" is a variable, which value is taken from variables storage during calculation.
+    """
+
+    name: str
+
+
+def get_node_children(node: TreeNode) -> Tuple[Expression, ...]:
+    """
+    Returns child nodes of the node in the order, in which they are written in the expression,
+    so trees are walked the same way by all traversals. Numbers, variables and unknown nodes have no children.
+
+    Example:
+    :param node: BinaryOperation(operation="+", left=Number(value=1), right=Variable(name="x"))
+    :return: (Number(value=1), Variable(name="x"))
+    """
+
+    if isinstance(node, BinaryOperation):
+        return node.left, node.right
+    elif isinstance(node, UnaryOperation):
+        return (node.expression,)
+    elif isinstance(node, FunctionCall):
+        return (node.argument,)
+    else:
+        return ()
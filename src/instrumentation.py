@@ -0,0 +1,189 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.cache import CacheInfo
+from src.expressions import TreeNode, get_node_children
+
+
+# Stages of interpretation, which are timed:
+VALIDATION_STAGE: str = 'validation'
+NORMALIZATION_STAGE: str = 'normalization'
+LEXING_STAGE: str = 'lexing'
+PARSING_STAGE: str = 'parsing'
+OPTIMIZATION_STAGE: str = 'optimization'
+DEDUPLICATION_STAGE: str = 'deduplication'
+EVALUATION_STAGE: str = 'evaluation'
+LOADING_STAGE: str = 'loading'  # Restoring of parsed expressions from persistent cache
+STORING_STAGE: str = 'storing'  # Adding of parsed expressions to persistent cache
+
+# Counters of interpretation:
+ASSIGNMENTS_COUNTER: str = 'assignments'
+TOKENS_COUNTER: str = 'tokens'
+NODES_COUNTER: str = 'nodes'
+
+# Kinds of events, which are passed to the callback:
+STAGE_EVENT: str = 'stage'
+COUNTER_EVENT: str = 'counter'
+ERROR_EVENT: str = 'error'
+
+
+@dataclass(slots=True)
+class InstrumentationEvent:
+    """
+    Single measurement: duration of a stage in seconds, increment of a counter or an error, which value is one.
+    """
+
+    kind: str
+    name: str
+    value: float
+
+
+@dataclass(slots=True)
+class StageTimings:
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+def count_nodes(node: TreeNode) -> int:
+    """
+    Returns the amount of nodes in the AST.
+    """
+
+    count: int = 0
+    nodes: List[TreeNode] = [node]
+    while nodes:
+        node = nodes.pop()
+        count += 1
+        nodes.extend(get_node_children(node=node))
+
+    return count
+
+
+class Instrumentation:
+    """
+    Collects wall time of interpretation stages, counters of processed tokens and nodes, errors by their types
+    and statistics of registered caches. Collected data is returned by snapshot and, if callback is provided,
+    each measurement is passed to it as soon as it is made, for example, to export it into a metrics system.
+
+    Instrumentation is opt-in: interpreter without it checks a single attribute per interpretation step.
+    Instrumentation can be shared by several threads: each update holds a lock.
+
+    Example:
+    instrumentation = Instrumentation()
+    interpreter.set_instrumentation(instrumentation=instrumentation)
+    interpreter.interpret(user_input="x = 2 + 3")
+    instrumentation.snapshot()["stages"]["lexing"]  # {"calls": 1, "total_seconds": ..., ...}
+    """
+
+    def __init__(self, callback: Optional[Callable[[InstrumentationEvent], None]] = None) -> None:
+        self._callback: Optional[Callable[[InstrumentationEvent], None]] = callback
+        self._stages: Dict[str, StageTimings] = {}
+        self._counters: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._caches: Dict[str, Callable[[], CacheInfo]] = {}  # Functions, which return statistics of caches
+        self._lock: threading.Lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """
+        Records wall time of the code inside the block as a stage, even if it raises an error.
+        """
+
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage=stage, seconds=time.perf_counter() - start)
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stages.setdefault(stage, StageTimings()).add(seconds=seconds)
+
+        if self._callback is not None:
+            self._callback(InstrumentationEvent(kind=STAGE_EVENT, name=stage, value=seconds))
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+        if self._callback is not None:
+            self._callback(InstrumentationEvent(kind=COUNTER_EVENT, name=counter, value=amount))
+
+    def record_error(self, error: Exception) -> None:
+        error_type: str = error.__class__.__name__
+        with self._lock:
+            self._errors[error_type] = self._errors.get(error_type, 0) + 1
+
+        if self._callback is not None:
+            self._callback(InstrumentationEvent(kind=ERROR_EVENT, name=error_type, value=1))
+
+    def register_cache(self, name: str, get_info: Callable[[], CacheInfo]) -> None:
+        """
+        Adds statistics of the cache, which are returned by get_info, to snapshots.
+        Cache counts its hits and misses itself, so registered cache adds no overhead to lookups.
+
+        Example:
+        instrumentation.register_cache(name="parse", get_info=parse_cache.info)
+        """
+
+        with self._lock:
+            self._caches[name] = get_info
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns a copy of collected data, which is not changed by next measurements.
+
+        Example:
+        {
+            "stages": {"lexing": {"calls": 2, "total_seconds": 0.00004, "mean_seconds": 0.00002, "max_seconds": ...}},
+            "counters": {"assignments": 2, "tokens": 8, "nodes": 5},
+            "errors": {"CustomZeroDivisionError": 1},
+            "caches": {"parse": {"hits": 1, "misses": 1, "hit_rate": 0.5, "maxsize": 1024, "currsize": 1}}
+        }
+        """
+
+        with self._lock:
+            stages: Dict[str, Dict[str, float]] = {
+                stage: {
+                    'calls': timings.calls,
+                    'total_seconds': timings.total_seconds,
+                    'mean_seconds': timings.total_seconds / timings.calls,
+                    'max_seconds': timings.max_seconds,
+                }
+                for stage, timings in self._stages.items()
+            }
+            counters: Dict[str, int] = dict(self._counters)
+            errors: Dict[str, int] = dict(self._errors)
+            registered_caches: List[Tuple[str, Callable[[], CacheInfo]]] = list(self._caches.items())
+
+        caches: Dict[str, Dict[str, float]] = {}
+        for name, get_info in registered_caches:
+            cache_info: CacheInfo = get_info()
+            caches[name] = {
+                'hits': cache_info.hits,
+                'misses': cache_info.misses,
+                'hit_rate': cache_info.hit_rate,
+                'maxsize': cache_info.maxsize,
+                'currsize': cache_info.currsize,
+            }
+
+        return {'stages': stages, 'counters': counters, 'errors': errors, 'caches': caches}
+
+    def reset(self) -> None:
+        """
+        Clears collected stages, counters and errors. Registered caches are kept.
+        """
+
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._errors.clear()
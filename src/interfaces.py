@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, List
 
 from src.expressions import Expression
 from src.tokens import Token
@@ -8,7 +8,7 @@ from src.tokens import Token
 class Parser(ABC):
 
     @abstractmethod
-    def parse(self, tokens: List[Token]) -> Expression:
+    def parse(self, tokens: Iterable[Token]) -> Expression:
         raise NotImplementedError
 
 
@@ -1,18 +1,67 @@
-from typing import Type, Dict, List, Tuple, Optional
-
+import re
+import sys
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Type, Dict, List, Mapping, Tuple, Optional, Set, TYPE_CHECKING, cast
+
+from src.bytecode import Bytecode, BytecodeCompiler, StackVirtualMachine
+from src.cache import CacheInfo, LRUCache, memoize
 from src.commands import BaseCommand, MathCommand
+from src.compiler import CompiledExpression, ExpressionCompiler
 from src.config import RESULT_VARIABLE
+from src.deduplication import DeduplicationStatistics, ExpressionDeduplicator
+from src.dependencies import DependencyGraph, find_variables
 from src.exceptions import (
     IncorrectVariableAssignmentError,
     UnknownExpressionTypeError,
     ParseError,
     ExpressionSyntaxError,
-    CustomZeroDivisionError
+    CustomZeroDivisionError,
+    UndefinedVariableError,
+    UnknownFunctionError,
+    CircularDependencyError,
+    NumericOverflowError,
+    MathDomainError,
+    ParserStackExhaustedError,
+    ResourceLimitError,
+    ExpressionTooLongError,
+    EvaluationStepsExceededError,
+    EvaluationTimeoutError
+)
+from src.expressions import TreeNode, UnaryOperation, BinaryOperation, Number, Variable, FunctionCall
+from src.instrumentation import (
+    Instrumentation,
+    VALIDATION_STAGE,
+    NORMALIZATION_STAGE,
+    LEXING_STAGE,
+    PARSING_STAGE,
+    OPTIMIZATION_STAGE,
+    DEDUPLICATION_STAGE,
+    EVALUATION_STAGE,
+    LOADING_STAGE,
+    STORING_STAGE,
+    ASSIGNMENTS_COUNTER,
+    TOKENS_COUNTER,
+    NODES_COUNTER,
+    count_nodes
 )
-from src.expressions import TreeNode, UnaryOperation, BinaryOperation, Number
 from src.interfaces import Processor, Parser
+from src.limits import ResourceLimits, check_tree_limits
+from src.optimizer import ExpressionOptimizer
+from src.persistent_cache import PersistentExpressionCache
+from src.result_cache import ResultCache
 from src.tokens import Token
 
+if TYPE_CHECKING:
+    from src.vectorized import VectorizedExpression
+
+
+# Deadline of calculation is checked once per this amount of calculated operations, so time is not read for each:
+DEADLINE_CHECK_INTERVAL: int = 256
+
+# Block, which replaces timing of a stage, when instrumentation is disabled. It keeps no state, so it is shared:
+NO_MEASUREMENT: ContextManager[None] = nullcontext()
+
 
 class MathOperationsInterpreter:
 
@@ -21,17 +70,121 @@ class MathOperationsInterpreter:
             interpreter_base_commands: Dict[str, Type[BaseCommand]],
             interpreter_math_commands: Dict[str, Type[MathCommand]],
             parser: Parser,
-            lexical_processor: Processor
+            lexical_processor: Processor,
+            parse_cache_size: int = 1024,
+            result_cache_size: int = 0,
+            optimize_expressions: bool = False,
+            recompute_dependents: bool = False,
+            deduplicate_expressions: bool = False,
+            memoized_functions: Optional[Mapping[str, int]] = None,
+            instrumentation: Optional[Instrumentation] = None,
+            persistent_cache: Optional[PersistentExpressionCache] = None,
+            limits: Optional[ResourceLimits] = None
     ) -> None:
 
         self._base_commands: Dict[str, Type[BaseCommand]] = interpreter_base_commands
         self._math_commands: Dict[str, Type[MathCommand]] = interpreter_math_commands
+
+        # Functions, which calculate commands without creating their instances for each calculated node:
+        self._operations: Dict[str, Callable[[float, float], float]] = {
+            operation: command.as_function() for operation, command in interpreter_base_commands.items()
+        }
+        self._functions: Dict[str, Callable[[float], float]] = {
+            name: command.as_function() for name, command in interpreter_math_commands.items()
+        }
+
+        # Results of pure functions can be stored in bounded caches, which sizes are given by names of functions.
+        # No function is memoized by default: lookup costs more, than built-in functions, so it is useful only
+        # for slow commands, which are implemented in Python, and cheap commands are not memoized at all:
+        self._function_caches: Dict[str, Callable[[], CacheInfo]] = {}
+        for name, cache_size in (memoized_functions or {}).items():
+            if name not in self._functions:
+                raise UnknownFunctionError(name=name)
+            elif interpreter_math_commands[name].is_cheap:
+                raise ValueError(f'Function "{name}" is faster than its cache, so it is not memoized.')
+
+            self._functions[name], self._function_caches[name] = memoize(
+                function=self._functions[name],
+                maxsize=cache_size
+            )
+
+        # Methods, which calculate values of nodes, by types of nodes, so node's type is checked by a single lookup:
+        self._node_calculators: Dict[type, Callable[[Any], float]] = {
+            BinaryOperation: self._calculate_binary_operation_value,
+            UnaryOperation: self._calculate_unary_operation_value,
+            FunctionCall: self._calculate_function_call_value,
+            Number: self._calculate_number_value,
+            Variable: self._calculate_variable_value,
+        }
+
         self._parser: Parser = parser
         self._lexical_processor: Processor = lexical_processor
-
-        # Storage for executed expressions, which can be user in future expressions:
+        self._compiler: ExpressionCompiler = ExpressionCompiler(
+            base_commands=interpreter_base_commands,
+            math_commands=interpreter_math_commands
+        )
+        self._bytecode_compiler: BytecodeCompiler = BytecodeCompiler()
+        self._virtual_machine: StackVirtualMachine = StackVirtualMachine(
+            base_commands=interpreter_base_commands,
+            math_commands=interpreter_math_commands
+        )
+
+        # Optimization changes results of some operations in the last bits, so it is disabled by default:
+        self._optimize_expressions: bool = optimize_expressions
+        self._optimizer: ExpressionOptimizer = ExpressionOptimizer(
+            base_commands=interpreter_base_commands,
+            math_commands=interpreter_math_commands
+        )
+
+        # If enabled, identical subtrees of parsed expressions are merged, so they are stored and calculated once:
+        self._deduplicate_expressions: bool = deduplicate_expressions
+        self._deduplicator: ExpressionDeduplicator = ExpressionDeduplicator()
+
+        # Parsed expressions by their normalized text. Stored trees are shared and should not be modified:
+        self._parse_cache: LRUCache[str, TreeNode] = LRUCache(maxsize=parse_cache_size)
+
+        # Calculated values of expressions by their texts and values of variables, which are used in them.
+        # Looking up values of variables is slower than calculation of short expressions, so it is disabled by default:
+        self._cache_results: bool = result_cache_size > 0
+        self._result_cache: ResultCache = ResultCache(maxsize=result_cache_size)
+
+        # Parsed expressions, which are stored on disk, so they are not lexed and parsed again after restart:
+        self._persistent_cache: Optional[PersistentExpressionCache] = persistent_cache
+
+        # Storage for executed expressions, which can be user in future expressions.
+        # Variables in expressions are parsed into Variable nodes, which values are taken from here during calculation:
         self._user_variables: Dict[str, float] = {}
 
+        # If enabled, variables, which were calculated using a reassigned variable, are recalculated.
+        # For this purpose expressions of such variables and dependencies between variables are stored:
+        self._recompute_dependents: bool = recompute_dependents
+        self._dependency_graph: DependencyGraph = DependencyGraph()
+        self._assignments: Dict[str, Tuple[str, TreeNode]] = {}
+
+        # If steps or time of calculation are limited, expressions are calculated iteratively, counting operations.
+        # Limits of input, tokens and trees are checked by lexical processor and parser, which get the same limits:
+        self._limits: ResourceLimits = limits or ResourceLimits()
+
+        # Instrumentation is disabled by default, so interpretation steps only check, that it is not set:
+        self._instrumentation: Optional[Instrumentation] = None
+        if instrumentation is not None:
+            self.set_instrumentation(instrumentation=instrumentation)
+
+    def set_instrumentation(self, instrumentation: Optional[Instrumentation]) -> None:
+        """
+        Enables collecting of stages timings, counters and errors into provided instrumentation
+        or disables it, if instrumentation is None.
+        """
+
+        self._instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.register_cache(name='parse', get_info=self._parse_cache.info)
+            if self._cache_results:
+                instrumentation.register_cache(name='result', get_info=self._result_cache.info)
+
+            for name, get_info in self._function_caches.items():
+                instrumentation.register_cache(name=f'function.{name}', get_info=get_info)
+
     def interpret(self, user_input: str) -> None:
         """
         1) Receives user input and checks it validity;
@@ -40,21 +193,127 @@ class MathOperationsInterpreter:
         """
 
         try:
-            key: str
-            expression: str
-            key, expression = self._validate_user_input(user_input=user_input.lower())
-
-            expression_result: float = self._execute(expression=expression)
-            self._user_variables[key] = expression_result
+            self.assign(user_input=user_input)
         except (
                 ParseError,
                 ExpressionSyntaxError,
                 IncorrectVariableAssignmentError,
                 UnknownExpressionTypeError,
-                CustomZeroDivisionError
+                CustomZeroDivisionError,
+                UndefinedVariableError,
+                UnknownFunctionError,
+                CircularDependencyError,
+                NumericOverflowError,
+                MathDomainError,
+                ParserStackExhaustedError,
+                ResourceLimitError
         ) as e:
             print(e)
 
+    def assign(self, user_input: str) -> Tuple[str, float]:
+        """
+        Interprets the user input the same way as interpret, but raises errors instead of printing them.
+        Returns the assigned variable and its value.
+        """
+
+        try:
+            key: str
+            expression: str
+            with self._measure(stage=VALIDATION_STAGE):
+                key, expression = self._validate_user_input(user_input=user_input.lower())
+
+            operations_tree: TreeNode
+            expression, operations_tree = self._normalize_and_parse(expression=expression)
+            with self._measure(stage=EVALUATION_STAGE):
+                if self._recompute_dependents:
+                    self._assign_and_recompute_dependents(
+                        key=key,
+                        expression=expression,
+                        operations_tree=operations_tree
+                    )
+                else:
+                    self._user_variables[key] = self._calculate_expression_value(
+                        expression=expression,
+                        node=operations_tree
+                    )
+        except Exception as e:
+            self._record_error(error=e)
+            raise
+
+        if self._instrumentation is not None:
+            self._instrumentation.increment(counter=ASSIGNMENTS_COUNTER)
+
+        return key, self._user_variables[key]
+
+    def compile(self, expression: str) -> CompiledExpression:
+        """
+        Compiles the expression once into an object, which can be evaluated many times with different variables
+        without lexing and parsing the expression again. Stored user variables are not used by compiled expression.
+
+        Example:
+        compiled_expression = interpreter.compile(expression="x * 2 + y")
+        compiled_expression(x=1, y=3)  # 5.0
+        compiled_expression.evaluate(variables={"x": 2, "y": 1})  # 5.0
+        """
+
+        try:
+            return self._compiler.compile(node=self._parse(expression=expression.lower()))
+        except Exception as e:
+            self._record_error(error=e)
+            raise
+
+    def compile_bytecode(self, expression: str) -> Bytecode:
+        """
+        Compiles the expression into a flat stream of postfix instructions, which is executed by a stack machine.
+        Bytecode is stored in compact arrays and can be pickled, so it is suitable for long-lived expressions.
+
+        Example:
+        bytecode = interpreter.compile_bytecode(expression="x * 2 + y")
+        interpreter.execute_bytecode(bytecode=bytecode, variables={"x": 1, "y": 3})  # 5.0
+        """
+
+        try:
+            return self._bytecode_compiler.compile(node=self._parse(expression=expression.lower()))
+        except Exception as e:
+            self._record_error(error=e)
+            raise
+
+    def execute_bytecode(self, bytecode: Bytecode, variables: Optional[Mapping[str, float]] = None) -> float:
+        """
+        Executes compiled bytecode with provided variables.
+        If variables are not provided, stored user variables are used.
+        """
+
+        return self._virtual_machine.execute(
+            bytecode=bytecode,
+            variables=variables if variables is not None else self._user_variables
+        )
+
+    def vectorize(self, expression: str) -> 'VectorizedExpression':
+        """
+        Parses the expression once into an object, which evaluates it over arrays of variable values at once
+        using NumPy. Errors are reported per element instead of aborting the whole batch.
+
+        Example:
+        vectorized_expression = interpreter.vectorize(expression="1 / x")
+        result = vectorized_expression.evaluate(variables={"x": [1, 0, 4]})
+        result.values  # array([1.0, nan, 0.25])
+        result.zero_division  # array([False, True, False])
+        """
+
+        # NumPy is an optional dependency, which is required only for vectorized evaluation:
+        from src.vectorized import VectorizedExpression
+
+        try:
+            return VectorizedExpression(
+                tree=self._parse(expression=expression.lower()),
+                base_commands=self._base_commands,
+                math_commands=self._math_commands
+            )
+        except Exception as e:
+            self._record_error(error=e)
+            raise
+
     def _validate_user_input(self, user_input: str) -> Tuple[str, str]:
         """
         Validates user input. If input is invalid, raises IncorrectVariableAssignmentError.
@@ -82,7 +341,7 @@ class MathOperationsInterpreter:
             use_var_index: int = values[0].find(equal_sign)
             user_variable = values[0][: use_var_index]
             expression = values[0][use_var_index + 1:]
-        elif values[1] == equal_sign:
+        elif len(values) > 1 and values[1] == equal_sign:
             user_variable = values[0]
             expression = user_input_sep.join(values[2:])
         else:
@@ -91,134 +350,416 @@ class MathOperationsInterpreter:
         if not user_variable.isalpha():
             raise IncorrectVariableAssignmentError()
 
-        expression = self._substitute_user_variables(expression=expression)
         return user_variable, expression
 
-    def _substitute_user_variables(self, expression: str) -> str:
+    def _execute(self, expression: str) -> float:
         """
-        Substitutes already interpreted variable in expression if exists.
+        1) Generates tokens from the expression for parsing purpose;
+        2) Creates AST (Abstract Syntax Tree) on tokens basis;
+        3) Recursively calculates the value of a parsed expression based on the AST.
         """
 
-        for key in self._user_variables.keys():
-            if key in expression:
-                expression = expression.replace(key, str(self._user_variables[key]))
+        operations_tree: TreeNode
+        expression, operations_tree = self._normalize_and_parse(expression=expression)
+        return self._calculate_expression_value(expression=expression, node=operations_tree)
 
-        return expression
+    def _calculate_expression_value(self, expression: str, node: TreeNode) -> float:
+        """
+        Calculates the value of a parsed expression or takes it from the result cache, if it is enabled
+        and the expression was calculated with the same values of its variables.
+        Expression should be normalized, so expressions, which differ only by whitespaces, share cached values.
+        """
 
-    def _execute(self, expression: str) -> float:
+        if not self._cache_results:
+            return self._calculate_node_value(node=node)
+
+        result: Optional[float] = self._result_cache.get(
+            expression=expression,
+            tree=node,
+            variables=self._user_variables
+        )
+        if result is None:
+            result = self._calculate_node_value(node=node)
+            self._result_cache.put(expression=expression, tree=node, variables=self._user_variables, result=result)
+
+        return result
+
+    def _assign_and_recompute_dependents(self, key: str, expression: str, operations_tree: TreeNode) -> None:
         """
-        1) All basic mathematical functions, such as sin, cos, tan, log, sqrt and exp,
-        are executed if any in the expression;
-        2) Generates tokens from the expression for parsing purpose;
-        3) Creates AST (Abstract Syntax Tree) on tokens basis;
-        4) Recursively calculates the value of a parsed expression based on the AST.
+        1) Calculates the value of a parsed expression and assigns it to a given variable;
+        2) Records variables, which were used in the expression, as dependencies of a given variable.
+        If variable would depend on itself through them, raises CircularDependencyError;
+        3) Recalculates all variables, which depend on a given variable, in topological order.
+
+        Expression, which uses the variable it is assigned to, like "x = x + 1", is calculated only once,
+        because recalculation would change the result each time.
+
+        Assignment is applied only, if all dependents are recalculated. If one of them can not be calculated,
+        like "y = 1 / x" after "x = 0", values and dependencies of all variables are restored and the error
+        is raised, so variables are never left calculated with different values of their dependencies.
         """
 
-        expression = self._execute_math_operations(expression=expression)
-        tokens: List[Token] = self._lexical_processor.process_expression(expression=expression)
+        expression_result: float = self._calculate_expression_value(expression=expression, node=operations_tree)
 
+        dependencies: Set[str] = find_variables(node=operations_tree)
+        if key in dependencies:
+            dependencies = set()
+
+        previous_dependencies: Set[str] = self._dependency_graph.get_dependencies(variable=key)
+        self._dependency_graph.set_dependencies(variable=key, dependencies=dependencies)
+
+        # Previous values of changed variables, which are restored, if recalculation fails:
+        previous_values: Dict[str, Optional[float]] = {key: self._user_variables.get(key)}
+        self._user_variables[key] = expression_result
         try:
-            operations_tree: TreeNode = self._parser.parse(tokens=tokens)
-        except ParseError:
-            raise ExpressionSyntaxError()
+            for dependent in self._dependency_graph.get_dependents(variable=key):
+                dependent_expression: str
+                dependent_tree: TreeNode
+                dependent_expression, dependent_tree = self._assignments[dependent]
+                previous_values[dependent] = self._user_variables[dependent]
+                self._user_variables[dependent] = self._calculate_expression_value(
+                    expression=dependent_expression,
+                    node=dependent_tree
+                )
+        except Exception:
+            for variable, value in previous_values.items():
+                if value is None:
+                    del self._user_variables[variable]
+                else:
+                    self._user_variables[variable] = value
+
+            self._dependency_graph.set_dependencies(variable=key, dependencies=previous_dependencies)
+            raise
+
+        if dependencies:
+            self._assignments[key] = (expression, operations_tree)
+        else:
+            self._assignments.pop(key, None)
 
-        return self._calculate_node_value(node=operations_tree)
+    def _parse(self, expression: str) -> TreeNode:
+        """
+        Generates tokens from the expression and creates AST (Abstract Syntax Tree) on tokens basis.
+        If tokens can not be parsed, raises ExpressionSyntaxError.
+        """
+
+        return self._normalize_and_parse(expression=expression)[1]
 
-    def _execute_math_operations(self, expression: str) -> str:
+    def _normalize_and_parse(self, expression: str) -> Tuple[str, TreeNode]:
         """
-        Searches for a math function in expression.
-        If such function is found, calculates its value and replaces the subexpression related to the
-        math function with the calculated value.
+        Parses the expression the same way as _parse and returns its normalized text with its AST.
 
-        Example:
-        :param expression: "sqrt(25) + 5 * 2"
-        :return: "5.0 + 5 * 2"
+        Parsed trees are cached by normalized expression, so expressions, which differ only by whitespaces,
+        are lexed, parsed and optimized, if optimization is enabled, once.
+        Length of the expression is limited before normalization, so too long input is not even scanned.
         """
 
-        for math_command in self._math_commands.keys():
-            math_command_index: int = expression.find(math_command)
-            if math_command_index != -1:  # Not found
-                math_command_expression: str
-                postfix: str
-                math_command_expression, postfix = self._extract_expression_from_parentless(
-                    expression=expression[math_command_index + len(math_command):]
-                )
+        if self._limits.max_input_length is not None and len(expression) > self._limits.max_input_length:
+            raise ExpressionTooLongError(max_length=self._limits.max_input_length)
 
-                command = self._math_commands[math_command](
-                    value=self._execute(
-                        expression=math_command_expression
-                    )
-                )
+        with self._measure(stage=NORMALIZATION_STAGE):
+            expression = self._normalize_expression(expression=expression)
+
+        operations_tree: Optional[TreeNode] = self._parse_cache.get(key=expression)
+        if operations_tree is not None:
+            return expression, operations_tree
+
+        if self._persistent_cache is not None:
+            with self._measure(stage=LOADING_STAGE):
+                operations_tree = self._load_persisted_tree(expression=expression)
+
+        if operations_tree is None:
+            with self._measure(stage=LEXING_STAGE):
+                tokens: List[Token] = self._lexical_processor.process_expression(expression=expression)
+
+            if self._instrumentation is not None:
+                self._instrumentation.increment(counter=TOKENS_COUNTER, amount=len(tokens))
 
-                prefix: str = expression[: math_command_index]
-                expression = prefix + str(command.execute()) + postfix
+            with self._measure(stage=PARSING_STAGE):
+                try:
+                    operations_tree = self._parser.parse(tokens=tokens)
+                except ParseError:
+                    raise ExpressionSyntaxError()
 
-        return expression
+            if self._persistent_cache is not None:
+                with self._measure(stage=STORING_STAGE):
+                    self._persist_tree(expression=expression, operations_tree=operations_tree)
+
+        if self._optimize_expressions:
+            with self._measure(stage=OPTIMIZATION_STAGE):
+                operations_tree = self._optimizer.optimize(node=operations_tree)
+
+        if self._deduplicate_expressions:
+            with self._measure(stage=DEDUPLICATION_STAGE):
+                operations_tree = self._deduplicator.deduplicate(node=operations_tree)
+
+        if self._instrumentation is not None:
+            self._instrumentation.increment(counter=NODES_COUNTER, amount=count_nodes(node=operations_tree))
+
+        self._parse_cache.put(key=expression, value=operations_tree)
+        return expression, operations_tree
+
+    def _measure(self, stage: str) -> ContextManager[None]:
+        """
+        Returns the block, which times the stage, if instrumentation is enabled, or the block, which does nothing.
+        """
+
+        if self._instrumentation is None:
+            return NO_MEASUREMENT
+
+        return self._instrumentation.measure(stage=stage)
+
+    def _record_error(self, error: Exception) -> None:
+        if self._instrumentation is not None:
+            self._instrumentation.record_error(error=error)
+
+    def _load_persisted_tree(self, expression: str) -> Optional[TreeNode]:
+        """
+        Restores the tree of the normalized expression from persistent cache, if it is enabled and has the expression.
+        Damaged entry is not restored, so the expression is parsed again. Restored tree is checked by limits
+        of trees the same way, as parser checks parsed trees.
+        """
+
+        if self._persistent_cache is None:
+            return None
+
+        bytecode: Optional[Bytecode] = self._persistent_cache.get(expression=expression)
+        if bytecode is None:
+            return None
+
+        try:
+            operations_tree: TreeNode = self._bytecode_compiler.decompile(bytecode=bytecode)
+        except (ValueError, UnknownExpressionTypeError):
+            return None
+
+        if self._limits.limits_tree:
+            check_tree_limits(node=operations_tree, limits=self._limits)
+
+        return operations_tree
+
+    def _persist_tree(self, expression: str, operations_tree: TreeNode) -> None:
+        """
+        Stores not optimized tree, so the cache doesn't depend on optimization settings of interpreters.
+        """
+
+        if self._persistent_cache is not None:
+            self._persistent_cache.put(
+                expression=expression,
+                bytecode=self._bytecode_compiler.compile(node=operations_tree)
+            )
 
     @staticmethod
-    def _extract_expression_from_parentless(expression: str) -> Tuple[str, str]:
+    def _normalize_expression(expression: str) -> str:
         """
-        Extracts subexpression from parentless in original expression for math functions purposes.
-        If original expression is not valid or there is no parentless in it, raises ExpressionSyntaxError.
-        Returns extracted subexpression and the remaining part of original expression.
+        Removes whitespaces, which do not separate numbers or variables, and replaces the rest of them
+        with a single space, so the meaning of the expression is not changed.
 
         Example:
-        :param expression: "(5 + 2) * 3"
-        :return: ("5 + 2", " * 3")
+        :param expression: " 2 +  3 * (x  y) "
+        :return: "2+3*(x y)"
         """
 
-        opening_parenthesis: str = '('
-        closing_parenthesis: str = ')'
-        if not expression.startswith(opening_parenthesis):
-            raise ExpressionSyntaxError()
+        def replace_whitespaces(whitespaces: re.Match[str]) -> str:
+            previous_symbol: str = whitespaces.string[whitespaces.start() - 1]
+            next_symbol: str = whitespaces.string[whitespaces.end()]
+            separates_words: bool = all(
+                symbol.isalnum() or symbol in '._' for symbol in (previous_symbol, next_symbol)
+            )
 
-        # Starting from -1, because it's index and will be straightaway incremented
-        # at first iteration of for loop below:
-        parentless_expression_end_index: int = -1
+            return ' ' if separates_words else ''
 
-        parentless_stack: List[str] = []
-        for index in range(len(expression)):
-            parentless_expression_end_index += 1
-            symbol: str = expression[index]
-            if symbol == opening_parenthesis:
-                parentless_stack.append(symbol)
-            elif symbol == closing_parenthesis:
-                parentless_stack.pop(0)
+        return re.sub(pattern=r'\s+', repl=replace_whitespaces, string=expression.strip())
 
-            if len(parentless_stack) == 0:
-                break
+    def get_deduplication_statistics(self) -> DeduplicationStatistics:
+        """
+        Returns amounts of nodes in parsed trees before and after deduplication, if it is enabled.
+        """
 
-        if len(parentless_stack) != 0:
-            raise ExpressionSyntaxError()
+        return self._deduplicator.get_statistics()
 
-        # Expression and postfix should be without parentless from original expression:
-        parentless_expression: str = expression[1: parentless_expression_end_index]
-        postfix: str = expression[parentless_expression_end_index + 1:]
-        return parentless_expression, postfix
+    def get_function_cache_info(self) -> Dict[str, CacheInfo]:
+        """
+        Returns statistics of caches of memoized functions by names of functions.
+        """
+
+        return {name: get_info() for name, get_info in self._function_caches.items()}
+
+    def get_result_cache_info(self) -> CacheInfo:
+        """
+        Returns statistics of calculated values cache: hits, misses, maximum and current sizes.
+        """
+
+        return self._result_cache.info()
+
+    def get_parse_cache_info(self) -> CacheInfo:
+        """
+        Returns statistics of parsed expressions cache: hits, misses, maximum and current sizes.
+        """
+
+        return self._parse_cache.info()
 
     def _calculate_node_value(self, node: TreeNode) -> float:
         """
-        1) Gets an AST tree node, which is one of next types: UnaryOperation, BinaryOperation or Number;
-        2) If node is a Number type - returns it, else recursively calculates expression, stored in node.
+        1) Gets an AST tree node, which is one of next types: UnaryOperation, BinaryOperation, FunctionCall,
+        Number or Variable;
+        2) If node is a Number type - returns it, if node is a Variable type - returns its stored value,
+        else calculates expression, stored in node.
+
+        Tree is calculated recursively, which is the fastest way for trees of usual depth.
+        If tree is too deep for Python recursion limit, it is calculated again iteratively,
+        which gives the same result, because calculation has no side effects.
+        Deduplicated trees are always calculated iteratively, so each shared node is calculated once.
+        If steps or time of calculation are limited, trees are calculated iteratively as well to check the limits.
         """
 
-        command: BaseCommand
-        if isinstance(node, UnaryOperation):
-            command = self._base_commands[node.operation](
-                a=0,  # Unary operation has only one part of expression
-                b=self._calculate_node_value(node=node.expression)
-            )
+        if self._deduplicate_expressions or self._limits.limits_evaluation:
+            return self._calculate_node_value_iteratively(node=node)
 
-            return command.execute()
-        elif isinstance(node, BinaryOperation):
-            command = self._base_commands[node.operation](
-                a=self._calculate_node_value(node=node.left),
-                b=self._calculate_node_value(node=node.right)
-            )
+        try:
+            return self._calculate_node_value_recursively(node=node)
+        except RecursionError:
+            return self._calculate_node_value_iteratively(node=node)
+
+    def _calculate_node_value_recursively(self, node: TreeNode) -> float:
+        try:
+            node_calculator: Callable[[Any], float] = self._node_calculators[type(node)]
+        except KeyError:
+            raise UnknownExpressionTypeError()
+
+        return node_calculator(node)
+
+    def _calculate_binary_operation_value(self, node: BinaryOperation) -> float:
+        return self._operations[node.operation](
+            self._calculate_node_value_recursively(node=node.left),
+            self._calculate_node_value_recursively(node=node.right)
+        )
+
+    def _calculate_unary_operation_value(self, node: UnaryOperation) -> float:
+        return self._operations[node.operation](
+            0,  # Unary operation has only one part of expression
+            self._calculate_node_value_recursively(node=node.expression)
+        )
+
+    def _calculate_function_call_value(self, node: FunctionCall) -> float:
+        if node.name not in self._functions:
+            raise UnknownFunctionError(name=node.name)
+
+        return self._functions[node.name](self._calculate_node_value_recursively(node=node.argument))
+
+    @staticmethod
+    def _calculate_number_value(node: Number) -> float:
+        return node.value
+
+    def _calculate_variable_value(self, node: Variable) -> float:
+        try:
+            return self._user_variables[node.name]
+        except KeyError:
+            raise UndefinedVariableError(name=node.name)
+
+    def _calculate_node_value_iteratively(self, node: TreeNode) -> float:
+        """
+        Calculates nodes in post-order using an explicit stack instead of recursion, so the depth of the tree
+        is limited only by available memory. Children are calculated from left to right,
+        so errors are raised in the same order, as if the tree was calculated recursively.
+
+        Values of operation nodes are remembered, so a node, which is shared by several parents
+        in a deduplicated tree, is calculated once.
+
+        Calculated operations are counted, so calculation is stopped, if it exceeds max_evaluation_steps
+        or evaluation_timeout of limits. Time is checked once per DEADLINE_CHECK_INTERVAL operations.
+        """
+
+        max_steps: int = sys.maxsize if self._limits.max_evaluation_steps is None else self._limits.max_evaluation_steps
+        deadline: Optional[float] = None
+        if self._limits.evaluation_timeout is not None:
+            deadline = time.perf_counter() + self._limits.evaluation_timeout
+
+        # Operations, which are left after the next check of limits, and operations, which can be calculated before it.
+        # Limits are checked before the first operation, which gives the first portion of operations:
+        steps_left: int = max_steps
+        steps_before_check: int = 0
+
+        # Calculated values of children of nodes, which are waiting for their calculation:
+        values: List[float] = []
+
+        # Values of calculated operation nodes by their identities:
+        calculated_values: Dict[int, float] = {}
+
+        # Nodes to visit. Operation node is pushed back followed by a marker, when it is visited for the first time,
+        # so the node is calculated, when the marker is reached, because all its children are calculated by then:
+        nodes: List[Optional[TreeNode]] = [node]
+        while nodes:
+            current_node: Optional[TreeNode] = nodes.pop()
+            if current_node is None:  # Children calculated marker
+                if steps_before_check == 0:
+                    steps_left, steps_before_check = self._check_evaluation_limits(
+                        steps_left=steps_left,
+                        max_steps=max_steps,
+                        deadline=deadline
+                    )
+
+                steps_before_check -= 1
+                operation_node: Optional[TreeNode] = nodes.pop()
+                value: float = self._calculate_operation_value(node=operation_node, values=values)
+                calculated_values[id(operation_node)] = value
+                values.append(value)
+            elif isinstance(current_node, Number):
+                values.append(current_node.value)
+            elif isinstance(current_node, Variable):
+                values.append(self._calculate_variable_value(node=current_node))
+            elif id(current_node) in calculated_values:
+                values.append(calculated_values[id(current_node)])
+            else:
+                nodes.append(current_node)
+                nodes.append(None)
+                self._push_node_children(node=current_node, nodes=nodes)
+
+        return values.pop()
+
+    def _check_evaluation_limits(self, steps_left: int, max_steps: int, deadline: Optional[float]) -> Tuple[int, int]:
+        """
+        Raises an error, if there are no steps left or the deadline is passed.
+        Returns the amount of steps, which are left after the next check, and the amount of steps before it.
+        """
 
-            return command.execute()
-        elif isinstance(node, Number):
-            return node.value
+        if deadline is not None and time.perf_counter() > deadline:
+            raise EvaluationTimeoutError(timeout=cast(float, self._limits.evaluation_timeout))
+
+        if steps_left == 0:
+            raise EvaluationStepsExceededError(max_steps=max_steps)
+
+        steps_before_check: int = min(steps_left, DEADLINE_CHECK_INTERVAL) if deadline is not None else steps_left
+        return steps_left - steps_before_check, steps_before_check
+
+    def _push_node_children(self, node: TreeNode, nodes: List[Optional[TreeNode]]) -> None:
+        """
+        Pushes children of the node to the stack of nodes in reversed order, so the left child is calculated first.
+        """
+
+        if isinstance(node, BinaryOperation):
+            nodes.append(node.right)
+            nodes.append(node.left)
+        elif isinstance(node, UnaryOperation):
+            nodes.append(node.expression)
+        elif isinstance(node, FunctionCall):
+            if node.name not in self._functions:
+                raise UnknownFunctionError(name=node.name)
+
+            nodes.append(node.argument)
+        else:
+            raise UnknownExpressionTypeError()
+
+    def _calculate_operation_value(self, node: Optional[TreeNode], values: List[float]) -> float:
+        """
+        Calculates the value of an operation node, which children values are on the top of values stack.
+        """
+
+        if isinstance(node, BinaryOperation):
+            right: float = values.pop()
+            return self._operations[node.operation](values.pop(), right)
+        elif isinstance(node, UnaryOperation):
+            return self._operations[node.operation](0, values.pop())  # Unary operation has only one part
+        elif isinstance(node, FunctionCall):
+            return self._functions[node.name](values.pop())
         else:
             raise UnknownExpressionTypeError()
 
@@ -231,6 +772,24 @@ class MathOperationsInterpreter:
 
         result: Optional[float] = self._user_variables.get(RESULT_VARIABLE)
         if result:
-            self._user_variables.clear()
+            self.reset()
 
         return result
+
+    def get_variables(self) -> Dict[str, float]:
+        """
+        Returns a copy of stored user variables.
+        """
+
+        return dict(self._user_variables)
+
+    def reset(self) -> None:
+        """
+        Clears stored variables, so next expressions are interpreted independently of previous ones.
+        Parsed expressions are kept in the parse cache, while calculated values are dropped.
+        """
+
+        self._user_variables.clear()
+        self._result_cache.clear()
+        self._dependency_graph.clear()
+        self._assignments.clear()
@@ -1,70 +1,171 @@
 import re
-from typing import List, Optional
+from typing import Iterator, List, Optional, Dict, Tuple, Union, cast
 
 from src.enums import TokenTypesEnum
-from src.exceptions import ExpressionSyntaxError
+from src.exceptions import ExpressionSyntaxError, ExpressionTooLongError, TooManyTokensError
 from src.interfaces import Processor
-from src.tokens import Token
+from src.limits import ResourceLimits
+from src.tokens import Token, TokenOffsets, TokensSource, TOKEN_TYPES_CODES
 from src.config import LEXICAL_RULES
 
 
 class LexicalProcessor(Processor):
+    """
+    Generates tokens from expressions. Processor keeps only compiled patterns and all state of processing
+    is local to a call, so a single processor can be used by several threads at once.
 
-    def __init__(self) -> None:
-        self._expression: str = ''
-        self._results: List[Token] = []
+    If limits are provided, expressions, which are longer than max_input_length, are rejected before lexing,
+    and lexing stops, as soon as more than max_tokens tokens are generated.
+    """
+
+    def __init__(self, limits: Optional[ResourceLimits] = None) -> None:
+        self._limits: ResourceLimits = limits or ResourceLimits()
+
+        self._scanner: re.Pattern[str]
+        self._token_types: Dict[int, TokenTypesEnum]
+        self._scanner, self._token_types = self._compile_scanner(lexical_rules=LEXICAL_RULES)
+
+        # Same pattern for bytes-like sources. Its groups have the same indexes as groups of the pattern for strings:
+        self._bytes_scanner: re.Pattern[bytes] = re.compile(pattern=self._scanner.pattern.encode())
+        self._token_codes: Dict[int, int] = {
+            group_index: TOKEN_TYPES_CODES[token_type] for group_index, token_type in self._token_types.items()
+        }
+        self._trailing_whitespaces: re.Pattern[str] = re.compile(pattern=r'\s*')
+        self._bytes_trailing_whitespaces: re.Pattern[bytes] = re.compile(pattern=rb'\s*')
 
     def process_expression(self, expression: str) -> List[Token]:
         """
         Processes expression and returns the list of tokens generated from expression, if expression is valid.
         """
 
-        # Initializes for each new expression processing:
-        self._expression = expression
-        self._results = []
-
-        self._extract_regex_pattern_from_expression()
+        self._check_input_length(length=len(expression))
+        results: List[Token] = self._extract_regex_pattern_from_expression(expression=expression)
 
         # Add a token symbolizing the end of the line for further operations on the preprocessed expression:
-        self._results.append(
+        results.append(
             Token(
                 literal='',
                 type=TokenTypesEnum.EOF
             )
         )
 
-        return self._results
+        return results
 
-    def _extract_regex_pattern_from_expression(self) -> None:
+    def stream_tokens(self, source: TokensSource, start: int = 0, end: Optional[int] = None) -> Iterator[TokenOffsets]:
         """
-        Extracts the RegEx pattern from expression, starting from the beginning.
+        Lazily generates tokens of the expression in the source between start and end positions as codes
+        of their types and offsets of their literals in the source, finishing with the EOF token.
+        Literals are not copied, so a file can be tokenized through a memory map without reading it into memory.
+        Tokens are the same, as the ones of process_expression, and the same expressions are rejected.
+        If the expression is not valid, ExpressionSyntaxError will be raised, when the invalid part is reached.
+
+        Example:
+        :param source: b"12 + x"
+        :return: (NUMBER code, 0, 2), (PLUS code, 3, 4), (IDENTIFIER code, 5, 6), (EOF code, 6, 6)
+        """
+
+        scanner: Union[re.Pattern[str], re.Pattern[bytes]]
+        trailing_whitespaces: Union[re.Pattern[str], re.Pattern[bytes]]
+        if isinstance(source, str):
+            scanner, trailing_whitespaces = self._scanner, self._trailing_whitespaces
+        else:
+            scanner, trailing_whitespaces = self._bytes_scanner, self._bytes_trailing_whitespaces
+
+        end = len(source) if end is None else end
+        self._check_input_length(length=end - start)
+
+        # Amount of tokens, which can be generated before the limit is exceeded:
+        tokens_left: int = self._limits.max_tokens if self._limits.max_tokens is not None else end - start
+        position: int = start
+        while position < end:
+            regex_match: Optional[re.Match] = scanner.match(source, position, end)  # type: ignore[arg-type]
+            if regex_match is None:
+                # Whitespaces are allowed after the last token, but not instead of tokens:
+                whitespaces: Optional[re.Match] = trailing_whitespaces.fullmatch(
+                    source, position, end  # type: ignore[arg-type]
+                )
+                if position == start or whitespaces is None:
+                    raise ExpressionSyntaxError()
+
+                break
+
+            if tokens_left == 0:
+                raise TooManyTokensError(max_tokens=cast(int, self._limits.max_tokens))
+
+            tokens_left -= 1
+            group_index: int = cast(int, regex_match.lastindex)  # Each alternative is wrapped into a named group
+            position = regex_match.end()
+            yield self._token_codes[group_index], regex_match.start(group_index), position
+
+        yield TOKEN_TYPES_CODES[TokenTypesEnum.EOF], end, end
+
+    @staticmethod
+    def _compile_scanner(
+            lexical_rules: Dict[TokenTypesEnum, str]
+    ) -> Tuple[re.Pattern[str], Dict[int, TokenTypesEnum]]:
+        """
+        Combines all lexical rules into a single RegEx pattern, which skips leading whitespaces and matches
+        one token. Each rule becomes a named alternative, so the index of the last matched group
+        is the index of the rule's group and determines the type of the token.
+
+        Rules are tried in the order of their declaration, which gives the same result as choosing the longest
+        match, while rules don't start with the same symbols.
+
+        Example:
+        :param lexical_rules: {TokenTypesEnum.NUMBER: r'(\\d+(\\.\\d+)?)', TokenTypesEnum.PLUS: r'(\\+)'}
+        :return: (re.compile(r'\\s*(?:(?P<NUMBER>(\\d+(\\.\\d+)?))|(?P<PLUS>(\\+)))'), {1: NUMBER, 4: PLUS})
+        """
+
+        alternatives: str = '|'.join(f'(?P<{rule.name}>{pattern})' for rule, pattern in lexical_rules.items())
+        scanner: re.Pattern[str] = re.compile(pattern=rf'\s*(?:{alternatives})')
+        token_types: Dict[int, TokenTypesEnum] = {
+            scanner.groupindex[rule.name]: rule for rule in lexical_rules.keys()
+        }
+
+        return scanner, token_types
+
+    def _check_input_length(self, length: int) -> None:
+        if self._limits.max_input_length is not None and length > self._limits.max_input_length:
+            raise ExpressionTooLongError(max_length=self._limits.max_input_length)
+
+    def _extract_regex_pattern_from_expression(self, expression: str) -> List[Token]:
+        """
+        Walks through the expression by position and matches the combined RegEx pattern at each position.
         If one of RegEx patterns is found in the expression, the corresponding token will be created.
-        In other case, expression is not valid and ExpressionSyntaxError will be raised.
+        In other case, expression is not valid and ExpressionSyntaxError will be raised,
+        unless only whitespaces are left after the last token.
 
-        After token is created, the expression is reduced by the characters used for tokenization
-        and processed recursively.
+        The expression itself is never copied, so processing takes linear time of its length.
         """
 
-        while len(self._expression) > 0:
-            max_rule: TokenTypesEnum = TokenTypesEnum.EOF
-            max_lit: str = ''
-            self._expression = self._expression.strip()
+        results: List[Token] = []
+        position: int = 0
+        expression_length: int = len(expression)
 
-            # Finding the longest part of an expression using RegEx:
-            for rule in LEXICAL_RULES.keys():
-                regex_pattern: re.Pattern[str] = re.compile(pattern=LEXICAL_RULES[rule])
-                regex_match: Optional[re.Match[str]] = regex_pattern.match(string=self._expression)
-                if (regex_match is not None) and (len(regex_match.group(0)) > len(max_lit)):
-                    max_lit = regex_match.group(0)
-                    max_rule = rule
+        # Each token takes at least one character, so the limit is not checked, if the expression is short enough:
+        max_tokens: Optional[int] = self._limits.max_tokens
+        if max_tokens is not None and max_tokens >= expression_length:
+            max_tokens = None
 
-            if max_rule == TokenTypesEnum.EOF:
-                raise ExpressionSyntaxError()
+        while position < expression_length:
+            regex_match: Optional[re.Match[str]] = self._scanner.match(expression, position)
+            if regex_match is None:
+                # Whitespaces are allowed after the last token, but not instead of tokens:
+                if position == 0 or self._trailing_whitespaces.fullmatch(expression, position) is None:
+                    raise ExpressionSyntaxError()
 
-            self._expression = self._expression[len(max_lit):]  # Reduce the expression by the processed part
-            self._results.append(
+                break
+
+            if max_tokens is not None and len(results) == max_tokens:
+                raise TooManyTokensError(max_tokens=max_tokens)
+
+            group_index: int = cast(int, regex_match.lastindex)  # Each alternative is wrapped into a named group
+            position = regex_match.end()
+            results.append(
                 Token(
-                    literal=max_lit,
-                    type=max_rule
+                    literal=regex_match.group(group_index),
+                    type=self._token_types[group_index]
                 )
             )
+
+        return results
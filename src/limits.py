@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.exceptions import ExpressionTooDeepError, TooManyNodesError
+from src.expressions import TreeNode, get_node_children
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Limits of resources, which are spent on a single expression, so a hostile or broken input can not stall
+    a worker. Each limit is checked by the component, which spends the resource, and raises its own error:
+    - max_input_length: characters of an expression, checked by the interpreter and LexicalProcessor before lexing;
+    - max_tokens: tokens of an expression, checked by LexicalProcessor while lexing;
+    - max_depth: levels of nested nodes of AST and of nested parentheses, checked by TokensParser while parsing
+      and after it;
+    - max_nodes: nodes of AST, checked by TokensParser;
+    - max_evaluation_steps: calculated nodes of an expression, checked by the interpreter;
+    - evaluation_timeout: seconds of calculation of an expression, checked by the interpreter.
+    Limit, which is None, is not checked.
+
+    Example:
+    limits = ResourceLimits(max_input_length=10_000, max_depth=200, evaluation_timeout=0.1)
+    MathOperationsInterpreter(..., parser=TokensParser(limits=limits),
+                              lexical_processor=LexicalProcessor(limits=limits), limits=limits)
+    """
+
+    max_input_length: Optional[int] = None
+    max_tokens: Optional[int] = None
+    max_depth: Optional[int] = None
+    max_nodes: Optional[int] = None
+    max_evaluation_steps: Optional[int] = None
+    evaluation_timeout: Optional[float] = None
+
+    @property
+    def limits_tree(self) -> bool:
+        return self.max_depth is not None or self.max_nodes is not None
+
+    @property
+    def limits_evaluation(self) -> bool:
+        return self.max_evaluation_steps is not None or self.evaluation_timeout is not None
+
+
+def check_tree_limits(node: TreeNode, limits: ResourceLimits) -> None:
+    """
+    Checks the depth and the amount of nodes of AST. Tree is traversed with an explicit stack,
+    which stops at the first node, which exceeds a limit, so checking takes time of the allowed tree at most.
+    """
+
+    nodes_count: int = 0
+    nodes: List[Tuple[TreeNode, int]] = [(node, 1)]
+    while nodes:
+        depth: int
+        node, depth = nodes.pop()
+        nodes_count += 1
+        if limits.max_nodes is not None and nodes_count > limits.max_nodes:
+            raise TooManyNodesError(max_nodes=limits.max_nodes)
+
+        if limits.max_depth is not None and depth > limits.max_depth:
+            raise ExpressionTooDeepError(max_depth=limits.max_depth)
+
+        nodes.extend((child, depth + 1) for child in get_node_children(node=node))
@@ -1,24 +1,25 @@
+import argparse
+import asyncio
 import os
 import sys
-from typing import Optional
+from contextlib import suppress
+from pathlib import Path
+from typing import Iterator, Optional, TextIO
 
 # Adding ./src to python path for running from console purpose:
 sys.path.append(os.getcwd())
 
-from src.config import BASE_COMMANDS, MATH_COMMANDS, RESULT_VARIABLE, EXIT_VARIABLE
+from src.batch import BatchProcessor, BatchRecord, write_records
+from src.config import BASE_COMMANDS, MATH_COMMANDS, RESULT_VARIABLE, EXIT_VARIABLE, BATCH_BUFFER_SIZE
+from src.enums import OutputFormatsEnum
 from src.interpreter import MathOperationsInterpreter
 from src.lexical_processor import LexicalProcessor
+from src.parallel import ParallelBatchProcessor
+from src.server import EvaluationServer
 from src.tokens_parser import TokensParser
 
 
-if __name__ == '__main__':
-    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
-        interpreter_base_commands=BASE_COMMANDS,
-        interpreter_math_commands=MATH_COMMANDS,
-        parser=TokensParser(),
-        lexical_processor=LexicalProcessor()
-    )
-
+def run_interactive_mode(interpreter: MathOperationsInterpreter) -> None:
     user_input: str = ''
     result: Optional[float] = None
     while not (result := interpreter.get_result()):
@@ -29,3 +30,122 @@ if __name__ == '__main__':
         interpreter.interpret(user_input=user_input)
 
     print(f'{RESULT_VARIABLE} = {result}')
+
+
+def run_batch_mode(
+        interpreter: MathOperationsInterpreter,
+        script: TextIO,
+        output: TextIO,
+        output_format: OutputFormatsEnum,
+        sessions: bool = False,
+        workers: Optional[int] = None
+) -> int:
+    """
+    Interprets all lines of the script and writes results of lines into the output. Returns the amount of results.
+    If the script contains JSONL records of sessions, sessions are interpreted in parallel processes.
+    """
+
+    records: Iterator[BatchRecord]
+    if sessions:
+        records = ParallelBatchProcessor(max_workers=workers).process_sessions(lines=script)
+    else:
+        records = BatchProcessor(interpreter=interpreter).process(lines=script)
+
+    return write_records(records=records, output=output, output_format=output_format)
+
+
+def parse_arguments() -> argparse.Namespace:
+    arguments_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Interprets math expressions interactively or, if a script is provided, in batch mode.'
+    )
+    arguments_parser.add_argument(
+        'script',
+        nargs='?',
+        help=(
+            'Path to a script with an assignment on each line, a directory of such scripts, '
+            'which are interpreted in parallel, or "-" to read the script from stdin.'
+        )
+    )
+    arguments_parser.add_argument(
+        '--sessions',
+        action='store_true',
+        help='Script is JSONL of {"session": ..., "statement": ...} records, sessions are interpreted in parallel.'
+    )
+    arguments_parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Amount of worker processes for parallel interpretation. Equals to the amount of CPUs by default.'
+    )
+    arguments_parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Runs TCP server, where each connection is a session, which sends assignments line by line.'
+    )
+    arguments_parser.add_argument('--host', default='127.0.0.1', help='Host, which server listens to.')
+    arguments_parser.add_argument('--port', type=int, default=8765, help='Port, which server listens to.')
+    arguments_parser.add_argument(
+        '--format',
+        choices=[output_format.value for output_format in OutputFormatsEnum],
+        default=OutputFormatsEnum.JSONL.value,
+        help='Format of results in batch mode.'
+    )
+    arguments_parser.add_argument(
+        '--output',
+        default='-',
+        help='Path to a file for results in batch mode or "-" to write them into stdout.'
+    )
+
+    return arguments_parser.parse_args()
+
+
+if __name__ == '__main__':
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=TokensParser(),
+        lexical_processor=LexicalProcessor()
+    )
+
+    arguments: argparse.Namespace = parse_arguments()
+    if arguments.serve:
+        with suppress(KeyboardInterrupt):
+            asyncio.run(EvaluationServer(host=arguments.host, port=arguments.port).serve_forever())
+        sys.exit(0)
+
+    if arguments.script is None:
+        run_interactive_mode(interpreter=interpreter)
+        sys.exit(0)
+
+    # Standard streams are reopened with large buffers, so results are not flushed line by line:
+    output_format: OutputFormatsEnum = OutputFormatsEnum(arguments.format)
+    with open(
+            sys.stdout.fileno() if arguments.output == '-' else arguments.output,
+            mode='w',
+            buffering=BATCH_BUFFER_SIZE,
+            newline='',
+            closefd=arguments.output != '-'
+    ) as output:
+        if os.path.isdir(arguments.script):
+            write_records(
+                records=ParallelBatchProcessor(max_workers=arguments.workers).process_directory(
+                    directory=Path(arguments.script)
+                ),
+                output=output,
+                output_format=output_format
+            )
+            sys.exit(0)
+
+        with open(
+                sys.stdin.fileno() if arguments.script == '-' else arguments.script,
+                buffering=BATCH_BUFFER_SIZE,
+                closefd=arguments.script != '-'
+        ) as script:
+            run_batch_mode(
+                interpreter=interpreter,
+                script=script,
+                output=output,
+                output_format=output_format,
+                sessions=arguments.sessions,
+                workers=arguments.workers
+            )
@@ -0,0 +1,245 @@
+import math
+from typing import Dict, List, Type, Optional
+
+from src.commands import (
+    BaseCommand,
+    MathCommand,
+    AddCommand,
+    SubtractCommand,
+    MultiplyCommand,
+    DivideCommand,
+    ExponentialCommand
+)
+from src.config import OPERATIONS
+from src.enums import TokenTypesEnum
+from src.exceptions import CustomException, UnknownExpressionTypeError
+from src.expressions import (
+    TreeNode,
+    Expression,
+    UnaryOperation,
+    BinaryOperation,
+    Number,
+    Variable,
+    FunctionCall,
+    get_node_children
+)
+
+
+# Powers of a variable with such exponents are replaced with repeated multiplication:
+MAX_MULTIPLIED_POWER: int = 4
+
+
+class ExpressionOptimizer:
+    """
+    Rewrites AST into an equivalent one, which is cheaper to calculate:
+    1) Constant subtrees are calculated ahead: "(18 / 3 - 2)" -> "4", "sqrt(25)" -> "5";
+    2) Neutral operations are removed: "x - 0" -> "x", "x * 1" -> "x", "x ^ 1" -> "x";
+    3) Costly operations are replaced with cheaper ones: "x ^ 2" -> "x * x", "x / 4" -> "x * 0.25".
+    Division is replaced only by powers of two, which reciprocals are exact, so results are not changed.
+    Zero is neutral only with its sign: "x + 0" and "+x" give zero for negative zero "x", so they are kept,
+    while "x - 0" and "x + (-0)" are removed.
+
+    Constant subtrees, which calculation fails, are kept as is, so the error is raised during calculation.
+    Rewritten operations may give results, which differ in the last bits, and overflow to infinity
+    instead of raising OverflowError, so optimization is optional.
+
+    Source tree is not modified, because parsed trees are shared through the parse cache.
+    """
+
+    def __init__(
+            self,
+            base_commands: Dict[str, Type[BaseCommand]],
+            math_commands: Dict[str, Type[MathCommand]]
+    ) -> None:
+
+        self._base_commands: Dict[str, Type[BaseCommand]] = base_commands
+        self._math_commands: Dict[str, Type[MathCommand]] = math_commands
+
+    def optimize(self, node: TreeNode) -> TreeNode:
+        """
+        Optimizes children of each node before the node itself. Tree is traversed in post-order with an explicit
+        stack, so optimization is not limited by the depth of the tree.
+        """
+
+        if not isinstance(node, Expression):
+            return node
+
+        # Operation node is pushed back followed by a marker, when it is visited for the first time,
+        # so it is optimized, when the marker is reached, with optimized children from the top of children stack:
+        children: List[Expression] = []
+        nodes: List[Optional[Expression]] = [node]
+        while nodes:
+            current_node: Optional[Expression] = nodes.pop()
+            if current_node is None:  # Children optimized marker
+                children.append(self._optimize_operation(node=nodes.pop(), children=children))
+            elif isinstance(current_node, (UnaryOperation, BinaryOperation, FunctionCall)):
+                nodes.append(current_node)
+                nodes.append(None)
+                nodes.extend(reversed(get_node_children(node=current_node)))
+            else:
+                children.append(current_node)
+
+        return children.pop()
+
+    def _optimize_operation(self, node: Optional[Expression], children: List[Expression]) -> Expression:
+        """
+        Optimizes the operation node with optimized children, which are taken from the top of children stack.
+        """
+
+        if isinstance(node, BinaryOperation):
+            right: Expression = children.pop()
+            left: Expression = children.pop()
+            return self._optimize_binary_operation(
+                node=BinaryOperation(operation=node.operation, left=left, right=right)
+            )
+        elif isinstance(node, UnaryOperation):
+            return self._optimize_unary_operation(
+                node=UnaryOperation(operation=node.operation, expression=children.pop())
+            )
+        elif isinstance(node, FunctionCall):
+            return self._optimize_function_call(node=FunctionCall(name=node.name, argument=children.pop()))
+        else:
+            raise UnknownExpressionTypeError()
+
+    def _optimize_unary_operation(self, node: UnaryOperation) -> Expression:
+        if isinstance(node.expression, Number):
+            return self._fold(node=node, value=self._calculate_operation(node.operation, 0, node.expression.value))
+
+        return node
+
+    def _optimize_binary_operation(self, node: BinaryOperation) -> Expression:
+        left: Expression = node.left
+        right: Expression = node.right
+        if isinstance(left, Number) and isinstance(right, Number):
+            return self._fold(node=node, value=self._calculate_operation(node.operation, left.value, right.value))
+
+        if self._is_operation(node.operation, TokenTypesEnum.PLUS, AddCommand):
+            if self._is_number(left, -0.0):
+                return right
+            elif self._is_number(right, -0.0):
+                return left
+        elif self._is_operation(node.operation, TokenTypesEnum.MINUS, SubtractCommand):
+            if self._is_number(right, 0.0):
+                return left
+        elif self._is_operation(node.operation, TokenTypesEnum.STAR, MultiplyCommand):
+            if self._is_number(left, 1):
+                return right
+            elif self._is_number(right, 1):
+                return left
+        elif self._is_operation(node.operation, TokenTypesEnum.SLASH, DivideCommand):
+            if self._is_number(right, 1):
+                return left
+            elif isinstance(right, Number) and self._has_exact_reciprocal(right.value) and self._can_multiply():
+                return BinaryOperation(
+                    operation=OPERATIONS[TokenTypesEnum.STAR],
+                    left=left,
+                    right=Number(value=1 / right.value)
+                )
+        elif self._is_operation(node.operation, TokenTypesEnum.CARET, ExponentialCommand):
+            return self._optimize_power(node=node)
+
+        return node
+
+    @staticmethod
+    def _has_exact_reciprocal(value: float) -> bool:
+        """
+        Checks, that the value is a power of two, which reciprocal is finite, so multiplication by the reciprocal
+        gives exactly the same result as division. Reciprocals of other values are rounded.
+
+        Example:
+        :param value: 4.0 (reciprocal 0.25 is exact), 0.1 (reciprocal is rounded), 2 ** -1074 (reciprocal overflows)
+        :return: True, False, False
+        """
+
+        if value == 0 or not math.isfinite(value):
+            return False
+
+        mantissa: float
+        mantissa, _ = math.frexp(value)
+        return abs(mantissa) == 0.5 and math.isfinite(1 / value)
+
+    def _optimize_power(self, node: BinaryOperation) -> Expression:
+        """
+        Replaces power with an integer exponent of a variable with repeated multiplication.
+        Other bases are not multiplied, because their calculation would be repeated.
+        """
+
+        if not isinstance(node.right, Number):
+            return node
+
+        exponent: float = float(node.right.value)
+        if exponent == 1:
+            return node.left
+        elif (
+                isinstance(node.left, Variable)
+                and exponent.is_integer()
+                and 1 < exponent <= MAX_MULTIPLIED_POWER
+                and self._can_multiply()
+        ):
+            expression: Expression = node.left
+            for _ in range(int(exponent) - 1):
+                expression = BinaryOperation(
+                    operation=OPERATIONS[TokenTypesEnum.STAR],
+                    left=expression,
+                    right=node.left
+                )
+
+            return expression
+
+        return node
+
+    def _optimize_function_call(self, node: FunctionCall) -> Expression:
+        if isinstance(node.argument, Number) and node.name in self._math_commands:
+            try:
+                value: float = self._math_commands[node.name](value=node.argument.value).execute()
+            except (ArithmeticError, ValueError, CustomException):
+                return node
+
+            return self._fold(node=node, value=value)
+
+        return node
+
+    def _calculate_operation(self, operation: str, a: float, b: float) -> Optional[float]:
+        """
+        Calculates the operation with the same command, which is used during calculation.
+        Returns None, if calculation fails.
+        """
+
+        try:
+            return self._base_commands[operation](a=a, b=b).execute()
+        except (ArithmeticError, ValueError, CustomException):
+            return None
+
+    @staticmethod
+    def _fold(node: Expression, value: Optional[float]) -> Expression:
+        """
+        Replaces the node with a calculated value, if it was calculated into a real number.
+        """
+
+        if isinstance(value, (int, float)):
+            return Number(value=float(value))
+
+        return node
+
+    def _is_operation(self, operation: str, token_type: TokenTypesEnum, command: Type[BaseCommand]) -> bool:
+        """
+        Checks, if operation is calculated by the expected command, so it can be rewritten according to its meaning.
+        """
+
+        return operation == OPERATIONS[token_type] and self._base_commands.get(operation) is command
+
+    def _can_multiply(self) -> bool:
+        return self._base_commands.get(OPERATIONS[TokenTypesEnum.STAR]) is MultiplyCommand
+
+    @staticmethod
+    def _is_number(node: Expression, value: float) -> bool:
+        """
+        Checks, that the node is a number, which is equal to the value and has the same sign,
+        so zero and negative zero are different numbers here.
+        """
+
+        return (
+            isinstance(node, Number)
+            and node.value == value
+            and math.copysign(1.0, node.value) == math.copysign(1.0, value)
+        )
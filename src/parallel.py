@@ -0,0 +1,148 @@
+import heapq
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from src.batch import BatchProcessor, BatchRecord
+from src.config import BASE_COMMANDS, MATH_COMMANDS, BATCH_BUFFER_SIZE
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.tokens_parser import TokensParser
+
+
+# Statement of a session with the number of its line in the sessions file:
+NumberedStatement = Tuple[int, str]
+
+# Errors of JSONL lines, which are reported as records instead of stopping processing of all sessions.
+# Type errors are raised, when a line is valid JSON, but not an object, or its statement is not a string:
+SESSION_RECORD_ERRORS: Tuple[Type[Exception], ...] = (json.JSONDecodeError, KeyError, TypeError)
+
+# Processor of the worker process. It is created once per worker, so its parse cache is shared by all tasks:
+_worker_processor: Optional[BatchProcessor] = None
+
+
+def _initialize_worker() -> None:
+    global _worker_processor
+    _worker_processor = BatchProcessor(
+        interpreter=MathOperationsInterpreter(
+            interpreter_base_commands=BASE_COMMANDS,
+            interpreter_math_commands=MATH_COMMANDS,
+            parser=TokensParser(),
+            lexical_processor=LexicalProcessor()
+        )
+    )
+
+
+def _get_worker_processor() -> BatchProcessor:
+    if _worker_processor is None:
+        _initialize_worker()
+
+    assert _worker_processor is not None
+    return _worker_processor
+
+
+def _process_script(path: str) -> List[BatchRecord]:
+    processor: BatchProcessor = _get_worker_processor()
+    processor.reset()
+    with open(path, buffering=BATCH_BUFFER_SIZE) as script:
+        return list(processor.process(lines=script, source=path))
+
+
+def _process_session(session: str, statements: List[NumberedStatement]) -> List[BatchRecord]:
+    processor: BatchProcessor = _get_worker_processor()
+    processor.reset()
+    return list(processor.process_numbered_lines(lines=statements, source=session))
+
+
+def read_sessions(lines: Iterable[str]) -> Tuple[Dict[str, List[NumberedStatement]], List[BatchRecord]]:
+    """
+    Groups statements of JSONL records by their sessions, keeping the order of statements inside each session.
+    Sessions are ordered by their first statements. Lines, which are not valid records, are returned as error
+    records, the same way as lines with errors of a single script, so they don't stop processing of other lines.
+
+    Example:
+    :param lines: ['{"session": "a", "statement": "x = 1"}', '{"session": "b", "statement": "x = 2"}', '{"a": 1}']
+    :return: {"a": [(1, "x = 1")], "b": [(2, "x = 2")]}, [BatchRecord(line=3, error="KeyError", ...)]
+    """
+
+    sessions: Dict[str, List[NumberedStatement]] = {}
+    errors: List[BatchRecord] = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            record: Dict[str, str] = json.loads(line)
+            session: str = str(record['session'])
+            statement: str = record['statement']
+            if not isinstance(statement, str):
+                raise TypeError(f'Statement must be a string, but received {type(statement).__name__}.')
+        except SESSION_RECORD_ERRORS as e:
+            errors.append(BatchRecord(line=line_number, error=e.__class__.__name__, message=str(e).strip()))
+            continue
+
+        sessions.setdefault(session, []).append((line_number, statement))
+
+    return sessions, errors
+
+
+class ParallelBatchProcessor:
+    """
+    Interprets independent scripts or sessions in a pool of processes. Each worker process keeps one interpreter,
+    which variables are cleared before each script or session, while its parse cache stays warm.
+    Results are returned in the same order, as they would be returned by a single BatchProcessor.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 1) -> None:
+        self._max_workers: Optional[int] = max_workers
+        self._chunk_size: int = chunk_size  # Amount of scripts or sessions, which are sent to a worker at once
+
+    def process_scripts(self, paths: Iterable[Path]) -> Iterator[BatchRecord]:
+        """
+        Processes each script in a single worker. Records of scripts are returned in the order of paths.
+        """
+
+        with ProcessPoolExecutor(max_workers=self._max_workers, initializer=_initialize_worker) as executor:
+            for records in executor.map(_process_script, [str(path) for path in paths], chunksize=self._chunk_size):
+                yield from records
+
+    def process_directory(self, directory: Path, pattern: str = '*') -> Iterator[BatchRecord]:
+        """
+        Processes script files of the directory in the order of their names.
+        """
+
+        return self.process_scripts(paths=sorted(path for path in directory.glob(pattern) if path.is_file()))
+
+    def process_sessions(self, lines: Iterable[str]) -> Iterator[BatchRecord]:
+        """
+        Processes statements of each session from JSONL records in a single worker.
+        Records are returned in the order of lines of the JSONL as soon as results of preceding sessions are received,
+        and records of invalid lines are returned among them.
+        """
+
+        sessions: Dict[str, List[NumberedStatement]]
+        errors: List[BatchRecord]
+        sessions, errors = read_sessions(lines=lines)
+
+        # Records, which are received, but not returned yet, ordered by lines:
+        pending: List[Tuple[int, BatchRecord]] = [(record.line, record) for record in errors]
+        heapq.heapify(pending)
+
+        with ProcessPoolExecutor(max_workers=self._max_workers, initializer=_initialize_worker) as executor:
+            sessions_records: Iterator[List[BatchRecord]] = executor.map(
+                _process_session, sessions.keys(), sessions.values(), chunksize=self._chunk_size
+            )
+
+            # Sessions are ordered by their first lines, so following sessions have no records before the first line
+            # of the next session, and pending records before it can be returned:
+            for statements, records in zip(sessions.values(), sessions_records):
+                first_line: int = statements[0][0]
+                while pending and pending[0][0] < first_line:
+                    yield heapq.heappop(pending)[1]
+
+                for record in records:
+                    heapq.heappush(pending, (record.line, record))
+
+        while pending:
+            yield heapq.heappop(pending)[1]
@@ -0,0 +1,305 @@
+import atexit
+import functools
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from src.bytecode import Bytecode
+from src.config import GRAMMAR_VERSION
+
+
+# File starts with a header: magic bytes, version of the file format and the amount of entries.
+# Header is followed by the index of entries, sorted by their keys, and by serialized bytecode of entries:
+FILE_HEADER: struct.Struct = struct.Struct('<4sHI')
+FILE_MAGIC: bytes = b'MOIC'
+FILE_FORMAT_VERSION: int = 2
+
+# Entry of the index: key, offset of serialized bytecode from the start of the file, its length and its digest:
+INDEX_ENTRY: struct.Struct = struct.Struct('<16sQI8s')
+KEY_SIZE: int = 16
+DIGEST_SIZE: int = 8
+
+# New entries are written into the file, when there are so many of them, so they don't take memory of long sessions:
+DEFAULT_MAX_PENDING_ENTRIES: int = 1024
+
+# Flushes of processes are serialized by a lock of a file next to the cache file:
+LOCK_FILE_SUFFIX: str = '.lock'
+
+
+def _close_at_exit(cache_reference: 'weakref.ReferenceType[PersistentExpressionCache]') -> None:
+    cache: Optional[PersistentExpressionCache] = cache_reference()
+    if cache is not None:
+        cache.close()
+
+
+class PersistentExpressionCache:
+    """
+    Content-addressed storage of compiled expressions in a single file, which is shared between processes
+    and survives restarts. Expression is stored as serialized bytecode by the hash of its text and grammar version,
+    so expressions, which were compiled by another version of the grammar, are not found.
+
+    File is memory-mapped and entries are found by binary search in the sorted index, so opening the cache
+    reads only its header, and each lookup reads only a few pages of the index and the entry itself.
+    New entries are kept in memory until flush, which writes a new file and atomically replaces the old one.
+    Flush happens, when max_pending_entries new entries are added, on close and at exit of the process.
+    Flushes of several processes hold a lock of a file next to the cache file, where it is supported,
+    and merge new entries with the current file, so entries of other processes are not lost.
+    Foreign or damaged file is treated as an empty cache and is replaced on flush.
+    Each entry is stored with the digest of its serialized bytecode, which is checked on read,
+    so damaged entries of a valid file are not found and are dropped on flush.
+
+    Example:
+    with PersistentExpressionCache(path="expressions.cache") as cache:
+        cache.put(expression="x*2", bytecode=interpreter.compile_bytecode(expression="x*2"))
+    PersistentExpressionCache(path="expressions.cache").get(expression="x*2")  # Bytecode(...)
+    """
+
+    def __init__(
+            self,
+            path: Union[str, Path],
+            grammar_version: str = GRAMMAR_VERSION,
+            max_pending_entries: int = DEFAULT_MAX_PENDING_ENTRIES
+    ) -> None:
+
+        if max_pending_entries <= 0:
+            raise ValueError('Amount of pending entries must be positive.')
+
+        self._path: Path = Path(path)
+        self._grammar_version: str = grammar_version
+        self._max_pending_entries: int = max_pending_entries
+        self._mmap: Optional[mmap.mmap] = None
+        self._entries_count: int = 0
+        self._index_end: int = 0  # Entries are stored after the index
+        self._pending: Dict[bytes, bytes] = {}  # Serialized bytecode of new entries by their keys
+        self._lock: threading.Lock = threading.Lock()
+        self._open()
+
+        # Cache is referenced weakly, so the callback doesn't keep caches, which are not used anymore, in memory:
+        self._close_callback: Callable[[], None] = functools.partial(_close_at_exit, weakref.ref(self))
+        atexit.register(self._close_callback)
+
+    def get(self, expression: str) -> Optional[Bytecode]:
+        key: bytes = self._get_key(expression=expression)
+        with self._lock:
+            data: Optional[bytes] = self._pending.get(key)
+            if data is None:
+                data = self._read(key=key)
+
+        if data is None:
+            return None
+
+        try:
+            return Bytecode.from_bytes(data=data)
+        except (struct.error, ValueError):  # Damaged entry, including UnicodeDecodeError of names
+            return None
+
+    def put(self, expression: str, bytecode: Bytecode) -> None:
+        """
+        Adds compiled expression, which will be written into the file on flush.
+        Expression, which is already stored, is not added again, because its bytecode is the same.
+        """
+
+        key: bytes = self._get_key(expression=expression)
+        with self._lock:
+            if key not in self._pending and self._read(key=key) is None:
+                self._pending[key] = bytecode.to_bytes()
+                if len(self._pending) >= self._max_pending_entries:
+                    self._flush()
+
+    def flush(self) -> None:
+        """
+        Writes stored and new entries into a temporary file, which replaces the cache file,
+        so processes, which read the cache at the same time, see either the old or the new file.
+        """
+
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        Flushes new entries and unmaps the file.
+        """
+
+        self.flush()
+        with self._lock:
+            self._close()
+
+        atexit.unregister(self._close_callback)
+
+    def __enter__(self) -> 'PersistentExpressionCache':
+        return self
+
+    def __exit__(
+            self,
+            exception_type: Optional[Type[BaseException]],
+            exception: Optional[BaseException],
+            traceback: Optional[TracebackType]
+    ) -> None:
+
+        self.close()
+
+    def __len__(self) -> int:
+        return self._entries_count + len(self._pending)
+
+    def __contains__(self, expression: str) -> bool:
+        return self.get(expression=expression) is not None
+
+    def _get_key(self, expression: str) -> bytes:
+        return hashlib.blake2b(
+            f'{self._grammar_version}\0{expression}'.encode(),
+            digest_size=KEY_SIZE
+        ).digest()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock_file():
+            # The file could be replaced by another process since it was opened, so its current version is merged:
+            self._close()
+            self._open()
+            entries: Dict[bytes, bytes] = dict(self._iterate_entries())
+            entries.update(self._pending)
+            keys: List[bytes] = sorted(entries)
+
+            with tempfile.NamedTemporaryFile(dir=self._path.parent, prefix=self._path.name, delete=False) as file:
+                file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_FORMAT_VERSION, len(keys)))
+                offset: int = FILE_HEADER.size + INDEX_ENTRY.size * len(keys)
+                for key in keys:
+                    file.write(INDEX_ENTRY.pack(key, offset, len(entries[key]), self._get_digest(data=entries[key])))
+                    offset += len(entries[key])
+
+                for key in keys:
+                    file.write(entries[key])
+
+            self._close()
+            os.replace(file.name, self._path)
+
+        self._pending.clear()
+        self._open()
+
+    @contextmanager
+    def _lock_file(self) -> Iterator[None]:
+        """
+        Holds an exclusive lock of the lock file. Locks of files are not supported on Windows,
+        so flushes of processes are not serialized there.
+        """
+
+        if sys.platform == 'win32':
+            yield
+            return
+
+        import fcntl
+
+        with open(self._path.with_name(self._path.name + LOCK_FILE_SUFFIX), mode='ab') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _open(self) -> None:
+        try:
+            file: BinaryIO = open(self._path, mode='rb')
+        except FileNotFoundError:
+            return
+
+        with file:
+            if os.fstat(file.fileno()).st_size < FILE_HEADER.size:
+                return
+
+            # Mapping stays valid after the file is closed:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic: bytes
+        format_version: int
+        magic, format_version, self._entries_count = FILE_HEADER.unpack_from(self._mmap)
+        self._index_end = FILE_HEADER.size + INDEX_ENTRY.size * self._entries_count
+        if magic != FILE_MAGIC or format_version != FILE_FORMAT_VERSION or self._index_end > len(self._mmap):
+            self._close()
+
+    def _close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+
+        self._mmap = None
+        self._entries_count = 0
+        self._index_end = 0
+
+    def _read(self, key: bytes) -> Optional[bytes]:
+        """
+        Finds the entry in the sorted index by binary search and returns its serialized bytecode.
+        """
+
+        if self._mmap is None:
+            return None
+
+        low: int = 0
+        high: int = self._entries_count
+        while low < high:
+            middle: int = (low + high) // 2
+            entry_key: bytes
+            offset: int
+            length: int
+            digest: bytes
+            entry_key, offset, length, digest = self._read_index_entry(mapped_file=self._mmap, index=middle)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return self._read_entry(mapped_file=self._mmap, offset=offset, length=length, digest=digest)
+
+        return None
+
+    def _iterate_entries(self) -> Iterator[Tuple[bytes, bytes]]:
+        if self._mmap is None:
+            return
+
+        for index in range(self._entries_count):
+            key: bytes
+            offset: int
+            length: int
+            digest: bytes
+            key, offset, length, digest = self._read_index_entry(mapped_file=self._mmap, index=index)
+            data: Optional[bytes] = self._read_entry(
+                mapped_file=self._mmap,
+                offset=offset,
+                length=length,
+                digest=digest
+            )
+            if data is not None:
+                yield key, data
+
+    def _read_entry(self, mapped_file: mmap.mmap, offset: int, length: int, digest: bytes) -> Optional[bytes]:
+        """
+        Returns serialized bytecode of the entry, if it is stored between the index and the end of the file
+        and matches its digest.
+        """
+
+        if offset < self._index_end or offset + length > len(mapped_file):
+            return None
+
+        data: bytes = mapped_file[offset: offset + length]
+        if self._get_digest(data=data) != digest:
+            return None
+
+        return data
+
+    @staticmethod
+    def _get_digest(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+    @staticmethod
+    def _read_index_entry(mapped_file: mmap.mmap, index: int) -> Tuple[bytes, int, int, bytes]:
+        return INDEX_ENTRY.unpack_from(mapped_file, FILE_HEADER.size + index * INDEX_ENTRY.size)
@@ -0,0 +1,179 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.config import OPERATIONS
+from src.enums import TokenTypesEnum
+from src.expressions import Expression, BinaryOperation, UnaryOperation, Variable, FunctionCall
+from src.tokens import TOKEN_TYPES_CODES
+from src.tokens_parser import ParsingContext, TokensParser
+
+
+# Kinds of pending operators on the operators stack:
+BINARY_OPERATOR: int = 0
+UNARY_OPERATOR: int = 1
+PARENTHESIS: int = 2
+FUNCTION_CALL: int = 3
+
+# Precedences of operators. Unary operator binds tighter than multiplication, but looser than exponentiation,
+# so "-2 ^ 2" is "-(2 ^ 2)" and "-2 * 3" is "(-2) * 3":
+OPERATORS_PRECEDENCES: Dict[TokenTypesEnum, int] = {
+    TokenTypesEnum.PLUS: 1,
+    TokenTypesEnum.MINUS: 1,
+    TokenTypesEnum.STAR: 2,
+    TokenTypesEnum.SLASH: 2,
+    TokenTypesEnum.CARET: 4,
+}
+UNARY_OPERATORS_PRECEDENCE: int = 3
+RIGHT_ASSOCIATIVE_OPERATORS: Tuple[TokenTypesEnum, ...] = (TokenTypesEnum.CARET,)
+
+# Pending operator as its precedence, operation or function name and kind:
+PendingOperator = Tuple[int, str, int]
+
+
+class PrecedenceParser(TokensParser):
+    """
+    Creates the same Abstract Syntax Tree as TokensParser using shunting-yard algorithm.
+
+    Pending operators and parsed operands are kept in explicit stacks instead of Python frames,
+    so depth of parentheses and amount of unary operators are not limited by the recursion limit.
+    Operator is applied, when an operator with a lower precedence or the end of parentheses is reached.
+
+    Depth of nesting is counted as in TokensParser: each pending unary operator, parenthesis, function call
+    or exponentiation adds a level, when it is pushed, and removes it, when it is applied, so too deep expression
+    is rejected, before the rest of it is parsed.
+
+    Example:
+    "2 * -x ^ 2" -> operands [2, x, 2] and operators [*, unary -, ^] -> "2 * (-(x ^ 2))"
+    """
+
+    # Binary operators by codes of their tokens as their precedence, operation and the lowest precedence
+    # of pending operators, which are applied before it. Right associative operator doesn't apply pending
+    # operators of the same precedence, so "2 ^ 3 ^ 2" is "2 ^ (3 ^ 2)":
+    _BINARY_OPERATORS: Dict[int, Tuple[int, str, int]] = {
+        TOKEN_TYPES_CODES[token_type]: (
+            OPERATORS_PRECEDENCES[token_type],
+            operation,
+            OPERATORS_PRECEDENCES[token_type] + (token_type in RIGHT_ASSOCIATIVE_OPERATORS)
+        )
+        for token_type, operation in OPERATIONS.items()
+    }
+    _RIGHT_PARENTHESIS_CODE: int = TOKEN_TYPES_CODES[TokenTypesEnum.RIGHT_PARENTHESIS]
+    _NESTING_PRECEDENCE: int = OPERATORS_PRECEDENCES[TokenTypesEnum.CARET]  # Binary operator, which adds a level
+
+    def _parse_computation(self, context: ParsingContext) -> Expression:
+        operators: List[PendingOperator] = []
+        operands: List[Expression] = []
+        while True:
+            if self._parse_operand(context=context, operators=operators, operands=operands):
+                continue
+
+            while context.next_token.code == self._RIGHT_PARENTHESIS_CODE:
+                if not self._close_parenthesis(context=context, operators=operators, operands=operands):
+                    break
+
+            binary_operator: Optional[Tuple[int, str, int]] = self._BINARY_OPERATORS.get(context.next_token.code)
+            if binary_operator is None:
+                break
+
+            precedence, operation, lowest_applied_precedence = binary_operator
+            context.skip_next_token()
+            if operators and operators[-1][0] >= lowest_applied_precedence:
+                self._apply_operators(
+                    context=context,
+                    operators=operators,
+                    operands=operands,
+                    precedence=lowest_applied_precedence
+                )
+
+            if precedence == self._NESTING_PRECEDENCE:
+                context.open_level()
+
+            operators.append((precedence, operation, BINARY_OPERATOR))
+
+        self._apply_operators(context=context, operators=operators, operands=operands, precedence=1)
+        if operators:  # Parentheses were not closed
+            context.get_next_token(expected_token_type=TokenTypesEnum.RIGHT_PARENTHESIS)
+
+        return operands[-1]
+
+    def _parse_operand(
+            self,
+            context: ParsingContext,
+            operators: List[PendingOperator],
+            operands: List[Expression]
+    ) -> bool:
+        """
+        Parses a number or a variable into operands, or pushes a unary operator, a parenthesis or a function call
+        into operators. Returns True, if an operand is still expected.
+        """
+
+        next_token_code: int = context.next_token.code
+        operation: Optional[str] = self._ADDITIVE_OPERATIONS.get(next_token_code)
+        if operation is not None:
+            context.skip_next_token()
+            context.open_level()
+            operators.append((UNARY_OPERATORS_PRECEDENCE, operation, UNARY_OPERATOR))
+            return True
+        elif next_token_code == self._LEFT_PARENTHESIS_CODE:
+            context.skip_next_token()
+            context.open_level()
+            operators.append((0, '', PARENTHESIS))
+            return True
+        elif next_token_code == self._IDENTIFIER_CODE:
+            name: str = context.get_next_token(expected_token_type=TokenTypesEnum.IDENTIFIER).literal
+            if context.next_token.code == self._LEFT_PARENTHESIS_CODE:
+                context.skip_next_token()
+                context.open_level()
+                operators.append((0, name, FUNCTION_CALL))
+                return True
+
+            operands.append(Variable(name=name))
+        else:
+            operands.append(self._parse_number(context=context))
+
+        return False
+
+    def _close_parenthesis(
+            self,
+            context: ParsingContext,
+            operators: List[PendingOperator],
+            operands: List[Expression]
+    ) -> bool:
+        """
+        Applies operators inside parentheses and consumes the right parenthesis.
+        Returns False, if there are no open parentheses, so the parenthesis ends the expression.
+        """
+
+        self._apply_operators(context=context, operators=operators, operands=operands, precedence=1)
+        if not operators:
+            return False
+
+        context.skip_next_token()
+        context.close_level()
+        _, name, kind = operators.pop()
+        if kind == FUNCTION_CALL:
+            operands[-1] = FunctionCall(name=name, argument=operands[-1])
+
+        return True
+
+    def _apply_operators(
+            self,
+            context: ParsingContext,
+            operators: List[PendingOperator],
+            operands: List[Expression],
+            precedence: int
+    ) -> None:
+        """
+        Replaces operands of pending operators with at least given precedence with operations nodes.
+        Parentheses have zero precedence, so operators before them are not applied.
+        """
+
+        while operators and operators[-1][0] >= precedence:
+            operator_precedence, operation, kind = operators.pop()
+            if kind != BINARY_OPERATOR or operator_precedence == self._NESTING_PRECEDENCE:
+                context.close_level()
+
+            if kind == BINARY_OPERATOR:
+                right: Expression = operands.pop()
+                operands[-1] = BinaryOperation(operation=operation, left=operands[-1], right=right)
+            else:
+                operands[-1] = UnaryOperation(operation=operation, expression=operands[-1])
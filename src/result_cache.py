@@ -0,0 +1,108 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Mapping, Optional, Tuple
+
+from src.cache import CacheInfo, LRUCache
+from src.dependencies import find_variables
+from src.expressions import TreeNode
+
+
+# Value of a variable with its sign, so zero and negative zero are different values:
+SignedValue = Tuple[float, float]
+
+# Text of an expression with values of variables, which are used in it, in the order of their names:
+ResultKey = Tuple[str, Tuple[SignedValue, ...]]
+
+
+class ResultCache:
+    """
+    Storage of calculated values of expressions of a bounded size, which evicts the least recently used entry,
+    when there is no space for a new one. Value is found by the text of the expression and values of only those
+    variables, which are used in it, so assignments of other variables do not affect it, and values, calculated
+    with different values of variables, are kept side by side.
+
+    Names of variables of an expression are found once and stored by its text, so values are found without
+    walking the parsed expression, even if it is parsed again each time.
+
+    Example:
+    cache.put(expression="x * 2", tree=tree_of("x * 2"), variables={"x": 3, "y": 1}, result=6)
+    cache.put(expression="x * 2", tree=tree_of("x * 2"), variables={"x": 4, "y": 1}, result=8)
+    cache.get(expression="x * 2", tree=tree_of("x * 2"), variables={"x": 3, "y": 5})  # 6, because "y" is not used
+    cache.get(expression="x * 2", tree=tree_of("x * 2"), variables={"x": 5, "y": 5})  # None
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError('Cache size can not be negative.')
+
+        self._maxsize: int = maxsize
+        self._entries: OrderedDict[ResultKey, float] = OrderedDict()
+        self._variables: LRUCache[str, Tuple[str, ...]] = LRUCache(maxsize=maxsize)  # Names of variables by texts
+        self._hits: int = 0
+        self._misses: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, expression: str, tree: TreeNode, variables: Mapping[str, float]) -> Optional[float]:
+        """
+        Returns the value of the expression, if it was calculated with the same values of its variables,
+        and marks it as the most recently used. Returns None, if there is no such value.
+        """
+
+        key: Optional[ResultKey] = self._make_key(expression=expression, tree=tree, variables=variables)
+        with self._lock:
+            result: Optional[float] = self._entries.get(key) if key is not None else None
+            if key is None or result is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, expression: str, tree: TreeNode, variables: Mapping[str, float], result: float) -> None:
+        if self._maxsize == 0:
+            return
+
+        key: Optional[ResultKey] = self._make_key(expression=expression, tree=tree, variables=variables)
+        if key is None:
+            return
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)  # Least recently used entry is the first one
+
+    def clear(self) -> None:
+        """
+        Drops all values. Hits and misses are kept, so statistics cover the whole lifetime of the cache.
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(hits=self._hits, misses=self._misses, maxsize=self._maxsize, currsize=len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _make_key(self, expression: str, tree: TreeNode, variables: Mapping[str, float]) -> Optional[ResultKey]:
+        """
+        Returns the text of the expression with values of its variables. Returns None, if one of them has no value.
+        """
+
+        names: Optional[Tuple[str, ...]] = self._variables.get(key=expression)
+        if names is None:
+            names = tuple(sorted(find_variables(node=tree)))
+            self._variables.put(key=expression, value=names)
+
+        try:
+            values: Tuple[SignedValue, ...] = tuple(
+                (variables[name], math.copysign(1.0, variables[name])) for name in names
+            )
+        except KeyError:
+            return None
+
+        return expression, values
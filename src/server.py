@@ -0,0 +1,239 @@
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.batch import BatchProcessor, BatchRecord
+from src.config import BASE_COMMANDS, MATH_COMMANDS, EXIT_VARIABLE
+from src.exceptions import InputLineTooLongError
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.limits import ResourceLimits
+from src.tokens_parser import TokensParser
+
+
+# Line of a session with its number, counted from the start of the session:
+NumberedLine = Tuple[int, str]
+
+
+class EvaluationServer:
+    """
+    TCP server, which interprets assignments of clients the same way, as batch mode does.
+    Each connection is a session with its own interpreter, so variables of sessions don't affect each other.
+    Client sends assignments line by line or several lines at once and receives a JSON record for each
+    non-empty line in the same order. Session is closed after the "exit" line, after client closes its side
+    of the connection or, if client sends nothing or reads no results during the idle timeout, it is evicted.
+
+    Lines of a session are evaluated in a pool of threads, where at most max_concurrent_evaluations batches
+    are evaluated at once. Next data of a session is not read, until results of its previous lines are sent,
+    so a client, which doesn't read results, is slowed down instead of filling memory of the server.
+    If limits are provided, each line is rejected with a limit error, as soon as it exceeds one of them,
+    so a single hostile line can not hold a thread of the pool for long.
+
+    Example:
+    Client sends: "x = 2\\ny = x / 0\\n"
+    Server sends: '{"line": 1, "variable": "x", "value": 2.0}\\n{"line": 2, "error": "CustomZeroDivisionError", ...}\\n'
+    """
+
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            idle_timeout: float = 300.0,
+            max_concurrent_evaluations: int = 4,
+            max_line_length: int = 64 * 1024,
+            read_size: int = 64 * 1024,
+            parse_cache_size: int = 128,
+            limits: Optional[ResourceLimits] = None
+    ) -> None:
+
+        self._host: str = host
+        self._port: int = port  # Zero port means, that any free port is chosen on start
+        self._idle_timeout: float = idle_timeout
+        self._max_concurrent_evaluations: int = max_concurrent_evaluations
+        self._max_line_length: int = max_line_length
+        self._read_size: int = read_size
+        self._parse_cache_size: int = parse_cache_size
+        self._limits: Optional[ResourceLimits] = limits
+
+        # Lexical processor and parser keep no per-call state, so they are shared by interpreters of all sessions:
+        self._lexical_processor: LexicalProcessor = LexicalProcessor(limits=limits)
+        self._parser: TokensParser = TokensParser(limits=limits)
+
+        self._evaluations: asyncio.Semaphore = asyncio.Semaphore(max_concurrent_evaluations)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sessions: Dict[int, asyncio.StreamWriter] = {}
+        self._session_ids: Iterator[int] = itertools.count(start=1)
+
+    @property
+    def port(self) -> int:
+        """
+        Returns the port, which server listens to. It is known only after the server is started.
+        """
+
+        if self._server is None:
+            return self._port
+
+        return self._server.sockets[0].getsockname()[1]  # type: ignore[attr-defined]
+
+    @property
+    def sessions_count(self) -> int:
+        return len(self._sessions)
+
+    async def start(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_concurrent_evaluations,
+            thread_name_prefix='evaluation'
+        )
+        self._server = await asyncio.start_server(self._serve_session, host=self._host, port=self._port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """
+        Stops accepting connections, closes all sessions and waits for evaluations, which are in progress.
+        """
+
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._sessions.values()):
+                writer.close()
+
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _create_interpreter(self) -> MathOperationsInterpreter:
+        return MathOperationsInterpreter(
+            interpreter_base_commands=BASE_COMMANDS,
+            interpreter_math_commands=MATH_COMMANDS,
+            parser=self._parser,
+            lexical_processor=self._lexical_processor,
+            parse_cache_size=self._parse_cache_size,
+            limits=self._limits
+        )
+
+    async def _serve_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session_id: int = next(self._session_ids)
+        self._sessions[session_id] = writer
+        try:
+            await self._process_session(
+                reader=reader,
+                writer=writer,
+                processor=BatchProcessor(interpreter=self._create_interpreter())
+            )
+        except ConnectionError:
+            pass  # Client has gone, so there is nobody to report to
+        finally:
+            del self._sessions[session_id]
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _process_session(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+            processor: BatchProcessor
+    ) -> None:
+
+        pending: bytes = b''  # Beginning of the line, which end is not received yet
+        line_number: int = 0
+        finished: bool = False
+        while not finished:
+            try:
+                chunk: bytes = await asyncio.wait_for(reader.read(self._read_size), timeout=self._idle_timeout)
+            except asyncio.TimeoutError:
+                return  # Idle session is evicted
+
+            # When client closes its side of the connection, the last line is complete without a line break:
+            lines: List[bytes] = (pending + chunk).split(b'\n')
+            pending = lines.pop() if chunk else b''
+
+            records: List[BatchRecord]
+            records, finished = await self._process_lines(
+                processor=processor,
+                lines=lines,
+                pending=pending,
+                first_line_number=line_number + 1
+            )
+            line_number += len(lines)
+            finished = finished or not chunk
+
+            writer.writelines(f'{record.to_json()}\n'.encode() for record in records)
+            try:
+                # Next lines are not read, until the client reads results of previous ones:
+                await asyncio.wait_for(writer.drain(), timeout=self._idle_timeout)
+            except asyncio.TimeoutError:
+                writer.transport.abort()  # Unsent results are dropped, so closing doesn't wait for the client
+                return
+
+    async def _process_lines(
+            self,
+            processor: BatchProcessor,
+            lines: List[bytes],
+            pending: bytes,
+            first_line_number: int
+    ) -> Tuple[List[BatchRecord], bool]:
+        """
+        Evaluates complete lines up to the "exit" line or up to a line, which is longer than allowed,
+        including the pending one, which could not be buffered. Returns records of lines and whether
+        the session is finished.
+        """
+
+        too_long_line_number: Optional[int] = next(
+            (
+                line_number for line_number, line in enumerate(lines + [pending], start=first_line_number)
+                if len(line) > self._max_line_length
+            ),
+            None
+        )
+        if too_long_line_number is not None:
+            lines = lines[:too_long_line_number - first_line_number]
+
+        numbered_lines: List[NumberedLine] = []
+        for line_number, line in enumerate(lines, start=first_line_number):
+            user_input: str = line.decode(errors='replace')
+            if user_input.strip().lower() == EXIT_VARIABLE:
+                return await self._evaluate(processor=processor, lines=numbered_lines), True
+
+            numbered_lines.append((line_number, user_input))
+
+        records: List[BatchRecord] = await self._evaluate(processor=processor, lines=numbered_lines)
+        if too_long_line_number is None:
+            return records, False
+
+        error: InputLineTooLongError = InputLineTooLongError(max_length=self._max_line_length)
+        records.append(
+            BatchRecord(line=too_long_line_number, error=error.__class__.__name__, message=str(error).strip())
+        )
+        return records, True
+
+    async def _evaluate(self, processor: BatchProcessor, lines: List[NumberedLine]) -> List[BatchRecord]:
+        if not lines:
+            return []
+
+        async with self._evaluations:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                self._process_numbered_lines,
+                processor,
+                lines
+            )
+
+    @staticmethod
+    def _process_numbered_lines(processor: BatchProcessor, lines: List[NumberedLine]) -> List[BatchRecord]:
+        return list(processor.process_numbered_lines(lines=lines))
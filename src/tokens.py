@@ -1,12 +1,28 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from mmap import mmap
+from typing import Dict, Tuple, Union
 
 from src.enums import TokenTypesEnum
 
 
-@dataclass
+# Integer codes of token types. Parser compares codes of tokens, which is cheaper than comparing enums:
+TOKEN_TYPES_CODES: Dict[TokenTypesEnum, int] = {token_type: code for code, token_type in enumerate(TokenTypesEnum)}
+
+# Buffers, which tokens can be streamed from without copying them:
+TokensSource = Union[str, bytes, bytearray, memoryview, mmap]
+
+# Token, which is streamed as the code of its type and offsets of its literal in the source buffer:
+TokenOffsets = Tuple[int, int, int]
+
+
+@dataclass(slots=True)
 class Token:
     type: TokenTypesEnum
     literal: str
+    code: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.code = TOKEN_TYPES_CODES[self.type]
 
     def __str__(self) -> str:
         return f'{self.__class__.__name__}({self.type}, {self.literal})'
@@ -1,11 +1,67 @@
-from typing import List
+import sys
+from typing import Dict, Iterable, Iterator, Optional
 
 from src.enums import TokenTypesEnum
-from src.exceptions import ParseError
+from src.exceptions import ParseError, ExpressionTooDeepError, ParserStackExhaustedError
 from src.config import OPERATIONS
 from src.interfaces import Parser
-from src.tokens import Token
-from src.expressions import Expression, BinaryOperation, Number, UnaryOperation
+from src.limits import ResourceLimits, check_tree_limits
+from src.tokens import Token, TokenOffsets, TokensSource, TOKEN_TYPES_CODES
+from src.expressions import Expression, BinaryOperation, Number, UnaryOperation, Variable, FunctionCall
+
+
+# Token, which is returned, when tokens are over:
+END_OF_TOKENS: Token = Token(type=TokenTypesEnum.EOF, literal='')
+
+
+class ParsingContext:
+    """
+    State of a single parsing process: the rest of tokens, the upcoming token, which is checked without consuming,
+    and the amount of nested operations, which operands are being parsed.
+
+    Each nested unary operation, function call, exponentiation or parenthesised expression adds a level,
+    so the depth of nesting is checked, while the expression is being parsed, before nesting exhausts the stack.
+    Parentheses add levels, though they don't create nodes, because each of them takes a frame of the parser.
+    """
+
+    __slots__ = ('tokens', 'next_token', 'depth', 'max_depth')
+
+    def __init__(self, tokens: Iterator[Token], max_depth: Optional[int] = None) -> None:
+        self.tokens: Iterator[Token] = tokens
+        self.next_token: Token = next(tokens, END_OF_TOKENS)
+        self.depth: int = 1
+        self.max_depth: Optional[int] = max_depth
+
+    def skip_next_token(self) -> None:
+        self.next_token = next(self.tokens, END_OF_TOKENS)
+
+    def get_next_token(self, expected_token_type: TokenTypesEnum) -> Token:
+        """
+        Returns next token if token's type matches expected token type.
+
+        In other case raises error.
+        """
+
+        next_token: Token = self.next_token
+        self.next_token = next(self.tokens, END_OF_TOKENS)
+
+        if next_token.type != expected_token_type:
+            raise ParseError(f'Expected {expected_token_type}, but received {next_token!r}.')
+
+        return next_token
+
+    def open_level(self) -> None:
+        """
+        Starts parsing of an operand of a nested operation.
+        If the tree would be deeper than allowed, raises ExpressionTooDeepError.
+        """
+
+        self.depth += 1
+        if self.max_depth is not None and self.depth > self.max_depth:
+            raise ExpressionTooDeepError(max_depth=self.max_depth)
+
+    def close_level(self) -> None:
+        self.depth -= 1
 
 
 class TokensParser(Parser):
@@ -17,114 +73,163 @@ class TokensParser(Parser):
     term := unary ( (STAR | SLASH ) unary )*
     unary := PLUS unary | MINUS unary | exponentiation
     exponentiation := atom CARET unary | atom
-    atom := LEFT_PARENTHESIS computation RIGHT_PARENTHESIS | number
+    atom := LEFT_PARENTHESIS computation RIGHT_PARENTHESIS | number | function_call | variable
     number := INT
-    """
+    function_call := IDENTIFIER LEFT_PARENTHESIS computation RIGHT_PARENTHESIS
+    variable := IDENTIFIER
 
-    def __init__(self) -> None:
-        self._tokens: List[Token] = []
-        self._next_token_index: int = 0
+    Tokens are consumed one by one with one token of lookahead, so they can be generated lazily.
+    Parser doesn't keep any state between calls, so a single parser can be used by several threads at once.
 
-    def parse(self, tokens: List[Token]) -> Expression:
+    If limits are provided, expression, which is nested deeper than max_depth, is rejected while it is parsed,
+    and parsed tree, which is deeper than max_depth or has more than max_nodes nodes, is rejected.
+    Expression, which is nested too deep for Python recursion limit, like thousands of parentheses without
+    max_depth, is rejected with ParserStackExhaustedError, so PrecedenceParser should be used for such expressions.
+    """
+
+    # Operations by codes of their tokens, so a single lookup checks the type of a token and gives its operation:
+    _ADDITIVE_OPERATIONS: Dict[int, str] = {
+        TOKEN_TYPES_CODES[token_type]: OPERATIONS[token_type]
+        for token_type in (TokenTypesEnum.PLUS, TokenTypesEnum.MINUS)
+    }
+    _MULTIPLICATIVE_OPERATIONS: Dict[int, str] = {
+        TOKEN_TYPES_CODES[token_type]: OPERATIONS[token_type]
+        for token_type in (TokenTypesEnum.STAR, TokenTypesEnum.SLASH)
+    }
+    _CARET_CODE: int = TOKEN_TYPES_CODES[TokenTypesEnum.CARET]
+    _LEFT_PARENTHESIS_CODE: int = TOKEN_TYPES_CODES[TokenTypesEnum.LEFT_PARENTHESIS]
+    _IDENTIFIER_CODE: int = TOKEN_TYPES_CODES[TokenTypesEnum.IDENTIFIER]
+
+    _TOKEN_TYPES: Dict[int, TokenTypesEnum] = {code: token_type for token_type, code in TOKEN_TYPES_CODES.items()}
+
+    def __init__(self, limits: Optional[ResourceLimits] = None) -> None:
+        self._limits: ResourceLimits = limits or ResourceLimits()
+
+    def parse(self, tokens: Iterable[Token]) -> Expression:
         """
         Parses the expression, created by user.
         """
 
-        # Initializes for each new parsing process:
-        self._next_token_index = 0
-        self._tokens = tokens
+        # State of each parsing process is kept in its own context, so parser can be used by several threads at once:
+        context: ParsingContext = ParsingContext(tokens=iter(tokens), max_depth=self._limits.max_depth)
+
+        computation: Expression
+        try:
+            computation = self._parse_computation(context=context)
+        except RecursionError:
+            raise ParserStackExhaustedError(recursion_limit=sys.getrecursionlimit())
+
+        context.get_next_token(expected_token_type=TokenTypesEnum.EOF)
+        if self._limits.limits_tree:
+            check_tree_limits(node=computation, limits=self._limits)
 
-        computation: Expression = self._parse_computation()
-        self._get_next_token(expected_token_type=TokenTypesEnum.EOF)
         return computation
 
-    def _parse_computation(self) -> Expression:
-        result: Expression = self._parse_term()
-        while (next_token_type := self._get_next_token_type()) in {TokenTypesEnum.PLUS, TokenTypesEnum.MINUS}:
-            operation: str = OPERATIONS[next_token_type]
-            self._get_next_token(expected_token_type=next_token_type)
-            right: Expression = self._parse_term()
+    def parse_stream(self, source: TokensSource, tokens: Iterable[TokenOffsets]) -> Expression:
+        """
+        Parses the expression from tokens, which are given as codes of their types and offsets in the source.
+        Literal of a token is sliced from the source only, when the parser reaches the token.
+
+        Example:
+        parser.parse_stream(source=source, tokens=lexical_processor.stream_tokens(source=source))
+        """
+
+        return self.parse(tokens=self._read_tokens(source=source, tokens=tokens))
+
+    def _read_tokens(self, source: TokensSource, tokens: Iterable[TokenOffsets]) -> Iterator[Token]:
+        for code, start, end in tokens:
+            literal: str = source[start:end] if isinstance(source, str) else str(source[start:end], 'ascii')
+            yield Token(type=self._TOKEN_TYPES[code], literal=literal)
+
+    def _parse_computation(self, context: ParsingContext) -> Expression:
+        result: Expression = self._parse_term(context=context)
+        operation: Optional[str]
+        while (operation := self._ADDITIVE_OPERATIONS.get(context.next_token.code)) is not None:
+            context.skip_next_token()
+            right: Expression = self._parse_term(context=context)
             result = BinaryOperation(operation=operation, left=result, right=right)
 
         return result
 
-    def _parse_term(self) -> Expression:
+    def _parse_term(self, context: ParsingContext) -> Expression:
         """
         Parses an expression with multiplications and divisions.
         """
 
-        result: Expression = self._parse_unary()
-        while (next_token_type := self._get_next_token_type()) in {TokenTypesEnum.STAR, TokenTypesEnum.SLASH}:
-            operation: str = OPERATIONS[next_token_type]
-            self._get_next_token(expected_token_type=next_token_type)
-            right: Expression = self._parse_unary()
+        result: Expression = self._parse_unary(context=context)
+        operation: Optional[str]
+        while (operation := self._MULTIPLICATIVE_OPERATIONS.get(context.next_token.code)) is not None:
+            context.skip_next_token()
+            right: Expression = self._parse_unary(context=context)
             result = BinaryOperation(operation=operation, left=result, right=right)
 
         return result
 
-    def _parse_unary(self) -> Expression:
+    def _parse_unary(self, context: ParsingContext) -> Expression:
         """
         Parses a unary operator.
         """
 
-        if (next_token_type := self._get_next_token_type()) in {TokenTypesEnum.PLUS, TokenTypesEnum.MINUS}:
-            operation: str = OPERATIONS[next_token_type]
-            self._get_next_token(expected_token_type=next_token_type)
-            expression: Expression = self._parse_unary()
+        operation: Optional[str] = self._ADDITIVE_OPERATIONS.get(context.next_token.code)
+        if operation is not None:
+            context.skip_next_token()
+            context.open_level()
+            expression: Expression = self._parse_unary(context=context)
+            context.close_level()
             return UnaryOperation(operation=operation, expression=expression)
         else:  # No unary operators in sight.
-            return self._parse_exponentiation()
+            return self._parse_exponentiation(context=context)
 
-    def _parse_exponentiation(self) -> Expression:
+    def _parse_exponentiation(self, context: ParsingContext) -> Expression:
         """
         Parses a caret operator.
         """
 
-        expression: Expression = self._parse_atom()
-        next_token_type: TokenTypesEnum = self._get_next_token_type()
-        if next_token_type == TokenTypesEnum.CARET:
-            self._get_next_token(expected_token_type=TokenTypesEnum.CARET)
-            right: Expression = self._parse_unary()
-            expression = BinaryOperation(operation=OPERATIONS[next_token_type], left=expression, right=right)
+        expression: Expression = self._parse_atom(context=context)
+        if context.next_token.code == self._CARET_CODE:
+            context.skip_next_token()
+            context.open_level()
+            right: Expression = self._parse_unary(context=context)
+            context.close_level()
+            expression = BinaryOperation(operation=OPERATIONS[TokenTypesEnum.CARET], left=expression, right=right)
 
         return expression
 
-    def _parse_atom(self) -> Expression:
+    def _parse_atom(self, context: ParsingContext) -> Expression:
         """
-        Parses a parenthesised expression or a number.
+        Parses a parenthesised expression, a function call, a variable or a number.
         """
 
         expression: Expression
-        if self._get_next_token_type() == TokenTypesEnum.LEFT_PARENTHESIS:
-            self._get_next_token(expected_token_type=TokenTypesEnum.LEFT_PARENTHESIS)
-            expression = self._parse_computation()
-            self._get_next_token(expected_token_type=TokenTypesEnum.RIGHT_PARENTHESIS)
+        next_token_code: int = context.next_token.code
+        if next_token_code == self._LEFT_PARENTHESIS_CODE:
+            context.skip_next_token()
+            context.open_level()
+            expression = self._parse_computation(context=context)
+            context.close_level()
+            context.get_next_token(expected_token_type=TokenTypesEnum.RIGHT_PARENTHESIS)
+        elif next_token_code == self._IDENTIFIER_CODE:
+            expression = self._parse_identifier(context=context)
         else:
-            expression = self._parse_number()
+            expression = self._parse_number(context=context)
 
         return expression
 
-    def _parse_number(self) -> Number:
-        return Number(float(self._get_next_token(expected_token_type=TokenTypesEnum.NUMBER).literal))
+    def _parse_number(self, context: ParsingContext) -> Number:
+        return Number(float(context.get_next_token(expected_token_type=TokenTypesEnum.NUMBER).literal))
 
-    def _get_next_token(self, expected_token_type: TokenTypesEnum) -> Token:
+    def _parse_identifier(self, context: ParsingContext) -> Expression:
         """
-        Returns next token if token's type matches expected token type.
-
-        In other case raises error.
+        Parses a function call, if identifier is followed by a parenthesised expression, else a variable.
         """
 
-        next_token: Token = self._tokens[self._next_token_index]
-        self._next_token_index += 1
-
-        if next_token.type != expected_token_type:
-            raise ParseError(f'Expected {expected_token_type}, but received {next_token!r}.')
-
-        return next_token
-
-    def _get_next_token_type(self) -> TokenTypesEnum:
-        """
-        Checks type of upcoming token without consuming it.
-        """
+        name: str = context.get_next_token(expected_token_type=TokenTypesEnum.IDENTIFIER).literal
+        if context.next_token.code != self._LEFT_PARENTHESIS_CODE:
+            return Variable(name=name)
 
-        return self._tokens[self._next_token_index].type
+        context.skip_next_token()
+        context.open_level()
+        argument: Expression = self._parse_computation(context=context)
+        context.close_level()
+        context.get_next_token(expected_token_type=TokenTypesEnum.RIGHT_PARENTHESIS)
+        return FunctionCall(name=name, argument=argument)
@@ -0,0 +1,196 @@
+from dataclasses import dataclass
+from typing import Dict, Mapping, Type, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from src.commands import (
+    BaseCommand,
+    MathCommand,
+    AddCommand,
+    SubtractCommand,
+    MultiplyCommand,
+    DivideCommand,
+    ExponentialCommand,
+    SinCommand,
+    CosCommand,
+    TanCommand,
+    LogCommand,
+    ExpCommand,
+    SqrtCommand
+)
+from src.exceptions import UnknownExpressionTypeError, UndefinedVariableError, UnknownFunctionError
+from src.expressions import TreeNode, UnaryOperation, BinaryOperation, Number, Variable, FunctionCall
+
+
+FloatArray = npt.NDArray[np.float64]
+BoolArray = npt.NDArray[np.bool_]
+
+# NumPy universal functions, which are element-wise equivalents of commands. Division and exponentiation
+# are not listed here, because they require checks for errors, which commands report by raising exceptions:
+BASE_COMMANDS_UFUNCS: Dict[Type[BaseCommand], np.ufunc] = {
+    AddCommand: np.add,
+    SubtractCommand: np.subtract,
+    MultiplyCommand: np.multiply,
+}
+
+MATH_COMMANDS_UFUNCS: Dict[Type[MathCommand], np.ufunc] = {
+    SinCommand: np.sin,
+    CosCommand: np.cos,
+    TanCommand: np.tan,
+    LogCommand: np.log,
+    ExpCommand: np.exp,
+    SqrtCommand: np.sqrt,
+}
+
+
+@dataclass
+class VectorizedResult:
+    """
+    Result of vectorized evaluation. Elements, for which evaluation failed, have NaN value in "values" array
+    and are marked in one of masks:
+    1) "zero_division" - number was divided by zero;
+    2) "domain_error" - result of operation is not a finite real number, like sqrt(-1), log(0) or 10 ^ 400.
+    """
+
+    values: FloatArray
+    zero_division: BoolArray
+    domain_error: BoolArray
+
+    @property
+    def valid(self) -> BoolArray:
+        return ~(self.zero_division | self.domain_error)
+
+
+class VectorizedExpression:
+    """
+    Parsed expression, which is evaluated over arrays of variable values at once using NumPy.
+
+    Operations are mapped to NumPy universal functions by their commands. Commands without such mapping
+    are executed element by element, so any of their errors aborts the whole batch.
+    """
+
+    def __init__(
+            self,
+            tree: TreeNode,
+            base_commands: Dict[str, Type[BaseCommand]],
+            math_commands: Dict[str, Type[MathCommand]]
+    ) -> None:
+
+        self._tree: TreeNode = tree
+        self._base_commands: Dict[str, Type[BaseCommand]] = base_commands
+        self._math_commands: Dict[str, Type[MathCommand]] = math_commands
+
+    def evaluate(self, variables: Mapping[str, npt.ArrayLike]) -> VectorizedResult:
+        """
+        Evaluates the expression for arrays of variable values, which are broadcast against each other.
+        If one of used variables is not provided, raises UndefinedVariableError.
+        """
+
+        arrays: Dict[str, FloatArray] = {
+            name: np.asarray(value, dtype=np.float64) for name, value in variables.items()
+        }
+
+        shape: Tuple[int, ...] = np.broadcast_shapes(*(array.shape for array in arrays.values()))
+        evaluation: _VectorizedEvaluation = _VectorizedEvaluation(
+            variables=arrays,
+            shape=shape,
+            base_commands=self._base_commands,
+            math_commands=self._math_commands
+        )
+
+        with np.errstate(all='ignore'):  # Errors are collected into masks instead of warnings
+            values: FloatArray = np.broadcast_to(evaluation.calculate_node_values(node=self._tree), shape).copy()
+
+        failed: BoolArray = evaluation.zero_division | evaluation.domain_error
+        values[failed] = np.nan
+        return VectorizedResult(
+            values=values,
+            zero_division=evaluation.zero_division,
+            domain_error=evaluation.domain_error & ~evaluation.zero_division
+        )
+
+
+class _VectorizedEvaluation:
+    """
+    State of a single vectorized evaluation: provided variables and masks of failed elements.
+    """
+
+    def __init__(
+            self,
+            variables: Dict[str, FloatArray],
+            shape: Tuple[int, ...],
+            base_commands: Dict[str, Type[BaseCommand]],
+            math_commands: Dict[str, Type[MathCommand]]
+    ) -> None:
+
+        self._variables: Dict[str, FloatArray] = variables
+        self._base_commands: Dict[str, Type[BaseCommand]] = base_commands
+        self._math_commands: Dict[str, Type[MathCommand]] = math_commands
+        self.zero_division: BoolArray = np.zeros(shape, dtype=np.bool_)
+        self.domain_error: BoolArray = np.zeros(shape, dtype=np.bool_)
+
+    def calculate_node_values(self, node: TreeNode) -> FloatArray:
+        """
+        Recursively calculates values of an AST tree node for all elements at once.
+        """
+
+        if isinstance(node, UnaryOperation):
+            return self._calculate_operation(
+                command=self._base_commands[node.operation],
+                a=np.asarray(0, dtype=np.float64),  # Unary operation has only one part of expression
+                b=self.calculate_node_values(node=node.expression)
+            )
+        elif isinstance(node, BinaryOperation):
+            return self._calculate_operation(
+                command=self._base_commands[node.operation],
+                a=self.calculate_node_values(node=node.left),
+                b=self.calculate_node_values(node=node.right)
+            )
+        elif isinstance(node, FunctionCall):
+            if node.name not in self._math_commands:
+                raise UnknownFunctionError(name=node.name)
+
+            return self._calculate_math_function(
+                command=self._math_commands[node.name],
+                value=self.calculate_node_values(node=node.argument)
+            )
+        elif isinstance(node, Number):
+            return np.asarray(node.value, dtype=np.float64)
+        elif isinstance(node, Variable):
+            try:
+                return self._variables[node.name]
+            except KeyError:
+                raise UndefinedVariableError(name=node.name)
+        else:
+            raise UnknownExpressionTypeError()
+
+    def _calculate_operation(self, command: Type[BaseCommand], a: FloatArray, b: FloatArray) -> FloatArray:
+        if command is DivideCommand:
+            self.zero_division |= b == 0
+            return np.divide(a, b)
+        elif command is ExponentialCommand:
+            self.zero_division |= (a == 0) & (b < 0)
+            return self._check_domain(np.power(a, b), a, b)
+        elif command in BASE_COMMANDS_UFUNCS:
+            return BASE_COMMANDS_UFUNCS[command](a, b)
+
+        return np.asarray(np.frompyfunc(command.as_function(), 2, 1)(a, b), dtype=np.float64)
+
+    def _calculate_math_function(self, command: Type[MathCommand], value: FloatArray) -> FloatArray:
+        if command in MATH_COMMANDS_UFUNCS:
+            return self._check_domain(MATH_COMMANDS_UFUNCS[command](value), value)
+
+        return np.asarray(np.frompyfunc(command.as_function(), 1, 1)(value), dtype=np.float64)
+
+    def _check_domain(self, result: FloatArray, *operands: FloatArray) -> FloatArray:
+        """
+        Marks elements, which became not finite after the operation, while its operands were finite.
+        """
+
+        failed: BoolArray = ~np.isfinite(result)
+        for operand in operands:
+            failed = failed & np.isfinite(operand)
+
+        self.domain_error |= failed
+        return result
@@ -2,6 +2,8 @@ import pytest
 
 from src.config import MATH_COMMANDS, BASE_COMMANDS
 from src.interpreter import MathOperationsInterpreter
+from src.optimizer import ExpressionOptimizer
+from src.precedence_parser import PrecedenceParser
 from src.tokens_parser import TokensParser
 from src.lexical_processor import LexicalProcessor
 
@@ -21,6 +23,16 @@ def tokens_parser() -> TokensParser:
     return TokensParser()
 
 
+@pytest.fixture
+def precedence_parser() -> PrecedenceParser:
+    return PrecedenceParser()
+
+
 @pytest.fixture
 def lexical_processor() -> LexicalProcessor:
     return LexicalProcessor()
+
+
+@pytest.fixture
+def expression_optimizer() -> ExpressionOptimizer:
+    return ExpressionOptimizer(base_commands=BASE_COMMANDS, math_commands=MATH_COMMANDS)
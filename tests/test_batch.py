@@ -0,0 +1,113 @@
+import io
+import json
+from typing import List
+
+from src.batch import BatchProcessor, BatchRecord, ThreadPoolEvaluator, write_records
+from src.enums import OutputFormatsEnum
+from src.interpreter import MathOperationsInterpreter
+
+
+SCRIPT: List[str] = [
+    'x = 2\n',
+    'y = x * 3\n',
+    '\n',
+    'z = 1 / 0\n',
+    'w\n',
+    'result = y + 1\n',
+    'q = x\n',
+    'exit\n',
+    'ignored = 1\n',
+]
+
+
+def test_batch_processor_reports_each_line(interpreter: MathOperationsInterpreter) -> None:
+    records: List[BatchRecord] = list(BatchProcessor(interpreter=interpreter).process(lines=SCRIPT))
+    assert [record.line for record in records] == [1, 2, 4, 5, 6, 7]
+    assert records[0] == BatchRecord(line=1, variable='x', value=2.0)
+    assert records[1] == BatchRecord(line=2, variable='y', value=6.0)
+    assert records[2].error == 'CustomZeroDivisionError'
+    assert records[2].message == 'Number can not be divided by zero. Please check your input and try again.'
+    assert records[3].error == 'IncorrectVariableAssignmentError'
+    assert records[4] == BatchRecord(line=6, variable='result', value=7.0)
+
+    # Variables are cleared after the result is calculated:
+    assert records[5].error == 'UndefinedVariableError'
+
+
+def test_batch_processor_reports_math_errors(interpreter: MathOperationsInterpreter) -> None:
+    records: List[BatchRecord] = list(
+        BatchProcessor(interpreter=interpreter).process(lines=['x = sqrt(-1)', 'y = exp(1000)', 'z = 2'])
+    )
+    assert [record.error for record in records] == ['MathDomainError', 'NumericOverflowError', None]
+    assert records[2].value == 2.0
+
+
+def test_write_records_in_csv_format(interpreter: MathOperationsInterpreter) -> None:
+    output: io.StringIO = io.StringIO(newline='')
+    count: int = write_records(
+        records=BatchProcessor(interpreter=interpreter).process(lines=['x = 2', 'y = foo(x)']),
+        output=output,
+        output_format=OutputFormatsEnum.CSV
+    )
+
+    assert count == 2
+    assert output.getvalue().splitlines() == [
+        'line,variable,value,error,message,source',
+        '1,x,2.0,,,',
+        '2,,,UnknownFunctionError,"Function ""foo"" is not supported. Please check your input and try again.",',
+    ]
+
+
+def test_write_records_in_jsonl_format(interpreter: MathOperationsInterpreter) -> None:
+    output: io.StringIO = io.StringIO()
+    count: int = write_records(
+        records=BatchProcessor(interpreter=interpreter).process(lines=['x = 2', 'y = (x']),
+        output=output,
+        output_format=OutputFormatsEnum.JSONL
+    )
+
+    assert count == 2
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == [
+        {'line': 1, 'variable': 'x', 'value': 2.0},
+        {
+            'line': 2,
+            'error': 'ExpressionSyntaxError',
+            'message': 'There is a syntax error in the expression. Please check your input and try again.'
+        },
+    ]
+
+
+def test_write_records_with_not_real_results(interpreter: MathOperationsInterpreter) -> None:
+    output: io.StringIO = io.StringIO()
+    count: int = write_records(
+        records=BatchProcessor(interpreter=interpreter).process(lines=['x = (0-8)^0.5', 'y = sqrt(x)', 'z = 2']),
+        output=output,
+        output_format=OutputFormatsEnum.JSONL
+    )
+
+    assert count == 3
+    assert [json.loads(line).get('error') for line in output.getvalue().splitlines()] == [
+        'MathDomainError',
+        'UndefinedVariableError',
+        None
+    ]
+
+
+def test_thread_pool_evaluator_uses_variables_snapshot(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='x = 3')
+    expressions: List[str] = [f'x * {i} + sqrt(y)' for i in range(100)] + ['1 / 0', 'foo(x)', 'z']
+    records: List[BatchRecord] = ThreadPoolEvaluator(interpreter=interpreter, max_workers=4).evaluate(
+        expressions=expressions,
+        variables={'x': 2, 'y': 16}
+    )
+
+    assert [record.line for record in records] == list(range(1, 104))
+    assert [record.value for record in records[:100]] == [2.0 * i + 4.0 for i in range(100)]
+    assert [record.error for record in records[100:]] == [
+        'CustomZeroDivisionError',
+        'UnknownFunctionError',
+        'UndefinedVariableError',
+    ]
+
+    # Stored variables are used, when variables are not provided:
+    assert ThreadPoolEvaluator(interpreter=interpreter).evaluate(expressions=['x + 1'])[0].value == 4.0
@@ -0,0 +1,92 @@
+import pickle
+from array import array
+
+import pytest
+
+from src.bytecode import Bytecode, BytecodeCompiler, PUSH_CONSTANT, LOAD_VARIABLE, BINARY_OPERATION
+from src.exceptions import CustomZeroDivisionError, UndefinedVariableError, UnknownFunctionError
+from src.expressions import Expression, BinaryOperation, Number
+from src.interpreter import MathOperationsInterpreter
+
+
+def test_compile_bytecode_into_postfix_instructions(interpreter: MathOperationsInterpreter) -> None:
+    bytecode: Bytecode = interpreter.compile_bytecode(expression='x * 2 + x * 2')
+    assert list(bytecode.operation_codes) == [
+        LOAD_VARIABLE, PUSH_CONSTANT, BINARY_OPERATION, LOAD_VARIABLE, PUSH_CONSTANT, BINARY_OPERATION, BINARY_OPERATION
+    ]
+    assert list(bytecode.arguments) == [0, 0, 0, 0, 0, 0, 1]
+    assert bytecode.constants == array('d', [2.0])
+    assert bytecode.variables == ('x',)
+    assert bytecode.operations == ('*', '+')
+    assert bytecode.functions == ()
+
+
+@pytest.mark.parametrize(
+    'expression,variables,expected_result',
+    [
+        ('-(5 - 3) ^ 2', {}, -4.0),
+        ('(x - 5) ^ y / 5', {'x': 7, 'y': 3}, 1.6),
+        ('sqrt(x ^ 2 + y ^ 2) + log(exp(x))', {'x': 3, 'y': 4}, 8.0),
+        ('+-x', {'x': 2}, -2.0),
+    ]
+)
+def test_execute_bytecode(
+        interpreter: MathOperationsInterpreter,
+        expression: str,
+        variables: dict,
+        expected_result: float
+) -> None:
+
+    bytecode: Bytecode = interpreter.compile_bytecode(expression=expression)
+    assert interpreter.execute_bytecode(bytecode=bytecode, variables=variables) == expected_result
+
+
+def test_compile_bytecode_keeps_signs_of_zeros() -> None:
+    tree: BinaryOperation = BinaryOperation(
+        operation='-',
+        left=Number(value=0.0),
+        right=BinaryOperation(operation='*', left=Number(value=-0.0), right=Number(value=0.0))
+    )
+    bytecode: Bytecode = BytecodeCompiler().compile(node=tree)
+    assert [str(value) for value in bytecode.constants] == ['0.0', '-0.0']
+    assert list(bytecode.arguments) == [0, 1, 0, 0, 1]
+    assert repr(BytecodeCompiler.decompile(bytecode=bytecode)) == repr(tree)  # Representation shows signs of zeros
+
+
+def test_execute_bytecode_with_user_variables(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='x = 3')
+    bytecode: Bytecode = interpreter.compile_bytecode(expression='x + 1')
+    assert interpreter.execute_bytecode(bytecode=bytecode) == 4.0
+    assert interpreter.execute_bytecode(bytecode=bytecode, variables={'x': 1}) == 2.0
+
+
+def test_execute_bytecode_errors(interpreter: MathOperationsInterpreter) -> None:
+    with pytest.raises(UndefinedVariableError):
+        interpreter.execute_bytecode(bytecode=interpreter.compile_bytecode(expression='x + 1'))
+
+    with pytest.raises(CustomZeroDivisionError):
+        interpreter.execute_bytecode(bytecode=interpreter.compile_bytecode(expression='1 / x'), variables={'x': 0})
+
+    with pytest.raises(UnknownFunctionError):
+        interpreter.execute_bytecode(bytecode=interpreter.compile_bytecode(expression='foo(1)'))
+
+
+def test_compile_deep_tree_into_bytecode(interpreter: MathOperationsInterpreter) -> None:
+    depth: int = 100_000
+    node: Expression = Number(value=1.0)
+    for _ in range(depth):
+        node = BinaryOperation(left=node, operation='+', right=Number(value=1.0))
+
+    bytecode: Bytecode = BytecodeCompiler().compile(node=node)
+    assert len(bytecode.operation_codes) == 2 * depth + 1
+    assert interpreter.execute_bytecode(bytecode=bytecode) == depth + 1
+
+
+def test_pickle_bytecode(interpreter: MathOperationsInterpreter) -> None:
+    bytecode: Bytecode = interpreter.compile_bytecode(expression='sqrt(x ^ 2 + y ^ 2) * 2.5 - 1 / x')
+    pickled_bytecode: bytes = pickle.dumps(bytecode)
+    assert len(pickled_bytecode) < 500
+
+    unpickled_bytecode: Bytecode = pickle.loads(pickled_bytecode)
+    assert unpickled_bytecode == bytecode
+    assert interpreter.execute_bytecode(bytecode=unpickled_bytecode, variables={'x': 4, 'y': 3}) == 12.25
@@ -0,0 +1,79 @@
+import math
+from typing import List
+
+import pytest
+
+from src.cache import LRUCache, CacheInfo, memoize
+
+
+def test_lru_cache_get_and_put() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    assert cache.get(key='a') is None
+
+    cache.put(key='a', value=1)
+    assert cache.get(key='a') == 1
+    assert cache.info() == CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+
+
+def test_lru_cache_evicts_least_recently_used_entry() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put(key='a', value=1)
+    cache.put(key='b', value=2)
+    cache.get(key='a')  # "b" becomes the least recently used entry
+    cache.put(key='c', value=3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_with_zero_size() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=0)
+    cache.put(key='a', value=1)
+    assert cache.get(key='a') is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_with_negative_size() -> None:
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
+
+
+def test_lru_cache_hit_rate() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=1)
+    assert cache.info().hit_rate == 0.0
+
+    cache.put(key='a', value=1)
+    cache.get(key='a')
+    cache.get(key='b')
+    assert cache.info().hit_rate == 0.5
+
+
+def test_memoize() -> None:
+    calls: List[float] = []
+
+    def square(value: float) -> float:
+        calls.append(value)
+        return value * value
+
+    memoized_square, get_info = memoize(function=square, maxsize=1)
+    assert [memoized_square(2.0), memoized_square(2.0), memoized_square(3.0), memoized_square(2.0)] == [4, 4, 9, 4]
+    assert calls == [2.0, 3.0, 2.0]
+    assert get_info() == CacheInfo(hits=1, misses=3, maxsize=1, currsize=1)
+
+
+def test_memoize_keeps_signs_of_zeros() -> None:
+    memoized_sign, get_info = memoize(function=lambda value: math.copysign(1.0, value), maxsize=2)
+    assert [memoized_sign(0.0), memoized_sign(-0.0), memoized_sign(-0.0)] == [1.0, -1.0, -1.0]
+    assert get_info() == CacheInfo(hits=1, misses=2, maxsize=2, currsize=2)
+
+
+def test_memoize_with_zero_size() -> None:
+    with pytest.raises(ValueError):
+        memoize(function=lambda value: value, maxsize=0)
+
+
+def test_memoize_c_function() -> None:
+    with pytest.raises(ValueError):
+        memoize(function=math.sqrt, maxsize=2)
@@ -0,0 +1,45 @@
+from typing import Type
+
+import pytest
+
+from src.commands import BaseCommand, MathCommand
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.exceptions import CustomZeroDivisionError, MathDomainError
+
+
+@pytest.mark.parametrize('command', BASE_COMMANDS.values())
+@pytest.mark.parametrize('a, b', [(3.0, 2.0), (-1.5, 4.0), (0.1, 0.7)])
+def test_base_command_as_function(command: Type[BaseCommand], a: float, b: float) -> None:
+    assert command.as_function()(a, b) == command(a=a, b=b).execute()
+
+
+@pytest.mark.parametrize('command', MATH_COMMANDS.values())
+@pytest.mark.parametrize('value', [0.5, 1.0, 2.25])
+def test_math_command_as_function(command: Type[MathCommand], value: float) -> None:
+    assert command.as_function()(value) == command(value=value).execute()
+
+
+def test_divide_command_as_function_by_zero() -> None:
+    with pytest.raises(CustomZeroDivisionError):
+        BASE_COMMANDS['/'].as_function()(1.0, 0.0)
+
+
+def test_command_as_function_by_default() -> None:
+    class ModuloCommand(BaseCommand):
+
+        def execute(self) -> float:
+            return self._a % self._b
+
+    class DoubleCommand(MathCommand):
+
+        def execute(self) -> float:
+            return self._value * 2
+
+    assert ModuloCommand.as_function()(7.0, 4.0) == 3.0
+    assert DoubleCommand.as_function()(2.5) == 5.0
+
+
+@pytest.mark.parametrize('a, b, error', [(-8.0, 0.5, MathDomainError), (0.0, -1.0, CustomZeroDivisionError)])
+def test_exponential_command_as_function_with_not_real_result(a: float, b: float, error: Type[Exception]) -> None:
+    with pytest.raises(error):
+        BASE_COMMANDS['^'].as_function()(a, b)
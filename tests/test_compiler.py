@@ -0,0 +1,81 @@
+import pytest
+
+from src.compiler import CompiledExpression
+from src.exceptions import (
+    CustomZeroDivisionError,
+    ExpressionSyntaxError,
+    ExpressionTooDeepError,
+    UndefinedVariableError,
+    UnknownFunctionError
+)
+from src.expressions import BinaryOperation, Expression, FunctionCall, UnaryOperation, Variable
+from src.interpreter import MathOperationsInterpreter
+
+
+def test_compile_expression_without_variables(interpreter: MathOperationsInterpreter) -> None:
+    compiled_expression: CompiledExpression = interpreter.compile(expression='-(5 - 3) ^ 2')
+    assert compiled_expression.variables == frozenset()
+    assert compiled_expression() == -4.0
+
+
+def test_compile_expression_with_variables(interpreter: MathOperationsInterpreter) -> None:
+    compiled_expression: CompiledExpression = interpreter.compile(expression='(x - 5) ^ y / 5')
+    assert compiled_expression.variables == frozenset({'x', 'y'})
+    assert compiled_expression(x=10, y=2) == 5.0
+    assert compiled_expression.evaluate(variables={'x': 7, 'y': 3}) == 1.6
+
+
+def test_compiled_expression_does_not_use_user_variables(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='x = 3')
+    compiled_expression: CompiledExpression = interpreter.compile(expression='x + 1')
+    assert compiled_expression(x=1) == 2.0
+
+    with pytest.raises(UndefinedVariableError):
+        compiled_expression()
+
+
+def test_compiled_expression_division_by_zero(interpreter: MathOperationsInterpreter) -> None:
+    compiled_expression: CompiledExpression = interpreter.compile(expression='1 / x')
+    assert compiled_expression(x=4) == 0.25
+
+    with pytest.raises(CustomZeroDivisionError):
+        compiled_expression(x=0)
+
+
+def test_compile_expression_with_syntax_error(interpreter: MathOperationsInterpreter) -> None:
+    with pytest.raises(ExpressionSyntaxError):
+        interpreter.compile(expression='(x + 2')
+
+
+def test_compile_expression_with_math_functions(interpreter: MathOperationsInterpreter) -> None:
+    compiled_expression: CompiledExpression = interpreter.compile(expression='sqrt(x ^ 2 + y ^ 2) + log(exp(x))')
+    assert compiled_expression(x=3, y=4) == 8.0
+
+
+def test_compile_expression_with_unknown_function(interpreter: MathOperationsInterpreter) -> None:
+    with pytest.raises(UnknownFunctionError):
+        interpreter.compile(expression='foo(x)')
+
+    with pytest.raises(UnknownFunctionError) as error:
+        interpreter.compile(expression='sqrt(1 + foo(bar(x)))')
+
+    assert str(error.value) == str(UnknownFunctionError(name='foo'))
+
+
+def test_compile_deep_expression(interpreter: MathOperationsInterpreter) -> None:
+    node: Expression = Variable(name='x')
+    for _ in range(10_000):
+        node = BinaryOperation(
+            left=UnaryOperation(operation='-', expression=node),
+            operation='+',
+            right=FunctionCall(name='sqrt', argument=Variable(name='x'))
+        )
+
+    compiled_expression: CompiledExpression = interpreter._compiler.compile(node=node)
+    assert compiled_expression.variables == {'x'}
+
+    with pytest.raises(ExpressionTooDeepError):
+        compiled_expression(x=4)
+
+    with pytest.raises(ExpressionTooDeepError):
+        compiled_expression.evaluate(variables={'x': 4})
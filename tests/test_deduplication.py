@@ -0,0 +1,89 @@
+import math
+from typing import Callable, List
+
+from src.commands import SqrtCommand
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.deduplication import DeduplicationStatistics, ExpressionDeduplicator
+from src.expressions import TreeNode, BinaryOperation, Number
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.precedence_parser import PrecedenceParser
+from src.tokens_parser import TokensParser
+
+
+def test_deduplicator_merges_identical_subtrees(interpreter: MathOperationsInterpreter) -> None:
+    tree: TreeNode = interpreter._parse(expression='sqrt(a ^ 2 + b ^ 2) / sqrt(a ^ 2 + b ^ 2)')
+    deduplicator: ExpressionDeduplicator = ExpressionDeduplicator()
+
+    deduplicated_tree: TreeNode = deduplicator.deduplicate(node=tree)
+    assert deduplicated_tree == tree
+    assert isinstance(deduplicated_tree, BinaryOperation)
+    assert deduplicated_tree.left is deduplicated_tree.right
+
+    # Source tree is not modified:
+    assert isinstance(tree, BinaryOperation)
+    assert tree.left is not tree.right
+
+    statistics: DeduplicationStatistics = deduplicator.get_statistics()
+    assert (statistics.nodes, statistics.unique_nodes, statistics.deduplicated_nodes) == (17, 8, 9)
+
+    deduplicator.reset_statistics()
+    assert deduplicator.get_statistics() == DeduplicationStatistics()
+
+
+def test_deduplicator_keeps_different_subtrees(interpreter: MathOperationsInterpreter) -> None:
+    tree: TreeNode = interpreter._parse(expression='(x - y) + (y - x) + -x + sin(x) + cos(x) + 2 + 2.0')
+    deduplicator: ExpressionDeduplicator = ExpressionDeduplicator()
+
+    assert deduplicator.deduplicate(node=tree) == tree
+    assert deduplicator.get_statistics().deduplicated_nodes == 6  # Only leaves "x", "y" and "2" are repeated
+
+    # Negative zero is not replaced with zero, so signs of results are kept:
+    zeros: BinaryOperation = BinaryOperation(operation='+', left=Number(value=0.0), right=Number(value=-0.0))
+    deduplicated_zeros: TreeNode = deduplicator.deduplicate(node=zeros)
+    assert isinstance(deduplicated_zeros, BinaryOperation)
+    assert deduplicated_zeros.left is not deduplicated_zeros.right
+
+
+def test_deduplicator_processes_deep_trees(precedence_parser: PrecedenceParser) -> None:
+    depth: int = 20_000
+    tree: TreeNode = precedence_parser.parse(
+        tokens=LexicalProcessor().process_expression(expression='(1 + ' * depth + '1' + ')' * depth)
+    )
+
+    deduplicator: ExpressionDeduplicator = ExpressionDeduplicator()
+    deduplicator.deduplicate(node=tree)
+    assert deduplicator.get_statistics().unique_nodes == depth + 1
+
+
+def test_interpreter_calculates_shared_subtrees_once() -> None:
+    calls: List[float] = []
+
+    class CountingSqrtCommand(SqrtCommand):
+
+        @classmethod
+        def as_function(cls) -> Callable[[float], float]:
+            def counting_sqrt(value: float) -> float:
+                calls.append(value)
+                return math.sqrt(value)
+
+            return counting_sqrt
+
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS | {'sqrt': CountingSqrtCommand},
+        parser=TokensParser(),
+        lexical_processor=LexicalProcessor(),
+        deduplicate_expressions=True
+    )
+    interpreter.interpret(user_input='a = 3')
+    interpreter.interpret(user_input='b = 4')
+    interpreter.interpret(user_input='c = sqrt(a^2 + b^2) * 2 - sqrt(a^2 + b^2) / sqrt(a^2 + b^2)')
+
+    assert interpreter.get_variables()['c'] == 9.0
+    assert calls == [25.0]
+    assert interpreter.get_deduplication_statistics().deduplicated_nodes == 18
+
+    interpreter.interpret(user_input='a = 6')
+    interpreter.interpret(user_input='c = sqrt(a^2 + b^2) * 2 - sqrt(a^2 + b^2) / sqrt(a^2 + b^2)')
+    assert calls == [25.0, 52.0]
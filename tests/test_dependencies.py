@@ -0,0 +1,61 @@
+from typing import List
+
+import pytest
+
+from src.dependencies import DependencyGraph, find_variables
+from src.exceptions import CircularDependencyError
+from src.expressions import BinaryOperation, UnaryOperation, FunctionCall, Number, Variable
+
+
+def test_find_variables() -> None:
+    tree: BinaryOperation = BinaryOperation(
+        left=UnaryOperation(operation='-', expression=Variable(name='x')),
+        operation='*',
+        right=FunctionCall(
+            name='sqrt',
+            argument=BinaryOperation(left=Variable(name='y'), operation='+', right=Number(value=1.0))
+        )
+    )
+
+    assert find_variables(node=tree) == {'x', 'y'}
+
+
+def test_dependency_graph_get_dependents_in_topological_order() -> None:
+    graph: DependencyGraph = DependencyGraph()
+    graph.set_dependencies(variable='z', dependencies={'x', 'y'})
+    graph.set_dependencies(variable='y', dependencies={'x'})
+    graph.set_dependencies(variable='w', dependencies={'z'})
+    graph.set_dependencies(variable='v', dependencies={'u'})
+
+    dependents: List[str] = graph.get_dependents(variable='x')
+    assert dependents == ['y', 'z', 'w']
+    assert graph.get_dependents(variable='z') == ['w']
+    assert graph.get_dependents(variable='w') == []
+
+
+def test_dependency_graph_replaces_dependencies() -> None:
+    graph: DependencyGraph = DependencyGraph()
+    graph.set_dependencies(variable='y', dependencies={'x'})
+    graph.set_dependencies(variable='y', dependencies=set())
+    assert graph.get_dependents(variable='x') == []
+
+
+def test_dependency_graph_circular_dependency() -> None:
+    graph: DependencyGraph = DependencyGraph()
+    graph.set_dependencies(variable='y', dependencies={'x'})
+    graph.set_dependencies(variable='z', dependencies={'y'})
+
+    with pytest.raises(CircularDependencyError):
+        graph.set_dependencies(variable='x', dependencies={'z'})
+
+    with pytest.raises(CircularDependencyError):
+        graph.set_dependencies(variable='x', dependencies={'x'})
+
+    assert graph.get_dependents(variable='x') == ['y', 'z']
+
+
+def test_dependency_graph_clear() -> None:
+    graph: DependencyGraph = DependencyGraph()
+    graph.set_dependencies(variable='y', dependencies={'x'})
+    graph.clear()
+    assert graph.get_dependents(variable='x') == []
@@ -0,0 +1,35 @@
+import math
+from typing import Dict, List
+
+import pytest
+
+from benchmarks.generator import ExpressionGenerator, ExpressionShape, generate_variables
+from benchmarks.suite import CURVES
+from src.interpreter import MathOperationsInterpreter
+
+
+# All shapes of the benchmark suite without repeats:
+SHAPES: List[ExpressionShape] = list(dict.fromkeys(shape for shapes in CURVES.values() for shape in shapes))
+
+
+@pytest.mark.parametrize('seed', [0, 1, 42])
+@pytest.mark.parametrize('shape', SHAPES, ids=str)
+def test_generated_expressions_are_evaluated(
+        interpreter: MathOperationsInterpreter,
+        seed: int,
+        shape: ExpressionShape
+) -> None:
+
+    variables: Dict[str, float] = generate_variables(count=shape.variables)
+    for name, value in variables.items():
+        interpreter.assign(user_input=f'{name} = {value}')
+
+    expression: str = ExpressionGenerator(seed=seed).generate(shape=shape)
+    assert math.isfinite(interpreter.assign(user_input=f'target = {expression}')[1])
+
+
+@pytest.mark.parametrize('shape', SHAPES, ids=str)
+def test_generated_expressions_depend_only_on_seed(shape: ExpressionShape) -> None:
+    expressions: List[str] = [ExpressionGenerator(seed=seed).generate(shape=shape) for seed in (0, 0, 1)]
+    assert expressions[0] == expressions[1]
+    assert expressions[0] != expressions[2]
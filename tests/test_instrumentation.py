@@ -0,0 +1,108 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from src.exceptions import CustomZeroDivisionError, ExpressionSyntaxError
+from src.expressions import BinaryOperation, FunctionCall, Number, Variable, get_node_children
+from src.instrumentation import Instrumentation, InstrumentationEvent, count_nodes
+from src.interpreter import MathOperationsInterpreter
+
+
+def test_instrumentation_records_stages_and_counters(interpreter: MathOperationsInterpreter) -> None:
+    instrumentation: Instrumentation = Instrumentation()
+    interpreter.set_instrumentation(instrumentation=instrumentation)
+
+    interpreter.interpret(user_input='x = 2 + sqrt(4)')
+    interpreter.interpret(user_input='y = 2  +  sqrt(4)')  # Tree of the same normalized expression is cached
+
+    snapshot: Dict[str, Any] = instrumentation.snapshot()
+    assert {stage: timings['calls'] for stage, timings in snapshot['stages'].items()} == {
+        'validation': 2,
+        'normalization': 2,
+        'lexing': 1,
+        'parsing': 1,
+        'evaluation': 2,
+    }
+    assert all(timings['total_seconds'] >= timings['max_seconds'] >= 0 for timings in snapshot['stages'].values())
+    assert snapshot['counters'] == {'assignments': 2, 'tokens': 7, 'nodes': 4}
+    assert snapshot['errors'] == {}
+    assert snapshot['caches']['parse']['hits'] == 1
+    assert snapshot['caches']['parse']['hit_rate'] == 0.5
+
+
+def test_instrumentation_counts_errors_by_type(interpreter: MathOperationsInterpreter) -> None:
+    instrumentation: Instrumentation = Instrumentation()
+    interpreter.set_instrumentation(instrumentation=instrumentation)
+
+    for user_input in ['x = 1 / 0', 'y = 2 / 0', 'z = (1', 'z = w', '1 = 2']:
+        interpreter.interpret(user_input=user_input)
+
+    with pytest.raises(CustomZeroDivisionError):
+        interpreter.assign(user_input='x = 1 / 0')
+
+    assert instrumentation.snapshot()['errors'] == {
+        'CustomZeroDivisionError': 3,
+        'ExpressionSyntaxError': 1,
+        'UndefinedVariableError': 1,
+        'IncorrectVariableAssignmentError': 1,
+    }
+    assert 'assignments' not in instrumentation.snapshot()['counters']
+
+
+def test_instrumentation_passes_events_to_callback(interpreter: MathOperationsInterpreter) -> None:
+    events: List[InstrumentationEvent] = []
+    interpreter.set_instrumentation(instrumentation=Instrumentation(callback=events.append))
+
+    interpreter.interpret(user_input='x = 1 / 0')
+    assert [(event.kind, event.name) for event in events] == [
+        ('stage', 'validation'),
+        ('stage', 'normalization'),
+        ('stage', 'lexing'),
+        ('counter', 'tokens'),
+        ('stage', 'parsing'),
+        ('counter', 'nodes'),
+        ('stage', 'evaluation'),
+        ('error', 'CustomZeroDivisionError'),
+    ]
+    assert [event.value for event in events if event.kind == 'counter'] == [4, 3]
+
+
+def test_instrumentation_counts_errors_of_compilation(interpreter: MathOperationsInterpreter) -> None:
+    instrumentation: Instrumentation = Instrumentation()
+    interpreter.set_instrumentation(instrumentation=instrumentation)
+
+    with pytest.raises(ExpressionSyntaxError):
+        interpreter.compile(expression='x * (2')
+
+    with pytest.raises(ExpressionSyntaxError):
+        interpreter.compile_bytecode(expression='x +')
+
+    interpreter.compile(expression='x * 2')
+    snapshot: Dict[str, Any] = instrumentation.snapshot()
+    assert snapshot['errors'] == {'ExpressionSyntaxError': 2}
+    assert snapshot['stages']['parsing']['calls'] == 3
+
+
+def test_disabled_instrumentation_collects_nothing(interpreter: MathOperationsInterpreter) -> None:
+    instrumentation: Instrumentation = Instrumentation()
+    interpreter.set_instrumentation(instrumentation=instrumentation)
+    interpreter.interpret(user_input='x = 2')
+    interpreter.set_instrumentation(instrumentation=None)
+    interpreter.interpret(user_input='y = x * 3')
+
+    assert interpreter.get_variables() == {'x': 2.0, 'y': 6.0}
+    assert instrumentation.snapshot()['counters']['assignments'] == 1
+
+    instrumentation.reset()
+    assert instrumentation.snapshot()['stages'] == {}
+
+
+def test_count_nodes(interpreter: MathOperationsInterpreter) -> None:
+    assert count_nodes(node=interpreter._parse(expression='-sin(x) + 2 * 3')) == 7
+
+
+def test_get_node_children() -> None:
+    argument: BinaryOperation = BinaryOperation(operation='-', left=Variable(name='x'), right=Number(value=1))
+    assert get_node_children(node=FunctionCall(name='sin', argument=argument)) == (argument,)
+    assert get_node_children(node=argument) == (Variable(name='x'), Number(value=1))
+    assert get_node_children(node=Number(value=1)) == ()
@@ -1,19 +1,34 @@
+from typing import Type
+
 import pytest
 
-from src.config import OPERATIONS
+from src.cache import CacheInfo
+from src.commands import MathCommand
+from src.config import OPERATIONS, BASE_COMMANDS, MATH_COMMANDS
 from src.enums import TokenTypesEnum
 from src.exceptions import (
     IncorrectVariableAssignmentError,
     ExpressionSyntaxError,
-    UnknownExpressionTypeError
+    UnknownExpressionTypeError,
+    UndefinedVariableError,
+    UnknownFunctionError,
+    CircularDependencyError,
+    CustomZeroDivisionError,
+    MathDomainError
 )
 from src.expressions import (
+    TreeNode,
     Expression,
     Number,
     BinaryOperation,
-    UnaryOperation
+    UnaryOperation,
+    Variable,
+    FunctionCall
 )
+from src.instrumentation import Instrumentation
 from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.tokens_parser import TokensParser
 
 
 def test_base_add(interpreter: MathOperationsInterpreter) -> None:
@@ -185,39 +200,74 @@ def test_validate_user_input_variable_is_numeric(interpreter: MathOperationsInte
         interpreter._validate_user_input(user_input='3 = 2')
 
 
-def test_substitute_user_variables(interpreter: MathOperationsInterpreter) -> None:
-    interpreter.interpret(user_input='x = 2 + 3')
-    expression = interpreter._substitute_user_variables(expression='result = x + 2')
-    assert expression == 'result = 5.0 + 2'
+def test_variables_with_common_prefix(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='x = 2')
+    interpreter.interpret(user_input='xx = 3')
+    interpreter.interpret(user_input='result = xx * 10 + x')
+    assert interpreter.get_result() == 32.0
 
 
-def test_extract_expression_from_parentless(interpreter: MathOperationsInterpreter) -> None:
-    assert interpreter._extract_expression_from_parentless(expression='(x + 2) - 4') == ('x + 2', ' - 4')
+def test_variables_keep_full_precision(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='x = 1 / 3')
+    interpreter.interpret(user_input='result = x * 3 - 1')
+    assert interpreter.get_result() == (1 / 3) * 3 - 1
 
 
-def test_extract_expression_from_parentless_with_no_parentless(interpreter: MathOperationsInterpreter) -> None:
-    with pytest.raises(ExpressionSyntaxError):
-        interpreter._extract_expression_from_parentless(expression='x * 5 -2')
+def test_reassigned_variable_reuses_parsed_expression(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='x = 1')
+    interpreter.interpret(user_input='y = x + 1')
+    interpreter.interpret(user_input='x = 5')
+    interpreter.interpret(user_input='y = x + 1')
+    assert interpreter._user_variables['y'] == 6.0
+    assert interpreter.get_parse_cache_info().hits == 1
 
 
-def test_extract_expression_from_parentless_with_only_left_parentless(interpreter: MathOperationsInterpreter) -> None:
-    with pytest.raises(ExpressionSyntaxError):
-        interpreter._extract_expression_from_parentless(expression='(x * 5 -2')
+def test_undefined_variable(interpreter: MathOperationsInterpreter, capsys: pytest.CaptureFixture[str]) -> None:
+    interpreter.interpret(user_input='result = y + 1')
+    assert capsys.readouterr().out == str(UndefinedVariableError(name='y')) + '\n'
+    assert interpreter.get_result() is None
 
 
-def test_extract_expression_from_parentless_with_only_right_parentless(interpreter: MathOperationsInterpreter) -> None:
-    with pytest.raises(ExpressionSyntaxError):
-        interpreter._extract_expression_from_parentless(expression='x * 5) -2')
+@pytest.mark.parametrize('user_input', ['x = sqrt(0-1)', 'x = log(0)', 'x = sin(10 ^ 300 * 10 ^ 300)'])
+def test_math_domain_errors(
+        interpreter: MathOperationsInterpreter,
+        capsys: pytest.CaptureFixture[str],
+        user_input: str
+) -> None:
+
+    interpreter.interpret(user_input=user_input)
+    assert capsys.readouterr().out == str(MathDomainError()) + '\n'
+
+
+def test_repeated_math_operations(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='result = sqrt(4) + sqrt(9) * sqrt(16)')
+    assert interpreter.get_result() == 14.0
+
+
+def test_nested_math_operations(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='result = sqrt(sqrt(exp(log(16))) + 5)')
+    assert interpreter.get_result() == 3.0
+
 
+def test_math_operations_with_variable_containing_function_name(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='cost = 4')
+    interpreter.interpret(user_input='result = sqrt(cost) + cost')
+    assert interpreter.get_result() == 6.0
 
-def test_execute_math_operations(interpreter: MathOperationsInterpreter) -> None:
-    expression: str = interpreter._execute_math_operations(expression='sqrt(25)')
-    assert expression == '5.0'
 
+def test_math_operations_are_parsed_once(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='result = sin(0) + sin(0) + cos(0)')
+    assert interpreter.get_parse_cache_info().misses == 1
 
-def test_execute_math_operations_incorrect_syntax(interpreter: MathOperationsInterpreter) -> None:
+
+def test_math_operations_incorrect_syntax(interpreter: MathOperationsInterpreter) -> None:
     with pytest.raises(ExpressionSyntaxError):
-        interpreter._execute_math_operations(expression='sin28')
+        interpreter._execute(expression='sin28')
+
+
+def test_unknown_math_operation(interpreter: MathOperationsInterpreter) -> None:
+    with pytest.raises(UnknownFunctionError):
+        interpreter._execute(expression='foo(28)')
 
 
 def test_calculate_binary_node_value(interpreter: MathOperationsInterpreter) -> None:
@@ -254,6 +304,17 @@ def test_calculate_minus_unary_node_value(interpreter: MathOperationsInterpreter
     assert value == -3.0
 
 
+def test_calculate_function_call_node_value(interpreter: MathOperationsInterpreter) -> None:
+    value: float = interpreter._calculate_node_value(
+        node=FunctionCall(
+            name='sqrt',
+            argument=Number(25)
+        )
+    )
+
+    assert value == 5.0
+
+
 def test_calculate_number_node_value(interpreter: MathOperationsInterpreter) -> None:
     value: float = interpreter._calculate_node_value(
         node=Number(value=5)
@@ -265,3 +326,238 @@ def test_calculate_number_node_value(interpreter: MathOperationsInterpreter) ->
 def test_calculate_node_value_with_incorrect_node_type(interpreter: MathOperationsInterpreter) -> None:
     with pytest.raises(UnknownExpressionTypeError):
         interpreter._calculate_node_value(node=Expression())
+
+
+def test_calculate_variable_node_value(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='x = 2 ^ 3')
+    assert interpreter._calculate_node_value(node=Variable(name='x')) == 8.0
+
+
+def test_calculate_undefined_variable_node_value(interpreter: MathOperationsInterpreter) -> None:
+    with pytest.raises(UndefinedVariableError):
+        interpreter._calculate_node_value(node=Variable(name='x'))
+
+
+def test_normalize_expression(interpreter: MathOperationsInterpreter) -> None:
+    assert interpreter._normalize_expression(expression=' 2 +  3 * (x  y) ') == '2+3*(x y)'
+    assert interpreter._normalize_expression(expression='2 .5') == '2 .5'
+
+
+def test_parse_cache_shares_entries_for_normalized_expressions(interpreter: MathOperationsInterpreter) -> None:
+    first_tree: TreeNode = interpreter._parse(expression='2+3')
+    second_tree: TreeNode = interpreter._parse(expression='2 +  3')
+    assert first_tree is second_tree
+    assert interpreter.get_parse_cache_info() == CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+
+
+def test_parse_cache_is_bounded(
+        lexical_processor: LexicalProcessor,
+        tokens_parser: TokensParser
+) -> None:
+
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=tokens_parser,
+        lexical_processor=lexical_processor,
+        parse_cache_size=2
+    )
+
+    # "2" is the least recently used expression, when "3" is parsed, so it is evicted:
+    for user_input in ('x = 1', 'y = 2', 'z = 1', 'u = 3', 'v = 2'):
+        interpreter.interpret(user_input=user_input)
+
+    assert interpreter.get_parse_cache_info() == CacheInfo(hits=1, misses=4, maxsize=2, currsize=2)
+
+
+def test_parse_errors_are_not_cached(interpreter: MathOperationsInterpreter) -> None:
+    with pytest.raises(ExpressionSyntaxError):
+        interpreter._parse(expression='(2 + 3')
+
+    assert interpreter.get_parse_cache_info().currsize == 0
+
+
+@pytest.fixture
+def recomputing_interpreter(
+        lexical_processor: LexicalProcessor,
+        tokens_parser: TokensParser
+) -> MathOperationsInterpreter:
+
+    return MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=tokens_parser,
+        lexical_processor=lexical_processor,
+        recompute_dependents=True
+    )
+
+
+def test_reassigned_variable_does_not_recompute_dependents_by_default(interpreter: MathOperationsInterpreter) -> None:
+    interpreter.interpret(user_input='x = 1')
+    interpreter.interpret(user_input='y = x + 1')
+    interpreter.interpret(user_input='x = 5')
+    assert interpreter._user_variables['y'] == 2.0
+
+
+def test_reassigned_variable_recomputes_dependents(recomputing_interpreter: MathOperationsInterpreter) -> None:
+    recomputing_interpreter.interpret(user_input='x = 1')
+    recomputing_interpreter.interpret(user_input='y = x * 2')
+    recomputing_interpreter.interpret(user_input='z = sqrt(x + y + 5)')
+    recomputing_interpreter.interpret(user_input='w = 10')
+    assert recomputing_interpreter._user_variables == {'x': 1.0, 'y': 2.0, 'z': 2.8284271247461903, 'w': 10.0}
+
+    recomputing_interpreter.interpret(user_input='x = 2')
+    assert recomputing_interpreter._user_variables == {'x': 2.0, 'y': 4.0, 'z': 3.3166247903554, 'w': 10.0}
+
+    recomputing_interpreter.interpret(user_input='y = 0')  # "y" does not depend on "x" anymore
+    recomputing_interpreter.interpret(user_input='x = 4')
+    assert recomputing_interpreter._user_variables == {'x': 4.0, 'y': 0.0, 'z': 3.0, 'w': 10.0}
+
+
+def test_self_referencing_variable_is_not_recomputed(recomputing_interpreter: MathOperationsInterpreter) -> None:
+    recomputing_interpreter.interpret(user_input='x = 1')
+    recomputing_interpreter.interpret(user_input='y = 2')
+    recomputing_interpreter.interpret(user_input='x = x + y')
+    recomputing_interpreter.interpret(user_input='y = 3')
+    assert recomputing_interpreter._user_variables == {'x': 3.0, 'y': 3.0}
+
+
+def test_circular_dependency(
+        recomputing_interpreter: MathOperationsInterpreter,
+        capsys: pytest.CaptureFixture[str]
+) -> None:
+
+    recomputing_interpreter.interpret(user_input='x = 1')
+    recomputing_interpreter.interpret(user_input='y = x + 1')
+    recomputing_interpreter.interpret(user_input='x = y * 2')
+    assert capsys.readouterr().out == str(CircularDependencyError(name='x')) + '\n'
+    assert recomputing_interpreter._user_variables == {'x': 1.0, 'y': 2.0}
+
+
+def test_failed_recomputation_restores_variables(
+        recomputing_interpreter: MathOperationsInterpreter,
+        capsys: pytest.CaptureFixture[str]
+) -> None:
+
+    recomputing_interpreter.interpret(user_input='a = 1')
+    recomputing_interpreter.interpret(user_input='x = a')
+    recomputing_interpreter.interpret(user_input='y = x * 3')
+    recomputing_interpreter.interpret(user_input='z = 1 / y')
+    recomputing_interpreter.interpret(user_input='x = a - 1')
+    assert capsys.readouterr().out == str(CustomZeroDivisionError()) + '\n'
+    assert recomputing_interpreter._user_variables == {'a': 1.0, 'x': 1.0, 'y': 3.0, 'z': 1 / 3}
+
+    # Failed assignment doesn't change dependencies, so "x" still depends only on "a":
+    recomputing_interpreter.interpret(user_input='a = 2')
+    assert recomputing_interpreter._user_variables == {'a': 2.0, 'x': 2.0, 'y': 6.0, 'z': 1 / 6}
+
+
+def test_dependencies_are_cleared_after_getting_result(recomputing_interpreter: MathOperationsInterpreter) -> None:
+    recomputing_interpreter.interpret(user_input='x = 1')
+    recomputing_interpreter.interpret(user_input='result = x + 1')
+    assert recomputing_interpreter.get_result() == 2.0
+
+    recomputing_interpreter.interpret(user_input='x = 3')
+    assert recomputing_interpreter._user_variables == {'x': 3.0}
+
+
+def test_calculate_deep_node_value(interpreter: MathOperationsInterpreter) -> None:
+    node: Expression = Number(value=1.0)
+    for _ in range(100_000):
+        node = BinaryOperation(
+            left=UnaryOperation(operation='-', expression=node),
+            operation='+',
+            right=FunctionCall(name='sqrt', argument=Number(value=4.0))
+        )
+
+    assert interpreter._calculate_node_value(node=node) == 1.0
+
+
+@pytest.mark.parametrize(
+    'expression',
+    ['-(5 - 3) ^ 2', 'sqrt((4 - 2) ^ (18 / 3 - 2)) - x', '2 ^ -x / 5 * 2 + -x ^ 3', 'sin(cos(x)) * exp(-x)']
+)
+def test_calculate_node_value_iteratively(interpreter: MathOperationsInterpreter, expression: str) -> None:
+    interpreter.interpret(user_input='x = 1.5')
+    node: TreeNode = interpreter._parse(expression=expression)
+    assert interpreter._calculate_node_value_iteratively(node=node) == interpreter._calculate_node_value(node=node)
+
+
+@pytest.mark.parametrize(
+    'expression, error',
+    [('x + 1 / 0', UndefinedVariableError), ('1 / 0 + x', CustomZeroDivisionError), ('foo(x)', UnknownFunctionError)]
+)
+def test_calculate_node_value_iteratively_raises_errors_from_left_to_right(
+        interpreter: MathOperationsInterpreter,
+        expression: str,
+        error: Type[Exception]
+) -> None:
+
+    node: TreeNode = interpreter._parse(expression=expression)
+    with pytest.raises(error):
+        interpreter._calculate_node_value_recursively(node=node)
+
+    with pytest.raises(error):
+        interpreter._calculate_node_value_iteratively(node=node)
+
+
+def test_calculate_node_value_iteratively_with_incorrect_node_type(interpreter: MathOperationsInterpreter) -> None:
+    with pytest.raises(UnknownExpressionTypeError):
+        interpreter._calculate_node_value_iteratively(node=Expression())
+
+
+class FactorialCommand(MathCommand):
+
+    def execute(self) -> float:
+        result: float = 1.0
+        for factor in range(2, int(self._value) + 1):
+            result *= factor
+
+        return result
+
+
+def test_memoized_functions(lexical_processor: LexicalProcessor, tokens_parser: TokensParser) -> None:
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands={**MATH_COMMANDS, 'factorial': FactorialCommand},
+        parser=tokens_parser,
+        lexical_processor=lexical_processor,
+        memoized_functions={'factorial': 2}
+    )
+    instrumentation: Instrumentation = Instrumentation()
+    interpreter.set_instrumentation(instrumentation=instrumentation)
+
+    interpreter.interpret(user_input='result = factorial(4) + factorial(4) + cos(0)')
+    assert interpreter.get_result() == 49.0
+    assert interpreter.get_function_cache_info() == {
+        'factorial': CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+    }
+    assert instrumentation.snapshot()['caches']['function.factorial']['hit_rate'] == 0.5
+
+
+@pytest.mark.parametrize('name', list(MATH_COMMANDS))
+def test_cheap_functions_are_not_memoized(
+        lexical_processor: LexicalProcessor,
+        tokens_parser: TokensParser,
+        name: str
+) -> None:
+
+    with pytest.raises(ValueError):
+        MathOperationsInterpreter(
+            interpreter_base_commands=BASE_COMMANDS,
+            interpreter_math_commands=MATH_COMMANDS,
+            parser=tokens_parser,
+            lexical_processor=lexical_processor,
+            memoized_functions={name: 2}
+        )
+
+
+def test_memoized_unknown_function(lexical_processor: LexicalProcessor, tokens_parser: TokensParser) -> None:
+    with pytest.raises(UnknownFunctionError):
+        MathOperationsInterpreter(
+            interpreter_base_commands=BASE_COMMANDS,
+            interpreter_math_commands=MATH_COMMANDS,
+            parser=tokens_parser,
+            lexical_processor=lexical_processor,
+            memoized_functions={'foo': 2}
+        )
@@ -1,10 +1,13 @@
-from typing import List
+import contextlib
+import mmap
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 
 import pytest
 
 from src.exceptions import ExpressionSyntaxError
 from src.lexical_processor import LexicalProcessor
-from src.tokens import Token
+from src.tokens import Token, TokenOffsets, TokensSource, TOKEN_TYPES_CODES
 from src.enums import TokenTypesEnum
 
 
@@ -41,7 +44,117 @@ def test_lexical_processor_process_multipart_expression(lexical_processor: Lexic
     assert expected_tokens == tokens
 
 
+def test_lexical_processor_process_expression_with_identifiers(lexical_processor: LexicalProcessor) -> None:
+    expression: str = 'xy * 2'
+    expected_tokens: List[Token] = [
+        Token(type=TokenTypesEnum.IDENTIFIER, literal='xy'),
+        Token(type=TokenTypesEnum.STAR, literal='*'),
+        Token(type=TokenTypesEnum.NUMBER, literal='2'),
+        Token(type=TokenTypesEnum.EOF, literal=''),
+    ]
+
+    tokens: List[Token] = lexical_processor.process_expression(expression=expression)
+    assert expected_tokens == tokens
+
+
 def test_lexical_processor_expression_fail_due_syntax_error(lexical_processor: LexicalProcessor) -> None:
     with pytest.raises(ExpressionSyntaxError):
-        expression: str = '(5 + 2)a'
+        expression: str = '(5 + 2)#'
         lexical_processor.process_expression(expression=expression)
+
+
+def test_lexical_processor_process_expression_with_various_whitespaces(lexical_processor: LexicalProcessor) -> None:
+    expression: str = '\t12.5*  2\n'
+    expected_tokens: List[Token] = [
+        Token(type=TokenTypesEnum.NUMBER, literal='12.5'),
+        Token(type=TokenTypesEnum.STAR, literal='*'),
+        Token(type=TokenTypesEnum.NUMBER, literal='2'),
+        Token(type=TokenTypesEnum.EOF, literal=''),
+    ]
+
+    assert expected_tokens == lexical_processor.process_expression(expression=expression)
+    assert expected_tokens == lexical_processor.process_expression(expression=expression.rstrip())
+
+    with pytest.raises(ExpressionSyntaxError):  # Whitespaces are allowed only around tokens
+        lexical_processor.process_expression(expression=' \t\n')
+
+
+def test_lexical_processor_process_long_expression(lexical_processor: LexicalProcessor) -> None:
+    expression: str = '1 + ' * 100_000 + '1'
+    tokens: List[Token] = lexical_processor.process_expression(expression=expression)
+    assert len(tokens) == 200_002
+    assert tokens[-2] == Token(type=TokenTypesEnum.NUMBER, literal='1')
+
+
+def test_lexical_processor_is_reusable(lexical_processor: LexicalProcessor) -> None:
+    with pytest.raises(ExpressionSyntaxError):
+        lexical_processor.process_expression(expression='2 $ 3')
+
+    tokens: List[Token] = lexical_processor.process_expression(expression='7')
+    assert tokens == [
+        Token(type=TokenTypesEnum.NUMBER, literal='7'),
+        Token(type=TokenTypesEnum.EOF, literal=''),
+    ]
+
+
+def test_tokens_are_slotted_and_have_integer_codes(lexical_processor: LexicalProcessor) -> None:
+    tokens: List[Token] = lexical_processor.process_expression(expression='x + 1')
+    assert not hasattr(tokens[0], '__dict__')
+    assert [token.code for token in tokens] == [TOKEN_TYPES_CODES[token.type] for token in tokens]
+    assert len(set(TOKEN_TYPES_CODES.values())) == len(TokenTypesEnum)
+
+
+@pytest.mark.parametrize(
+    'source',
+    ['12 + x * (3)', b'12 + x * (3)', bytearray(b'12 + x * (3)'), memoryview(b'12 + x * (3)')]
+)
+def test_lexical_processor_streams_token_offsets(lexical_processor: LexicalProcessor, source: TokensSource) -> None:
+    offsets: List[TokenOffsets] = list(lexical_processor.stream_tokens(source=source))
+    assert offsets == [
+        (TOKEN_TYPES_CODES[TokenTypesEnum.NUMBER], 0, 2),
+        (TOKEN_TYPES_CODES[TokenTypesEnum.PLUS], 3, 4),
+        (TOKEN_TYPES_CODES[TokenTypesEnum.IDENTIFIER], 5, 6),
+        (TOKEN_TYPES_CODES[TokenTypesEnum.STAR], 7, 8),
+        (TOKEN_TYPES_CODES[TokenTypesEnum.LEFT_PARENTHESIS], 9, 10),
+        (TOKEN_TYPES_CODES[TokenTypesEnum.NUMBER], 10, 11),
+        (TOKEN_TYPES_CODES[TokenTypesEnum.RIGHT_PARENTHESIS], 11, 12),
+        (TOKEN_TYPES_CODES[TokenTypesEnum.EOF], 12, 12),
+    ]
+
+
+def test_lexical_processor_streams_tokens_between_positions(lexical_processor: LexicalProcessor) -> None:
+    source: bytes = b'1 + 2\n x - 3 \n'
+    offsets: List[TokenOffsets] = list(lexical_processor.stream_tokens(source=source, start=6, end=14))
+    assert [source[start:end] for _, start, end in offsets] == [b'x', b'-', b'3', b'']
+
+
+def test_lexical_processor_streams_tokens_from_memory_map(lexical_processor: LexicalProcessor, tmp_path: Path) -> None:
+    path: Path = tmp_path / 'expression.txt'
+    path.write_bytes(b'sqrt(16) + 2.5\n')
+    with path.open('rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+        offsets: List[TokenOffsets] = list(lexical_processor.stream_tokens(source=source))
+        assert [source[start:end] for _, start, end in offsets] == [b'sqrt', b'(', b'16', b')', b'+', b'2.5', b'']
+
+
+def test_lexical_processor_streams_tokens_lazily(lexical_processor: LexicalProcessor) -> None:
+    tokens: Iterator[TokenOffsets] = lexical_processor.stream_tokens(source='1 + 2 $ 3')
+    assert next(tokens) == (TOKEN_TYPES_CODES[TokenTypesEnum.NUMBER], 0, 1)
+    assert next(tokens) == (TOKEN_TYPES_CODES[TokenTypesEnum.PLUS], 2, 3)
+    assert next(tokens) == (TOKEN_TYPES_CODES[TokenTypesEnum.NUMBER], 4, 5)
+    with pytest.raises(ExpressionSyntaxError):
+        next(tokens)
+
+
+@pytest.mark.parametrize('expression', ['1 + x', ' 1 + x', '1 + x \n', '\t(2)\t', '', ' ', '\n', '1 $', '1 + $ '])
+def test_lexical_processor_streams_same_tokens(lexical_processor: LexicalProcessor, expression: str) -> None:
+    tokens: Optional[List[Tuple[int, str]]] = None
+    with contextlib.suppress(ExpressionSyntaxError):
+        tokens = [(token.code, token.literal) for token in lexical_processor.process_expression(expression=expression)]
+
+    streamed_tokens: Optional[List[Tuple[int, str]]] = None
+    with contextlib.suppress(ExpressionSyntaxError):
+        streamed_tokens = [
+            (code, expression[start:end]) for code, start, end in lexical_processor.stream_tokens(source=expression)
+        ]
+
+    assert streamed_tokens == tokens
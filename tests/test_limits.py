@@ -0,0 +1,184 @@
+from typing import Iterator, List, Optional, Type
+
+import pytest
+
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.enums import TokenTypesEnum
+from src.exceptions import (
+    CustomZeroDivisionError,
+    EvaluationStepsExceededError,
+    EvaluationTimeoutError,
+    ExpressionTooDeepError,
+    ExpressionTooLongError,
+    NumericOverflowError,
+    ParserStackExhaustedError,
+    TooManyNodesError,
+    TooManyTokensError
+)
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.limits import ResourceLimits
+from src.precedence_parser import PrecedenceParser
+from src.tokens import Token
+from src.tokens_parser import TokensParser
+
+
+def create_interpreter(limits: ResourceLimits, parser: TokensParser) -> MathOperationsInterpreter:
+    return MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=parser,
+        lexical_processor=LexicalProcessor(limits=limits),
+        limits=limits
+    )
+
+
+def test_lexical_processor_limits() -> None:
+    lexical_processor: LexicalProcessor = LexicalProcessor(limits=ResourceLimits(max_input_length=9, max_tokens=3))
+    assert len(lexical_processor.process_expression(expression='12 + x')) == 4  # With EOF token
+
+    with pytest.raises(TooManyTokensError):
+        lexical_processor.process_expression(expression='1+2*3')
+
+    with pytest.raises(TooManyTokensError):
+        list(lexical_processor.stream_tokens(source=b'1+2*3'))
+
+    with pytest.raises(ExpressionTooLongError):
+        lexical_processor.process_expression(expression='1234567890')
+
+    with pytest.raises(ExpressionTooLongError):
+        list(lexical_processor.stream_tokens(source='1234567890'))
+
+
+@pytest.mark.parametrize('parser_type', [TokensParser, PrecedenceParser])
+@pytest.mark.parametrize(
+    'expression, error',
+    [('-(1)', None), ('-(-1)', ExpressionTooDeepError), ('-(-(-1))', ExpressionTooDeepError),
+     ('1+2+3+4', ExpressionTooDeepError), ('((1))', None), ('((((((1))))))', ExpressionTooDeepError),
+     ('2^(1)', None), ('2^(-1)', ExpressionTooDeepError), ('1*2*3', None), ('(1+2)*(3+4)', TooManyNodesError)]
+)
+def test_parser_limits(parser_type: Type[TokensParser], expression: str, error: Type[Exception]) -> None:
+    lexical_processor: LexicalProcessor = LexicalProcessor()
+    parser: TokensParser = parser_type(limits=ResourceLimits(max_depth=3, max_nodes=6))
+    if error is None:
+        parser.parse(tokens=lexical_processor.process_expression(expression=expression))
+    else:
+        with pytest.raises(error):
+            parser.parse(tokens=lexical_processor.process_expression(expression=expression))
+
+
+def test_recursive_parser_limits_depth_while_parsing(lexical_processor: LexicalProcessor) -> None:
+    parser: TokensParser = TokensParser(limits=ResourceLimits(max_depth=10))
+    for expression in ('-' * 20_000 + '1', 'sqrt(' * 20_000 + '1' + ')' * 20_000, '2^' * 20_000 + '2'):
+        with pytest.raises(ExpressionTooDeepError) as error:
+            parser.parse(tokens=lexical_processor.process_expression(expression=expression))
+
+        assert str(error.value) == str(ExpressionTooDeepError(max_depth=10))
+
+
+@pytest.mark.parametrize('parser_type', [TokensParser, PrecedenceParser])
+@pytest.mark.parametrize(
+    'expression',
+    ['1+(' * 300 + '1' + ')' * 300, '(' * 20_000 + '1' + ')' * 20_000, '-(' * 300 + '1' + ')' * 300,
+     'sqrt((' * 300 + '1' + '))' * 300, '2^(' * 300 + '2' + ')' * 300]
+)
+def test_parsers_limit_depth_of_parentheses(
+        lexical_processor: LexicalProcessor,
+        parser_type: Type[TokensParser],
+        expression: str
+) -> None:
+
+    parser: TokensParser = parser_type(limits=ResourceLimits(max_depth=50))
+    with pytest.raises(ExpressionTooDeepError):
+        parser.parse(tokens=lexical_processor.process_expression(expression=expression))
+
+
+@pytest.mark.parametrize('parser_type', [TokensParser, PrecedenceParser])
+def test_parsers_reject_too_deep_stream_early(parser_type: Type[TokensParser]) -> None:
+    consumed_tokens: List[Token] = []
+
+    def read_parentheses() -> Iterator[Token]:
+        while True:  # Stream, which never ends
+            consumed_tokens.append(Token(type=TokenTypesEnum.LEFT_PARENTHESIS, literal='('))
+            yield consumed_tokens[-1]
+
+    parser: TokensParser = parser_type(limits=ResourceLimits(max_depth=50))
+    with pytest.raises(ExpressionTooDeepError):
+        parser.parse(tokens=read_parentheses())
+
+    assert len(consumed_tokens) <= 51
+
+
+@pytest.mark.parametrize('limits', [None, ResourceLimits(max_depth=100_000)])
+def test_recursive_parser_reports_exhausted_stack(
+        lexical_processor: LexicalProcessor,
+        capsys: pytest.CaptureFixture,
+        limits: Optional[ResourceLimits]
+) -> None:
+
+    user_input: str = 'x = ' + '(' * 10_000 + '1' + ')' * 10_000
+    interpreter: MathOperationsInterpreter = create_interpreter(
+        limits=limits or ResourceLimits(),
+        parser=TokensParser(limits=limits)
+    )
+    with pytest.raises(ParserStackExhaustedError):
+        interpreter.assign(user_input=user_input)
+
+    interpreter.interpret(user_input=user_input)
+    assert 'recursion limit' in capsys.readouterr().out
+
+    # Iterative parser is not limited by the stack:
+    assert create_interpreter(limits=ResourceLimits(), parser=PrecedenceParser()).assign(user_input=user_input)[1] == 1
+
+
+def test_evaluation_steps_limit(tokens_parser: TokensParser) -> None:
+    interpreter: MathOperationsInterpreter = create_interpreter(
+        limits=ResourceLimits(max_evaluation_steps=3),
+        parser=tokens_parser
+    )
+    assert interpreter.assign(user_input='x = (1 + 2) * 3 - 4') == ('x', 5.0)
+
+    with pytest.raises(EvaluationStepsExceededError):
+        interpreter.assign(user_input='x = (1 + 2) * 3 - 4 / x')
+
+
+def test_evaluation_timeout(tokens_parser: TokensParser) -> None:
+    interpreter: MathOperationsInterpreter = create_interpreter(
+        limits=ResourceLimits(evaluation_timeout=0.0),
+        parser=tokens_parser
+    )
+    assert interpreter.assign(user_input='x = 2') == ('x', 2.0)
+
+    with pytest.raises(EvaluationTimeoutError):
+        interpreter.assign(user_input='x = ' + ' + '.join(['1'] * 1000))
+
+
+@pytest.mark.parametrize(
+    'user_input, error',
+    [
+        ('x = 9^9^9^9', NumericOverflowError),
+        ('x = exp(1000)', NumericOverflowError),
+        ('x = 0^-1', CustomZeroDivisionError)
+    ]
+)
+def test_numeric_errors_of_powers(
+        interpreter: MathOperationsInterpreter,
+        capsys: pytest.CaptureFixture,
+        user_input: str,
+        error: Type[Exception]
+) -> None:
+
+    with pytest.raises(error):
+        interpreter.assign(user_input=user_input)
+
+    interpreter.interpret(user_input=user_input)
+    assert capsys.readouterr().out == str(error()) + '\n'
+
+
+def test_interpret_prints_limit_errors(tokens_parser: TokensParser, capsys: pytest.CaptureFixture) -> None:
+    interpreter: MathOperationsInterpreter = create_interpreter(
+        limits=ResourceLimits(max_input_length=3),
+        parser=tokens_parser
+    )
+    interpreter.interpret(user_input='x = 1234')
+    assert capsys.readouterr().out == str(ExpressionTooLongError(max_length=3)) + '\n'
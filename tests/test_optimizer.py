@@ -0,0 +1,188 @@
+from typing import Dict, List, Type
+
+import pytest
+
+from src.commands import BaseCommand
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.expressions import TreeNode, BinaryOperation, Number, Variable, FunctionCall
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.optimizer import ExpressionOptimizer
+from src.precedence_parser import PrecedenceParser
+from src.tokens_parser import TokensParser
+
+
+def parse(lexical_processor: LexicalProcessor, expression: str) -> TreeNode:
+    return TokensParser().parse(lexical_processor.process_expression(expression=expression))
+
+
+@pytest.mark.parametrize(
+    'expression, expected_tree',
+    [
+        ('(18 / 3 - 2) * x', BinaryOperation(left=Number(value=4.0), operation='*', right=Variable(name='x'))),
+        ('sqrt(25) + x', BinaryOperation(left=Number(value=5.0), operation='+', right=Variable(name='x'))),
+        ('-(2 ^ 3)', Number(value=-8.0)),
+        ('x + 0 * -1', Variable(name='x')),
+        ('0 * -1 + x', Variable(name='x')),
+        ('x - 0', Variable(name='x')),
+        ('1 * x * 1', Variable(name='x')),
+        ('x / 1', Variable(name='x')),
+        ('x ^ 1', Variable(name='x')),
+        ('x / 4', BinaryOperation(left=Variable(name='x'), operation='*', right=Number(value=0.25))),
+        ('x ^ 2', BinaryOperation(left=Variable(name='x'), operation='*', right=Variable(name='x'))),
+        (
+            'x ^ (6 / 2)',
+            BinaryOperation(
+                left=BinaryOperation(left=Variable(name='x'), operation='*', right=Variable(name='x')),
+                operation='*',
+                right=Variable(name='x')
+            )
+        ),
+    ]
+)
+def test_optimize(
+        expression_optimizer: ExpressionOptimizer,
+        lexical_processor: LexicalProcessor,
+        expression: str,
+        expected_tree: TreeNode
+) -> None:
+
+    assert expression_optimizer.optimize(node=parse(lexical_processor, expression)) == expected_tree
+
+
+@pytest.mark.parametrize(
+    'expression',
+    ['x ^ 5', 'x ^ 0.5', 'x ^ y', '(x + 1) ^ 2', 'x / 0', 'x * 0', 'x / 3', 'x / 0.1', 'x + 0', '0 + x', '+x']
+)
+def test_optimize_keeps_expression(
+        expression_optimizer: ExpressionOptimizer,
+        lexical_processor: LexicalProcessor,
+        expression: str
+) -> None:
+
+    tree: TreeNode = parse(lexical_processor, expression)
+    assert expression_optimizer.optimize(node=tree) == tree
+
+
+@pytest.mark.parametrize('expression', ['1 / 0', 'log(0)', 'sqrt(-1)', '(-8) ^ 0.5', 'foo(1)', '10 ^ 400'])
+def test_optimize_keeps_failing_constants(
+        expression_optimizer: ExpressionOptimizer,
+        lexical_processor: LexicalProcessor,
+        expression: str
+) -> None:
+
+    assert not isinstance(expression_optimizer.optimize(node=parse(lexical_processor, expression)), Number)
+
+
+def test_optimize_does_not_modify_source_tree(
+        expression_optimizer: ExpressionOptimizer,
+        lexical_processor: LexicalProcessor
+) -> None:
+
+    tree: TreeNode = parse(lexical_processor, '(x + 0) * sqrt(4)')
+    expression_optimizer.optimize(node=tree)
+    assert tree == BinaryOperation(
+        left=BinaryOperation(left=Variable(name='x'), operation='+', right=Number(value=0.0)),
+        operation='*',
+        right=FunctionCall(name='sqrt', argument=Number(value=4.0))
+    )
+
+
+def test_optimize_does_not_rewrite_custom_commands(lexical_processor: LexicalProcessor) -> None:
+    class FloorDivideCommand(BaseCommand):
+
+        def execute(self) -> float:
+            return self._a // self._b
+
+    base_commands: Dict[str, Type[BaseCommand]] = {**BASE_COMMANDS, '/': FloorDivideCommand}
+    expression_optimizer: ExpressionOptimizer = ExpressionOptimizer(
+        base_commands=base_commands,
+        math_commands=MATH_COMMANDS
+    )
+
+    tree: TreeNode = parse(lexical_processor, 'x / 2')
+    assert expression_optimizer.optimize(node=parse(lexical_processor, '7 / 2')) == Number(value=3.0)
+    assert expression_optimizer.optimize(node=tree) == tree
+
+
+def test_interpreter_with_optimization(
+        lexical_processor: LexicalProcessor,
+        tokens_parser: TokensParser
+) -> None:
+
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=tokens_parser,
+        lexical_processor=lexical_processor,
+        optimize_expressions=True
+    )
+
+    interpreter.interpret(user_input='x = sqrt((4 - 2) ^ (18 / 3 - 2))')
+    interpreter.interpret(user_input='y = x ^ 2 / 2 - 0')
+    interpreter.interpret(user_input='result = y * 1 - x')
+    assert interpreter.get_result() == 4.0
+    assert interpreter._parse(expression='x ^ 2 / 2 - 0') == BinaryOperation(
+        left=BinaryOperation(left=Variable(name='x'), operation='*', right=Variable(name='x')),
+        operation='*',
+        right=Number(value=0.5)
+    )
+
+
+def test_optimization_keeps_results_of_division_by_tiny_constants(
+        lexical_processor: LexicalProcessor,
+        tokens_parser: TokensParser
+) -> None:
+
+    results: Dict[bool, float] = {}
+    for optimize_expressions in (False, True):
+        interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+            interpreter_base_commands=BASE_COMMANDS,
+            interpreter_math_commands=MATH_COMMANDS,
+            parser=tokens_parser,
+            lexical_processor=lexical_processor,
+            optimize_expressions=optimize_expressions
+        )
+        interpreter.assign(user_input='x = 0.1 ^ 300')
+        results[optimize_expressions] = interpreter.assign(user_input='y = x / 0.1 ^ 320')[1]
+
+    # Reciprocal of 0.1 ^ 320 overflows to infinity, so division is not replaced with multiplication:
+    assert results[True] == results[False] == pytest.approx(1e20, rel=1e-4)
+
+
+@pytest.mark.parametrize('expression', ['x + 0', '0 + x', '+x', 'x - 0', 'x + 0 * -1', 'x * 1', 'x ^ 1'])
+def test_optimization_keeps_signs_of_zeros(
+        lexical_processor: LexicalProcessor,
+        tokens_parser: TokensParser,
+        expression: str
+) -> None:
+
+    results: List[str] = []
+    for optimize_expressions in (False, True):
+        interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+            interpreter_base_commands=BASE_COMMANDS,
+            interpreter_math_commands=MATH_COMMANDS,
+            parser=tokens_parser,
+            lexical_processor=lexical_processor,
+            optimize_expressions=optimize_expressions
+        )
+        interpreter.interpret(user_input='x = 0 * -1')
+        results.append(str(interpreter.assign(user_input=f'y = {expression}')[1]))
+
+    assert results[0] == results[1]
+
+
+def test_optimize_deep_tree(lexical_processor: LexicalProcessor, precedence_parser: PrecedenceParser) -> None:
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=precedence_parser,
+        lexical_processor=lexical_processor,
+        optimize_expressions=True
+    )
+
+    # Chains of unary operators are longer than the recursion limit:
+    assert interpreter.assign(user_input='x = ' + '-' * 5000 + '1') == ('x', 1.0)
+    assert interpreter._parse(expression='-' * 5001 + '1') == Number(value=-1.0)
+    assert interpreter.assign(user_input='y = ' + '-' * 5000 + 'x * 2') == ('y', 2.0)
+    assert interpreter.execute_bytecode(bytecode=interpreter.compile_bytecode(expression='-' * 5001 + 'x')) == -1.0
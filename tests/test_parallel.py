@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+from typing import List
+
+from src.batch import BatchRecord
+from src.parallel import ParallelBatchProcessor, read_sessions
+
+
+def test_parallel_batch_processor_processes_scripts_independently(tmp_path: Path) -> None:
+    (tmp_path / 'a.txt').write_text('x = 2\ny = x * 3\n')
+    (tmp_path / 'b.txt').write_text('y = x\nx = 5\n')
+    (tmp_path / 'c.txt').write_text('result = 1 / 0\n')
+
+    records: List[BatchRecord] = list(ParallelBatchProcessor(max_workers=2).process_directory(directory=tmp_path))
+    assert [(record.source, record.line) for record in records] == [
+        (str(tmp_path / 'a.txt'), 1),
+        (str(tmp_path / 'a.txt'), 2),
+        (str(tmp_path / 'b.txt'), 1),
+        (str(tmp_path / 'b.txt'), 2),
+        (str(tmp_path / 'c.txt'), 1),
+    ]
+    assert [record.value for record in records[:2]] == [2.0, 6.0]
+
+    # Variables of a script are not visible in other scripts, which are processed by the same worker:
+    assert records[2].error == 'UndefinedVariableError'
+    assert records[3].value == 5.0
+    assert records[4].error == 'CustomZeroDivisionError'
+
+
+def test_parallel_batch_processor_processes_sessions_in_order() -> None:
+    lines: List[str] = [
+        json.dumps({'session': session, 'statement': f'x = {index}' if index < 3 else 'y = x * 10'})
+        for index, session in enumerate(['a', 'b', 'c', 'c', 'b', 'a'])
+    ]
+
+    records: List[BatchRecord] = list(ParallelBatchProcessor(max_workers=2).process_sessions(lines=lines))
+    assert [(record.line, record.source, record.variable, record.value) for record in records] == [
+        (1, 'a', 'x', 0.0),
+        (2, 'b', 'x', 1.0),
+        (3, 'c', 'x', 2.0),
+        (4, 'c', 'y', 20.0),
+        (5, 'b', 'y', 10.0),
+        (6, 'a', 'y', 0.0),
+    ]
+
+
+def test_read_sessions_groups_statements() -> None:
+    lines: List[str] = [
+        '{"session": "a", "statement": "x = 1"}',
+        '',
+        '{"session": "b", "statement": "x = 2"}',
+        '{"session": "a", "statement": "y = x"}',
+    ]
+
+    assert read_sessions(lines=lines) == ({'a': [(1, 'x = 1'), (4, 'y = x')], 'b': [(3, 'x = 2')]}, [])
+
+
+def test_read_sessions_reports_invalid_lines() -> None:
+    lines: List[str] = [
+        '{"session": "a", "statement": "x = 1"}',
+        '{"session": "a", "statement": ',
+        '{"session": "b"}',
+        '["a", "x = 2"]',
+        '{"session": "a", "statement": 5}',
+        '{"session": "a", "statement": null}',
+    ]
+
+    sessions, errors = read_sessions(lines=lines)
+    assert sessions == {'a': [(1, 'x = 1')]}
+    assert [(record.line, record.error) for record in errors] == [
+        (2, 'JSONDecodeError'),
+        (3, 'KeyError'),
+        (4, 'TypeError'),
+        (5, 'TypeError'),
+        (6, 'TypeError'),
+    ]
+    assert errors[3].message == 'Statement must be a string, but received int.'
+
+
+def test_parallel_batch_processor_reports_invalid_session_lines_in_order() -> None:
+    lines: List[str] = [
+        '{"session": "a", "statement": "x = 1"}',
+        'not json',
+        '{"session": "b", "statement": "x = 2"}',
+        '{"statement": "x = 3"}',
+        '{"session": "a", "statement": "y = x * 10"}',
+        '{"session": "b"',
+        '{"session": "b", "statement": 5}',
+        '{"session": "b", "statement": "z = x + 1"}',
+    ]
+
+    records: List[BatchRecord] = list(ParallelBatchProcessor(max_workers=2).process_sessions(lines=lines))
+    assert [(record.line, record.source, record.error, record.value) for record in records] == [
+        (1, 'a', None, 1.0),
+        (2, None, 'JSONDecodeError', None),
+        (3, 'b', None, 2.0),
+        (4, None, 'KeyError', None),
+        (5, 'a', None, 10.0),
+        (6, None, 'JSONDecodeError', None),
+        (7, None, 'TypeError', None),
+        (8, 'b', None, 3.0),
+    ]
@@ -0,0 +1,232 @@
+import weakref
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from src.bytecode import Bytecode, BytecodeCompiler
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.exceptions import ExpressionTooDeepError
+from src.expressions import TreeNode
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.limits import ResourceLimits
+from src.persistent_cache import FILE_HEADER, INDEX_ENTRY, PersistentExpressionCache, _close_at_exit
+from src.tokens import Token
+from src.tokens_parser import TokensParser
+
+
+class CountingLexicalProcessor(LexicalProcessor):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.expressions: List[str] = []
+
+    def process_expression(self, expression: str) -> List[Token]:
+        self.expressions.append(expression)
+        return super().process_expression(expression=expression)
+
+
+@pytest.mark.parametrize('expression', ['1', 'x', '-sin(x) ^ 2 / 3 + y * 2 - 2.5', '((-(1)))', 'log(exp(x)) - x'])
+def test_bytecode_serialization_restores_the_tree(interpreter: MathOperationsInterpreter, expression: str) -> None:
+    bytecode: Bytecode = interpreter.compile_bytecode(expression=expression)
+    restored_bytecode: Bytecode = Bytecode.from_bytes(data=bytecode.to_bytes())
+
+    assert restored_bytecode == bytecode
+    assert BytecodeCompiler.decompile(bytecode=restored_bytecode) == interpreter._parse(expression=expression)
+
+
+def test_persistent_cache_stores_expressions_between_instances(
+        interpreter: MathOperationsInterpreter,
+        tmp_path: Path
+) -> None:
+    path: Path = tmp_path / 'expressions.cache'
+    expressions: List[str] = [f'x * {index} + sqrt(y)' for index in range(100)]
+    with PersistentExpressionCache(path=path) as cache:
+        for expression in expressions:
+            cache.put(expression=expression, bytecode=interpreter.compile_bytecode(expression=expression))
+
+        assert len(cache) == 100
+        assert expressions[0] in cache  # New entries are found before they are flushed
+
+    cache = PersistentExpressionCache(path=path)
+    for expression in expressions:
+        assert cache.get(expression=expression) == interpreter.compile_bytecode(expression=expression)
+
+    assert cache.get(expression='x * 100 + sqrt(y)') is None
+    assert len(cache) == 100
+
+    # Entries, which are added later, are merged with stored ones:
+    cache.put(expression='z', bytecode=interpreter.compile_bytecode(expression='z'))
+    cache.put(expression=expressions[0], bytecode=interpreter.compile_bytecode(expression=expressions[0]))
+    cache.close()
+    assert len(PersistentExpressionCache(path=path)) == 101
+
+
+def test_persistent_cache_is_keyed_by_grammar_version(interpreter: MathOperationsInterpreter, tmp_path: Path) -> None:
+    path: Path = tmp_path / 'expressions.cache'
+    with PersistentExpressionCache(path=path, grammar_version='1') as cache:
+        cache.put(expression='x+1', bytecode=interpreter.compile_bytecode(expression='x+1'))
+
+    assert 'x+1' in PersistentExpressionCache(path=path, grammar_version='1')
+    assert 'x+1' not in PersistentExpressionCache(path=path, grammar_version='2')
+
+
+@pytest.mark.parametrize('content', [b'', b'MOIC', b'not a cache file at all', b'MOIC\x01\x00\xff\xff\xff\xff'])
+def test_persistent_cache_replaces_foreign_files(
+        interpreter: MathOperationsInterpreter,
+        tmp_path: Path,
+        content: bytes
+) -> None:
+    path: Path = tmp_path / 'expressions.cache'
+    path.write_bytes(content)
+
+    with PersistentExpressionCache(path=path) as cache:
+        assert len(cache) == 0
+        assert cache.get(expression='x+1') is None
+        cache.put(expression='x+1', bytecode=interpreter.compile_bytecode(expression='x+1'))
+
+    assert 'x+1' in PersistentExpressionCache(path=path)
+
+
+def test_interpreter_loads_parsed_expressions_from_persistent_cache(tmp_path: Path) -> None:
+    def create_interpreter(
+            lexical_processor: LexicalProcessor,
+            cache: PersistentExpressionCache,
+            optimize_expressions: bool = False
+    ) -> MathOperationsInterpreter:
+        return MathOperationsInterpreter(
+            interpreter_base_commands=BASE_COMMANDS,
+            interpreter_math_commands=MATH_COMMANDS,
+            parser=TokensParser(),
+            lexical_processor=lexical_processor,
+            optimize_expressions=optimize_expressions,
+            persistent_cache=cache
+        )
+
+    path: Path = tmp_path / 'expressions.cache'
+    cold_lexical_processor: CountingLexicalProcessor = CountingLexicalProcessor()
+    with PersistentExpressionCache(path=path) as cache:
+        cold_interpreter: MathOperationsInterpreter = create_interpreter(cold_lexical_processor, cache)
+        cold_interpreter.interpret(user_input='x = 2 * 3')
+        cold_interpreter.interpret(user_input='y = x ^ 2 - sqrt(x)')
+        tree: TreeNode = cold_interpreter._parse(expression='x ^ 2 - sqrt(x)')
+
+    assert cold_lexical_processor.expressions == ['2*3', 'x^2-sqrt(x)']
+
+    warm_lexical_processor: CountingLexicalProcessor = CountingLexicalProcessor()
+    warm_interpreter: MathOperationsInterpreter = create_interpreter(
+        warm_lexical_processor,
+        PersistentExpressionCache(path=path),
+        optimize_expressions=True
+    )
+    warm_interpreter.interpret(user_input='x = 2 * 3')
+    warm_interpreter.interpret(user_input='y = x ^ 2 - sqrt(x)')
+    warm_interpreter.interpret(user_input='z = y + 1')
+
+    assert warm_lexical_processor.expressions == ['y+1']
+    assert warm_interpreter.get_variables() == cold_interpreter.get_variables() | {'z': 36 - 6 ** 0.5 + 1}
+
+    # Stored trees are not optimized, so they are optimized after loading by interpreters, which optimize them:
+    assert warm_interpreter._parse(expression='x^2-sqrt(x)') == warm_interpreter._optimizer.optimize(node=tree)
+
+
+def test_persistent_cache_flushes_pending_entries(interpreter: MathOperationsInterpreter, tmp_path: Path) -> None:
+    path: Path = tmp_path / 'expressions.cache'
+    cache: PersistentExpressionCache = PersistentExpressionCache(path=path, max_pending_entries=2)
+    for expression in ('x', 'y', 'z'):
+        cache.put(expression=expression, bytecode=interpreter.compile_bytecode(expression=expression))
+
+    # The second entry reaches the limit of pending entries, so the first two are flushed:
+    assert len(PersistentExpressionCache(path=path)) == 2
+
+    # Pending entries are flushed at exit by a callback, which references the cache weakly:
+    _close_at_exit(cache_reference=weakref.ref(cache))
+    assert len(PersistentExpressionCache(path=path)) == 3
+
+
+def test_persistent_cache_ignores_damaged_entries(interpreter: MathOperationsInterpreter, tmp_path: Path) -> None:
+    path: Path = tmp_path / 'expressions.cache'
+    with PersistentExpressionCache(path=path) as cache:
+        for expression in ('x+1', 'y*2'):
+            cache.put(expression=expression, bytecode=interpreter.compile_bytecode(expression=expression))
+
+    # The first entry points outside of the file and the data of the second one is truncated:
+    content: bytearray = bytearray(path.read_bytes())
+    key: bytes
+    offset: int
+    length: int
+    digest: bytes
+    key, offset, length, digest = INDEX_ENTRY.unpack_from(content, FILE_HEADER.size)
+    INDEX_ENTRY.pack_into(content, FILE_HEADER.size, key, len(content), length, digest)
+    key, offset, length, digest = INDEX_ENTRY.unpack_from(content, FILE_HEADER.size + INDEX_ENTRY.size)
+    INDEX_ENTRY.pack_into(content, FILE_HEADER.size + INDEX_ENTRY.size, key, offset, length - 10, digest)
+    path.write_bytes(content)
+
+    cache = PersistentExpressionCache(path=path)
+    assert cache.get(expression='x+1') is None
+    assert cache.get(expression='y*2') is None
+
+
+def test_persistent_cache_ignores_entries_with_wrong_digests(
+        interpreter: MathOperationsInterpreter,
+        tmp_path: Path
+) -> None:
+
+    path: Path = tmp_path / 'expressions.cache'
+    with PersistentExpressionCache(path=path) as cache:
+        for expression in ('x+1', 'y*2'):
+            cache.put(expression=expression, bytecode=interpreter.compile_bytecode(expression=expression))
+
+    # The last byte of the last entry is the name of its variable, so the damaged entry is still deserialized,
+    # but it uses another variable:
+    content: bytearray = bytearray(path.read_bytes())
+    content[-1] ^= 0x01
+    path.write_bytes(content)
+
+    with PersistentExpressionCache(path=path) as cache:
+        assert [cache.get(expression=expression) is None for expression in ('x+1', 'y*2')].count(True) == 1
+        cache.put(expression='z', bytecode=interpreter.compile_bytecode(expression='z'))
+
+    # Damaged entry is dropped on flush:
+    assert len(PersistentExpressionCache(path=path)) == 2
+
+
+def test_persistent_cache_merges_entries_of_concurrent_flushes(
+        interpreter: MathOperationsInterpreter,
+        tmp_path: Path
+) -> None:
+
+    path: Path = tmp_path / 'expressions.cache'
+    first_cache: PersistentExpressionCache = PersistentExpressionCache(path=path)
+    second_cache: PersistentExpressionCache = PersistentExpressionCache(path=path)
+    first_cache.put(expression='x', bytecode=interpreter.compile_bytecode(expression='x'))
+    second_cache.put(expression='y', bytecode=interpreter.compile_bytecode(expression='y'))
+    first_cache.close()
+    second_cache.close()
+
+    cache: PersistentExpressionCache = PersistentExpressionCache(path=path)
+    assert 'x' in cache and 'y' in cache
+
+
+def test_interpreter_limits_trees_loaded_from_persistent_cache(
+        interpreter: MathOperationsInterpreter,
+        lexical_processor: LexicalProcessor,
+        tmp_path: Path
+) -> None:
+
+    path: Path = tmp_path / 'expressions.cache'
+    with PersistentExpressionCache(path=path) as cache:
+        cache.put(expression='x+1+2', bytecode=interpreter.compile_bytecode(expression='x+1+2'))
+
+    limits: ResourceLimits = ResourceLimits(max_depth=2)
+    limited_interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=TokensParser(limits=limits),
+        lexical_processor=lexical_processor,
+        persistent_cache=PersistentExpressionCache(path=path),
+        limits=limits
+    )
+    with pytest.raises(ExpressionTooDeepError):
+        limited_interpreter.assign(user_input='y = x + 1 + 2')
@@ -0,0 +1,111 @@
+import pytest
+
+from src.exceptions import ParseError
+from src.expressions import TreeNode, BinaryOperation, UnaryOperation, Number, Variable, FunctionCall
+from src.lexical_processor import LexicalProcessor
+from src.precedence_parser import PrecedenceParser
+from src.tokens_parser import TokensParser
+
+
+@pytest.mark.parametrize(
+    'expression',
+    [
+        '1 + 3',
+        '1 - 2 - 3 + 4',
+        '2 * 3 / 4 * 5',
+        '1 + 2 * 3 - 4 / 5',
+        '2 ^ 3 ^ 2',
+        '-2 ^ 2',
+        '2 ^ -3 ^ 2 * 4',
+        '--+-x * -y',
+        '-(5 - 3) ^ 2',
+        '((1 + 2)) * (3 - (4 / x))',
+        'sqrt(x ^ 2 + y ^ 2) - sin(cos(-x)) ^ 2',
+        'x / sqrt(4) ^ -y + exp(log(x * 2))',
+    ]
+)
+def test_precedence_parser_creates_same_tree_as_tokens_parser(
+        precedence_parser: PrecedenceParser,
+        tokens_parser: TokensParser,
+        lexical_processor: LexicalProcessor,
+        expression: str
+) -> None:
+
+    tree: TreeNode = precedence_parser.parse(lexical_processor.process_expression(expression=expression))
+    assert tokens_parser.parse(lexical_processor.process_expression(expression=expression)) == tree
+
+
+def test_precedence_parser_unary_and_right_associative_operators(
+        precedence_parser: PrecedenceParser,
+        lexical_processor: LexicalProcessor
+) -> None:
+
+    expected_tree: TreeNode = BinaryOperation(
+        left=UnaryOperation(
+            operation='-',
+            expression=BinaryOperation(
+                left=Variable(name='x'),
+                operation='^',
+                right=BinaryOperation(left=Number(value=2.0), operation='^', right=Number(value=3.0))
+            )
+        ),
+        operation='*',
+        right=FunctionCall(name='sqrt', argument=UnaryOperation(operation='+', expression=Number(value=4.0)))
+    )
+
+    tree: TreeNode = precedence_parser.parse(lexical_processor.process_expression(expression='-x ^ 2 ^ 3 * sqrt(+4)'))
+    assert expected_tree == tree
+
+
+@pytest.mark.parametrize(
+    'expression',
+    ['', '1 +', '(1 + 2', '1 + 2)', '()', '1 2', 'sqrt 2', 'sin(1', '* 2', '2 ^', '(1 + 2))']
+)
+def test_precedence_parser_raises_parse_error(
+        precedence_parser: PrecedenceParser,
+        tokens_parser: TokensParser,
+        lexical_processor: LexicalProcessor,
+        expression: str
+) -> None:
+
+    with pytest.raises(ParseError):
+        tokens_parser.parse(lexical_processor.process_expression(expression=expression))
+
+    with pytest.raises(ParseError):
+        precedence_parser.parse(lexical_processor.process_expression(expression=expression))
+
+
+def test_precedence_parser_parses_deep_expressions(
+        precedence_parser: PrecedenceParser,
+        lexical_processor: LexicalProcessor
+) -> None:
+
+    depth: int = 50_000
+    tree: TreeNode = precedence_parser.parse(
+        lexical_processor.process_expression(expression='(' * depth + 'sqrt(' + '-' * depth + 'x)' + ')' * depth)
+    )
+
+    assert isinstance(tree, FunctionCall)
+    node: TreeNode = tree.argument
+    for _ in range(depth):
+        assert isinstance(node, UnaryOperation)
+        node = node.expression
+
+    assert node == Variable(name='x')
+
+
+def test_precedence_parser_parses_token_stream(
+        precedence_parser: PrecedenceParser,
+        lexical_processor: LexicalProcessor
+) -> None:
+
+    source: bytes = b'2 * (x - 1)'
+    tree: TreeNode = precedence_parser.parse_stream(
+        source=source,
+        tokens=lexical_processor.stream_tokens(source=source)
+    )
+    assert tree == BinaryOperation(
+        left=Number(value=2.0),
+        operation='*',
+        right=BinaryOperation(left=Variable(name='x'), operation='-', right=Number(value=1.0))
+    )
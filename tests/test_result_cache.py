@@ -0,0 +1,138 @@
+from typing import List
+
+import pytest
+
+from src.cache import CacheInfo
+from src.config import BASE_COMMANDS, MATH_COMMANDS
+from src.expressions import TreeNode, BinaryOperation, Number, Variable
+from src.interpreter import MathOperationsInterpreter
+from src.lexical_processor import LexicalProcessor
+from src.result_cache import ResultCache
+from src.tokens_parser import TokensParser
+
+
+@pytest.fixture
+def result_interpreter(lexical_processor: LexicalProcessor, tokens_parser: TokensParser) -> MathOperationsInterpreter:
+    return MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=tokens_parser,
+        lexical_processor=lexical_processor,
+        result_cache_size=2
+    )
+
+
+def test_result_cache_uses_only_variables_of_expression() -> None:
+    cache: ResultCache = ResultCache(maxsize=4)
+    tree: TreeNode = BinaryOperation(operation='*', left=Variable(name='x'), right=Number(value=2))
+
+    cache.put(expression='x * 2', tree=tree, variables={'x': 3, 'y': 1}, result=6)
+    assert cache.get(expression='x * 2', tree=tree, variables={'x': 3, 'y': 5}) == 6
+    assert cache.get(expression='x * 2', tree=tree, variables={'x': 4, 'y': 5}) is None
+    assert cache.get(expression='x * 2', tree=tree, variables={'y': 5}) is None
+
+    # Equal tree, which is parsed again, is found by the text of the expression:
+    other_tree: TreeNode = BinaryOperation(operation='*', left=Variable(name='x'), right=Number(value=2))
+    assert cache.get(expression='x * 2', tree=other_tree, variables={'x': 3}) == 6
+    assert cache.info() == CacheInfo(hits=2, misses=2, maxsize=4, currsize=1)
+
+
+def test_result_cache_keeps_values_for_different_variables() -> None:
+    cache: ResultCache = ResultCache(maxsize=4)
+    tree: TreeNode = BinaryOperation(operation='/', left=Number(value=1), right=Variable(name='x'))
+
+    for value in (2.0, 0.0, -0.0):
+        cache.put(expression='1 / x', tree=tree, variables={'x': value}, result=1 / value if value else value)
+
+    # Alternating values don't replace each other, and zero and negative zero are different values:
+    assert [cache.get(expression='1 / x', tree=tree, variables={'x': value}) for value in (2.0, -0.0, 0.0)] == [
+        0.5, -0.0, 0.0
+    ]
+    assert str(cache.get(expression='1 / x', tree=tree, variables={'x': -0.0})) == '-0.0'
+    assert len(cache) == 3
+
+
+def test_result_cache_is_bounded() -> None:
+    cache: ResultCache = ResultCache(maxsize=2)
+    for index, expression in enumerate(['x', 'y', 'x + 1']):
+        cache.put(expression=expression, tree=Variable(name='x'), variables={'x': 1, 'y': 2}, result=index)
+
+    # The first expression is the least recently used one, so it is evicted:
+    assert cache.get(expression='x', tree=Variable(name='x'), variables={'x': 1}) is None
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=-1)
+
+
+def test_interpreter_caches_results(result_interpreter: MathOperationsInterpreter) -> None:
+    for user_input in ('x = 3', 'y = 1', 'z = x * 2', 'y = 5', 'z = x * 2', 'x = 3', 'z = x * 2'):
+        result_interpreter.assign(user_input=user_input)
+
+    # "x * 2" is found after assignments of the unused "y" and of the same value of "x",
+    # while values of constants are evicted by next expressions:
+    assert result_interpreter.get_result_cache_info() == CacheInfo(hits=2, misses=5, maxsize=2, currsize=2)
+
+    result_interpreter.assign(user_input='x = 4')
+    assert result_interpreter.assign(user_input='z = x * 2') == ('z', 8.0)
+    assert result_interpreter.get_result_cache_info().hits == 2
+
+
+def test_interpreter_caches_results_by_normalized_expressions(
+        result_interpreter: MathOperationsInterpreter
+) -> None:
+
+    result_interpreter.assign(user_input='x = 3')
+    for user_input in ('z = x*2', 'z = x * 2', 'z =  x  *2 '):
+        assert result_interpreter.assign(user_input=user_input) == ('z', 6.0)
+
+    assert result_interpreter.get_result_cache_info().hits == 2
+
+
+def test_interpreter_recomputes_dependents_with_result_cache(
+        lexical_processor: LexicalProcessor,
+        tokens_parser: TokensParser
+) -> None:
+
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=tokens_parser,
+        lexical_processor=lexical_processor,
+        recompute_dependents=True,
+        result_cache_size=8
+    )
+    for user_input in ('x = 1', 'y = x + 1', 'z = y * 2', 'x = 2', 'x = x + 1'):
+        interpreter.assign(user_input=user_input)
+
+    assert interpreter.get_variables() == {'x': 3.0, 'y': 4.0, 'z': 8.0}
+
+    interpreter.reset()
+    assert interpreter.get_result_cache_info().currsize == 0
+
+
+def test_interpreter_caches_results_without_parse_cache(
+        lexical_processor: LexicalProcessor,
+        tokens_parser: TokensParser
+) -> None:
+
+    interpreter: MathOperationsInterpreter = MathOperationsInterpreter(
+        interpreter_base_commands=BASE_COMMANDS,
+        interpreter_math_commands=MATH_COMMANDS,
+        parser=tokens_parser,
+        lexical_processor=lexical_processor,
+        parse_cache_size=0,
+        result_cache_size=8
+    )
+
+    # Values of both bindings of "x" are kept, so alternating them finds the values of "x * 2":
+    results: List[float] = []
+    for user_input in ('x = 3', 'z = x * 2', 'x = 4', 'z = x * 2', 'x = 3', 'z = x * 2', 'x = 4', 'z = x * 2'):
+        results.append(interpreter.assign(user_input=user_input)[1])
+
+    assert results == [3.0, 6.0, 4.0, 8.0, 3.0, 6.0, 4.0, 8.0]
+    assert interpreter.get_parse_cache_info().currsize == 0
+    assert interpreter.get_result_cache_info() == CacheInfo(hits=4, misses=4, maxsize=8, currsize=4)
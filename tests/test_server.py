@@ -0,0 +1,163 @@
+import asyncio
+import json
+import socket
+from typing import Any, Dict, List
+
+from src.server import EvaluationServer
+
+
+async def send_lines(server: EvaluationServer, data: bytes) -> List[Dict[str, Any]]:
+    """
+    Sends data at once, closes the client's side of the connection and returns all received records.
+    """
+
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    reader, writer = await asyncio.open_connection(host='127.0.0.1', port=server.port)
+    writer.write(data)
+    writer.write_eof()
+    response: bytes = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+
+    return [json.loads(line) for line in response.splitlines()]
+
+
+def test_evaluation_server_answers_pipelined_lines_in_order() -> None:
+    async def run() -> List[Dict[str, Any]]:
+        server: EvaluationServer = EvaluationServer()
+        await server.start()
+        try:
+            return await send_lines(server=server, data=b'x = 2\n\ny = x * 3\nz = y / 0\nresult = x + y')
+        finally:
+            await server.stop()
+
+    assert asyncio.run(run()) == [
+        {'line': 1, 'variable': 'x', 'value': 2.0},
+        {'line': 3, 'variable': 'y', 'value': 6.0},
+        {
+            'line': 4,
+            'error': 'CustomZeroDivisionError',
+            'message': 'Number can not be divided by zero. Please check your input and try again.'
+        },
+        {'line': 5, 'variable': 'result', 'value': 8.0},
+    ]
+
+
+def test_evaluation_server_reports_not_real_results() -> None:
+    async def run() -> List[Dict[str, Any]]:
+        server: EvaluationServer = EvaluationServer()
+        await server.start()
+        try:
+            return await send_lines(server=server, data=b'x = (0-8)^0.5\ny = 2\n')
+        finally:
+            await server.stop()
+
+    records: List[Dict[str, Any]] = asyncio.run(run())
+    assert [record.get('error') for record in records] == ['MathDomainError', None]
+
+
+def test_evaluation_server_isolates_variables_of_sessions() -> None:
+    async def run() -> List[List[Dict[str, Any]]]:
+        server: EvaluationServer = EvaluationServer(max_concurrent_evaluations=1)
+        await server.start()
+        try:
+            return await asyncio.gather(
+                *(send_lines(server=server, data=f'x = {index}\ny = x * 10\n'.encode()) for index in range(10)),
+                send_lines(server=server, data=b'y = x\n')
+            )
+        finally:
+            await server.stop()
+
+    sessions_records: List[List[Dict[str, Any]]] = asyncio.run(run())
+    for index, records in enumerate(sessions_records[:-1]):
+        assert [record['value'] for record in records] == [index, index * 10]
+
+    assert sessions_records[-1][0]['error'] == 'UndefinedVariableError'
+
+
+def test_evaluation_server_answers_lines_sent_one_by_one() -> None:
+    async def run() -> List[Dict[str, Any]]:
+        server: EvaluationServer = EvaluationServer()
+        await server.start()
+        reader: asyncio.StreamReader
+        writer: asyncio.StreamWriter
+        reader, writer = await asyncio.open_connection(host='127.0.0.1', port=server.port)
+        try:
+            records: List[Dict[str, Any]] = []
+            for line in [b'x = ', b'4\n', b'y = sqrt(x)\n']:
+                writer.write(line)
+                await writer.drain()
+                if line.endswith(b'\n'):
+                    records.append(json.loads(await reader.readline()))
+
+            writer.write(b'exit\nz = 1\n')
+            assert await reader.read() == b''  # Lines after "exit" are not evaluated
+            return records
+        finally:
+            writer.close()
+            await server.stop()
+
+    assert asyncio.run(run()) == [
+        {'line': 1, 'variable': 'x', 'value': 4.0},
+        {'line': 2, 'variable': 'y', 'value': 2.0},
+    ]
+
+
+def test_evaluation_server_evicts_idle_sessions() -> None:
+    async def run() -> None:
+        server: EvaluationServer = EvaluationServer(idle_timeout=0.1)
+        await server.start()
+        reader: asyncio.StreamReader
+        writer: asyncio.StreamWriter
+        reader, writer = await asyncio.open_connection(host='127.0.0.1', port=server.port)
+        try:
+            writer.write(b'x = 1\n')
+            assert json.loads(await reader.readline())['value'] == 1.0
+            assert server.sessions_count == 1
+
+            assert await asyncio.wait_for(reader.read(), timeout=5) == b''
+            assert server.sessions_count == 0
+        finally:
+            writer.close()
+            await server.stop()
+
+    asyncio.run(run())
+
+
+def test_evaluation_server_evicts_sessions_not_reading_results() -> None:
+    async def run() -> None:
+        server: EvaluationServer = EvaluationServer(idle_timeout=0.2)
+        await server.start()
+        client_socket: socket.socket = socket.socket()
+        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        client_socket.connect(('127.0.0.1', server.port))
+        writer: asyncio.StreamWriter
+        _, writer = await asyncio.open_connection(sock=client_socket)
+        try:
+            # Each result repeats a long name, so results fill buffers of the connection, which are not read:
+            writer.write((b'x' * 30_000 + b' = 1\n') * 300)
+            for _ in range(100):
+                await asyncio.sleep(0.1)
+                if server.sessions_count == 0:
+                    break
+
+            assert server.sessions_count == 0
+        finally:
+            writer.close()
+            await server.stop()
+
+    asyncio.run(run())
+
+
+def test_evaluation_server_rejects_too_long_lines() -> None:
+    async def run() -> List[Dict[str, Any]]:
+        server: EvaluationServer = EvaluationServer(max_line_length=16, read_size=8)
+        await server.start()
+        try:
+            return await send_lines(server=server, data=b'x = 1\ny = ' + b'1 + ' * 100 + b'1\nz = 1\n')
+        finally:
+            await server.stop()
+
+    records: List[Dict[str, Any]] = asyncio.run(run())
+    assert [(record['line'], record.get('error')) for record in records] == [(1, None), (2, 'InputLineTooLongError')]
@@ -1,5 +1,12 @@
-from src.expressions import TreeNode, BinaryOperation, UnaryOperation, Number
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from src.exceptions import ParseError
+from src.expressions import TreeNode, BinaryOperation, UnaryOperation, Number, Variable, FunctionCall
 from src.lexical_processor import LexicalProcessor
+from src.tokens import TokensSource
 from src.tokens_parser import TokensParser
 
 
@@ -48,3 +55,100 @@ def test_tokens_parser_multipart_expression(tokens_parser: TokensParser, lexical
 
     tree: TreeNode = tokens_parser.parse(lexical_processor.process_expression(expression=expression))
     assert expected_tree == tree
+
+
+def test_tokens_parser_expression_with_variables(
+        tokens_parser: TokensParser,
+        lexical_processor: LexicalProcessor
+) -> None:
+
+    expression: str = '-x * (y + 2)'
+    expected_tree: TreeNode = BinaryOperation(
+        left=UnaryOperation(
+            operation='-',
+            expression=Variable(name='x')
+        ),
+        operation='*',
+        right=BinaryOperation(
+            left=Variable(name='y'),
+            operation='+',
+            right=Number(value=2.0)
+        )
+    )
+
+    tree: TreeNode = tokens_parser.parse(lexical_processor.process_expression(expression=expression))
+    assert expected_tree == tree
+
+
+def test_tokens_parser_expression_with_function_calls(
+        tokens_parser: TokensParser,
+        lexical_processor: LexicalProcessor
+) -> None:
+
+    expression: str = 'sqrt(x + sin(0)) ^ 2'
+    expected_tree: TreeNode = BinaryOperation(
+        left=FunctionCall(
+            name='sqrt',
+            argument=BinaryOperation(
+                left=Variable(name='x'),
+                operation='+',
+                right=FunctionCall(name='sin', argument=Number(value=0.0))
+            )
+        ),
+        operation='^',
+        right=Number(value=2.0)
+    )
+
+    tree: TreeNode = tokens_parser.parse(lexical_processor.process_expression(expression=expression))
+    assert expected_tree == tree
+
+
+def test_tokens_parser_creates_slotted_nodes(tokens_parser: TokensParser, lexical_processor: LexicalProcessor) -> None:
+    tree: TreeNode = tokens_parser.parse(lexical_processor.process_expression(expression='-sqrt(x) * 2'))
+    assert isinstance(tree, BinaryOperation)
+    assert isinstance(tree.left, UnaryOperation)
+    assert isinstance(tree.left.expression, FunctionCall)
+    for node in (tree, tree.left, tree.left.expression, tree.left.expression.argument, tree.right):
+        assert not hasattr(node, '__dict__')
+
+
+@pytest.mark.parametrize('source', ['sqrt(x + sin(0)) ^ 2.5 - -y', b'sqrt(x + sin(0)) ^ 2.5 - -y'])
+def test_tokens_parser_parses_token_stream(
+        tokens_parser: TokensParser,
+        lexical_processor: LexicalProcessor,
+        source: TokensSource
+) -> None:
+
+    expected_tree: TreeNode = tokens_parser.parse(
+        lexical_processor.process_expression(expression='sqrt(x + sin(0)) ^ 2.5 - -y')
+    )
+
+    tree: TreeNode = tokens_parser.parse_stream(source=source, tokens=lexical_processor.stream_tokens(source=source))
+    assert expected_tree == tree
+
+
+def test_tokens_parser_consumes_token_stream_lazily(
+        tokens_parser: TokensParser,
+        lexical_processor: LexicalProcessor
+) -> None:
+
+    source: str = '(1 + ) * 2 $'  # Lexical error at the end is not reached, because parsing fails earlier
+    with pytest.raises(ParseError):
+        tokens_parser.parse_stream(source=source, tokens=lexical_processor.stream_tokens(source=source))
+
+
+def test_tokens_parser_is_shared_by_threads(tokens_parser: TokensParser, lexical_processor: LexicalProcessor) -> None:
+    expressions: List[str] = [f'sqrt(x + {i}) ^ 2 - -y * ({i} - x)' for i in range(200)]
+    expected_trees: List[TreeNode] = [
+        TokensParser().parse(LexicalProcessor().process_expression(expression=expression)) for expression in expressions
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        trees: List[TreeNode] = list(
+            executor.map(
+                lambda expression: tokens_parser.parse(lexical_processor.process_expression(expression=expression)),
+                expressions * 5
+            )
+        )
+
+    assert trees == expected_trees * 5
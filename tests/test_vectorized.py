@@ -0,0 +1,70 @@
+from typing import List
+
+import pytest
+
+from src.exceptions import UndefinedVariableError
+from src.interpreter import MathOperationsInterpreter
+
+np = pytest.importorskip('numpy')
+
+from src.vectorized import VectorizedExpression, VectorizedResult  # noqa: E402
+
+
+def test_vectorized_expression(interpreter: MathOperationsInterpreter) -> None:
+    vectorized_expression: VectorizedExpression = interpreter.vectorize(expression='-(x - 5) ^ 2 + y / 2')
+    result: VectorizedResult = vectorized_expression.evaluate(variables={'x': [5, 7, 10], 'y': 4})
+    assert result.values.tolist() == [2.0, -2.0, -23.0]
+    assert result.valid.all()
+
+
+def test_vectorized_expression_matches_compiled_expression(interpreter: MathOperationsInterpreter) -> None:
+    expression: str = '(x + 1.5) * 3 ^ -y / (2 - x)'
+    xs: List[float] = [-3.0, 0.5, 1.0, 4.25]
+    ys: List[float] = [1.0, 2.0, 0.5, -1.0]
+
+    result: VectorizedResult = interpreter.vectorize(expression=expression).evaluate(variables={'x': xs, 'y': ys})
+    compiled_values: List[float] = [interpreter.compile(expression=expression)(x=x, y=y) for x, y in zip(xs, ys)]
+    assert result.values.tolist() == compiled_values
+
+
+def test_vectorized_expression_constant(interpreter: MathOperationsInterpreter) -> None:
+    result: VectorizedResult = interpreter.vectorize(expression='2 ^ 3').evaluate(variables={})
+    assert result.values.shape == ()
+    assert result.values == 8.0
+
+
+def test_vectorized_expression_zero_division(interpreter: MathOperationsInterpreter) -> None:
+    result: VectorizedResult = interpreter.vectorize(expression='1 / x + x ^ -1').evaluate(
+        variables={'x': np.array([1.0, 0.0, 4.0])}
+    )
+
+    assert result.values[[0, 2]].tolist() == [2.0, 0.5]
+    assert np.isnan(result.values[1])
+    assert result.zero_division.tolist() == [False, True, False]
+    assert not result.domain_error.any()
+
+
+def test_vectorized_expression_domain_error(interpreter: MathOperationsInterpreter) -> None:
+    result: VectorizedResult = interpreter.vectorize(expression='x ^ 0.5 + 10 ^ x').evaluate(
+        variables={'x': [4.0, -4.0, 400.0]}
+    )
+
+    assert result.values[0] == 10002.0
+    assert np.isnan(result.values[1:]).all()
+    assert result.domain_error.tolist() == [False, True, True]
+    assert result.valid.tolist() == [True, False, False]
+
+
+def test_vectorized_expression_math_functions(interpreter: MathOperationsInterpreter) -> None:
+    result: VectorizedResult = interpreter.vectorize(expression='sqrt(x) + log(x)').evaluate(
+        variables={'x': [1.0, 0.0, -1.0]}
+    )
+
+    assert result.values[0] == 1.0
+    assert np.isnan(result.values[1:]).all()
+    assert result.domain_error.tolist() == [False, True, True]
+
+
+def test_vectorized_expression_undefined_variable(interpreter: MathOperationsInterpreter) -> None:
+    with pytest.raises(UndefinedVariableError):
+        interpreter.vectorize(expression='x + y').evaluate(variables={'x': [1, 2]})